@@ -6,25 +6,56 @@ logging, confidence scoring, and escalation flow through this base class.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
+from collections.abc import Callable
+from contextlib import nullcontext
 from importlib import resources
 from pathlib import Path
 from typing import Any
 
 import anthropic
 
+from devlution.agents.confidence_batch import get_confidence_batcher
+from devlution.agents.governor import HostGovernor, get_governor
+from devlution.agents.json_stream import JSONEvent, JSONStreamParser
+from devlution.agents.llm_cache import DiskResponseCache, ResponseCache, make_cache_key
+from devlution.agents.rate_limit import (
+    RateLimiter,
+    estimate_tokens,
+    get_rate_limiter,
+    retry_delay,
+)
 from devlution.config import DevlutionConfig, LLMConfig
 from devlution.orchestrator.state import AuditEntry, PipelineState
 from devlution.supervision.audit_log import AuditLogger
 from devlution.supervision.confidence import (
+    CONFIDENCE_BATCH_PROMPT,
     CONFIDENCE_RUBRIC_PROMPT,
+    ConfidenceSignals,
+    LocalConfidenceScorer,
+    build_batch_confidence_prompt,
     build_confidence_prompt,
     parse_confidence_response,
 )
+from devlution.tools import file_editor
+from devlution.tools.static_analysis import AnalysisCache
+from devlution.tools.symbol_index import SymbolIndex, select_context
 
 logger = logging.getLogger(__name__)
 
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def response_text(response: anthropic.types.Message, default: str = "") -> str:
+    """Text of the response's first content block; `default` if it is not text."""
+    block = response.content[0] if response.content else None
+    return block.text if isinstance(block, anthropic.types.TextBlock) else default
+
+# Receives each streamed JSON field; returning True stops generation early.
+EventHandler = Callable[[JSONEvent], bool | None]
+
 
 class EscalationEvent:
     """Returned when an agent decides to escalate to a human."""
@@ -66,17 +97,34 @@ class AgentOutput:
 class BaseAgent:
     """Foundation for all pipeline agents.
 
-    Subclasses must set `agent_name` and implement `run()`.
+    Subclasses must set `agent_name` and implement `run()`. File reads, test
+    runs and git operations happen inside `workdir`, which lets concurrent
+    tasks each use their own worktree checkout.
     """
 
     agent_name: str = "base"
 
-    def __init__(self, config: DevlutionConfig, state: PipelineState):
+    def __init__(
+        self,
+        config: DevlutionConfig,
+        state: PipelineState,
+        response_cache: ResponseCache | None = None,
+        workdir: str = ".",
+    ):
         self.config = config
         self.state = state
+        self.workdir = workdir
         self.llm_config: LLMConfig = config.llm
-        self.audit = AuditLogger(config.supervision.audit_log)
+        self.audit = AuditLogger.from_config(config.supervision)
         self._client: anthropic.Anthropic | None = None
+        self._aclient: anthropic.AsyncAnthropic | None = None
+        self.response_cache = response_cache or self._build_response_cache()
+        self._symbol_index: SymbolIndex | None = None
+        self._analysis_cache: AnalysisCache | None = None
+        confidence_config = config.supervision.confidence
+        self.local_scorer = LocalConfidenceScorer(
+            confidence_config.ambiguous_low, confidence_config.ambiguous_high
+        )
 
     @property
     def client(self) -> anthropic.Anthropic:
@@ -84,11 +132,92 @@ class BaseAgent:
             self._client = anthropic.Anthropic()
         return self._client
 
+    @property
+    def aclient(self) -> anthropic.AsyncAnthropic:
+        if self._aclient is None:
+            self._aclient = anthropic.AsyncAnthropic()
+        return self._aclient
+
+    @property
+    def use_response_cache(self) -> bool:
+        """Whether this agent reads and writes the LLM response cache."""
+        return (
+            self.response_cache is not None
+            and self.agent_name not in self.llm_config.cache.skip_agents
+        )
+
+    def _build_response_cache(self) -> ResponseCache | None:
+        cache_config = self.llm_config.cache
+        if not cache_config.enabled:
+            return None
+        return DiskResponseCache(
+            cache_config.directory,
+            max_size_mb=cache_config.max_size_mb,
+            max_age_hours=cache_config.max_age_hours,
+        )
+
+    @property
+    def symbol_index(self) -> SymbolIndex | None:
+        """The workdir's symbol index, refreshed on first use; None if disabled."""
+        if not self.config.index.enabled:
+            return None
+        if self._symbol_index is None:
+            index_config = self.config.index
+            self._symbol_index = SymbolIndex(
+                self.workdir, index_config.directory, index_config.workers
+            )
+            self._symbol_index.refresh()
+        return self._symbol_index
+
+    @property
+    def analysis_cache(self) -> AnalysisCache | None:
+        """The workdir's lint/type-check findings cache; None if the index is disabled."""
+        if not self.config.index.enabled:
+            return None
+        if self._analysis_cache is None:
+            self._analysis_cache = AnalysisCache(self.workdir, self.config.index.directory)
+        return self._analysis_cache
+
+    def read_context(
+        self,
+        files: list[str],
+        terms: set[str],
+        lines: dict[str, set[int]] | None = None,
+        max_chars: int = 4000,
+    ) -> tuple[dict[str, str], dict[str, str]]:
+        """Read `files` for a prompt: `(contents, callers)`.
+
+        With the symbol index, large files are cut down to the symbols matching
+        `terms` (or containing `lines`) and callers of those symbols are
+        returned too; otherwise, or if the index fails, each file's head is
+        used. Missing or unreadable files are omitted from `contents`.
+        """
+        try:
+            index = self.symbol_index
+            if index is not None:
+                return select_context(
+                    index, files, terms, max_chars, lines, self.config.index.max_callers
+                )
+        except Exception as e:
+            logger.warning("Symbol index unavailable, reading whole files: %s", e)
+
+        contents: dict[str, str] = {}
+        for fpath in files:
+            try:
+                contents[fpath] = file_editor.read_file(fpath, base_dir=self.workdir)[:max_chars]
+            except (OSError, UnicodeDecodeError):
+                continue
+        return contents, {}
+
     def run(self, agent_input: AgentInput) -> AgentOutput:
         raise NotImplementedError(
             f"{self.__class__.__name__} must implement run()"
         )
 
+    async def arun(self, agent_input: AgentInput) -> AgentOutput:
+        """Async entry point; subclasses override with an asyncio-native version."""
+        return await asyncio.to_thread(self.run, agent_input)
+
     def load_prompt(self) -> str:
         """Load the system prompt for this agent.
 
@@ -102,98 +231,480 @@ class BaseAgent:
         try:
             templates_pkg = resources.files("devlution.templates.prompts")
             prompt_file = templates_pkg / f"{self.agent_name}.md"
-            return prompt_file.read_text()  # type: ignore[union-attr]
+            return prompt_file.read_text()
         except (FileNotFoundError, TypeError):
             return f"You are the {self.agent_name} agent in the Devlution pipeline."
 
     def call_llm(
         self,
-        system: str,
+        system: str | list[dict[str, Any]],
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None = None,
         model: str | None = None,
         max_tokens: int | None = None,
+        on_event: EventHandler | None = None,
     ) -> anthropic.types.Message:
-        """Call the Anthropic API with retry, logging, and token tracking."""
-        model = model or self.llm_config.model
-        max_tokens = max_tokens or self.llm_config.max_tokens
+        """Call the Anthropic API with retry, logging, and token tracking.
 
-        kwargs: dict[str, Any] = {
-            "model": model,
-            "max_tokens": max_tokens,
-            "system": system,
-            "messages": messages,
-        }
-        if tools:
-            kwargs["tools"] = tools
+        With `llm.stream` enabled the response is streamed and `on_event` is
+        called for each JSON field as it completes; if it returns True the
+        stream is closed and the partial message is returned.
+        """
+        kwargs = self._build_llm_request(system, messages, tools, model, max_tokens)
+
+        cache_key = make_cache_key(kwargs) if self.use_response_cache else None
+        if cache_key is not None:
+            cached = self._cache_lookup(cache_key, kwargs["model"])
+            if cached is not None:
+                self._replay_events(cached, on_event)
+                return cached
 
         start = time.time()
         last_error: Exception | None = None
+        limiter = get_rate_limiter(kwargs["model"], self.llm_config.rate_limit)
+        governor = get_governor(self.llm_config.governor)
+        estimate = estimate_tokens(kwargs)
 
         for attempt in range(3):
+            wait = limiter.reserve(estimate)
+            if governor is not None:
+                wait = max(wait, governor.reserve(estimate))
+            time.sleep(wait)
             try:
-                response = self.client.messages.create(**kwargs)
-                duration_ms = int((time.time() - start) * 1000)
-
-                tokens = (
-                    response.usage.input_tokens + response.usage.output_tokens
-                    if response.usage
-                    else 0
+                aborted = False
+                with governor.slot() if governor is not None else nullcontext():
+                    if self.llm_config.stream:
+                        response, aborted = self._stream_message(kwargs, on_event)
+                    else:
+                        response = self.client.messages.create(**kwargs)
+                tokens = self._record_llm_call(
+                    response, kwargs["model"], attempt, start, cache_key, aborted
                 )
+                limiter.settle(estimate, tokens)
+                if governor is not None:
+                    governor.settle(estimate, tokens)
+                return response
 
-                self.audit.record(
-                    pipeline_id=self.state.pipeline_id,
-                    agent=self.agent_name,
-                    action="llm_call",
-                    details={"model": model, "attempt": attempt + 1},
-                    tokens_used=tokens,
-                    duration_ms=duration_ms,
+            except anthropic.RateLimitError as e:
+                self._refund_attempt(limiter, governor, estimate)
+                wait = retry_delay(e, attempt, self.llm_config.rate_limit.max_backoff_seconds)
+                limiter.pause(wait)
+                logger.warning(
+                    "Rate limited on attempt %d, retrying in %.1fs", attempt + 1, wait
                 )
+                last_error = e
+            except anthropic.APIError as e:
+                self._refund_attempt(limiter, governor, estimate)
+                last_error = e
+                logger.error("API error on attempt %d: %s", attempt + 1, e)
+                if attempt < 2:
+                    time.sleep(1)
 
+        raise RuntimeError(
+            f"LLM call failed after 3 attempts: {last_error}"
+        )
+
+    async def acall_llm(
+        self,
+        system: str | list[dict[str, Any]],
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int | None = None,
+        on_event: EventHandler | None = None,
+    ) -> anthropic.types.Message:
+        """Async counterpart of `call_llm` that never blocks the event loop."""
+        kwargs = self._build_llm_request(system, messages, tools, model, max_tokens)
+
+        cache_key = make_cache_key(kwargs) if self.use_response_cache else None
+        if cache_key is not None:
+            cached = self._cache_lookup(cache_key, kwargs["model"])
+            if cached is not None:
+                self._replay_events(cached, on_event)
+                return cached
+
+        start = time.time()
+        last_error: Exception | None = None
+        limiter = get_rate_limiter(kwargs["model"], self.llm_config.rate_limit)
+        governor = get_governor(self.llm_config.governor)
+        estimate = estimate_tokens(kwargs)
+
+        for attempt in range(3):
+            wait = limiter.reserve(estimate)
+            if governor is not None:
+                wait = max(wait, governor.reserve(estimate))
+            await asyncio.sleep(wait)
+            try:
+                aborted = False
+                async with governor.aslot() if governor is not None else nullcontext():
+                    if self.llm_config.stream:
+                        response, aborted = await self._astream_message(kwargs, on_event)
+                    else:
+                        response = await self.aclient.messages.create(**kwargs)
+                tokens = self._record_llm_call(
+                    response, kwargs["model"], attempt, start, cache_key, aborted
+                )
+                limiter.settle(estimate, tokens)
+                if governor is not None:
+                    governor.settle(estimate, tokens)
                 return response
 
-            except anthropic.RateLimitError:
-                wait = 2 ** (attempt + 1)
+            except anthropic.RateLimitError as e:
+                self._refund_attempt(limiter, governor, estimate)
+                wait = retry_delay(e, attempt, self.llm_config.rate_limit.max_backoff_seconds)
+                limiter.pause(wait)
                 logger.warning(
-                    "Rate limited on attempt %d, retrying in %ds", attempt + 1, wait
+                    "Rate limited on attempt %d, retrying in %.1fs", attempt + 1, wait
                 )
-                time.sleep(wait)
-                last_error = anthropic.RateLimitError.__class__()  # type: ignore[assignment]
+                last_error = e
             except anthropic.APIError as e:
+                self._refund_attempt(limiter, governor, estimate)
                 last_error = e
                 logger.error("API error on attempt %d: %s", attempt + 1, e)
                 if attempt < 2:
-                    time.sleep(1)
+                    await asyncio.sleep(1)
 
         raise RuntimeError(
             f"LLM call failed after 3 attempts: {last_error}"
         )
 
-    def score_confidence(self, output: str, rubric: dict[str, str]) -> float:
-        """Ask the LLM to self-score an output against a rubric."""
+    @staticmethod
+    def _refund_attempt(limiter: RateLimiter, governor: HostGovernor | None, estimate: int) -> None:
+        """Return a failed attempt's token reservation, so retries don't use
+        up the budget of requests the API never processed."""
+        limiter.settle(estimate, 0)
+        if governor is not None:
+            governor.settle(estimate, 0)
+
+    def _build_llm_request(
+        self,
+        system: str | list[dict[str, Any]],
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int | None,
+    ) -> dict[str, Any]:
+        """Assemble the `messages.create` keyword arguments.
+
+        With prompt caching enabled, a plain-string system prompt is sent as a
+        cacheable block so repeated calls reuse the processed prefix.
+        """
+        if isinstance(system, str) and self.llm_config.prompt_caching:
+            system = [{"type": "text", "text": system, "cache_control": _EPHEMERAL}]
+
+        kwargs: dict[str, Any] = {
+            "model": model or self.llm_config.model,
+            "max_tokens": max_tokens or self.llm_config.max_tokens,
+            "temperature": self.llm_config.temperature,
+            "system": system,
+            "messages": messages,
+        }
+        if tools:
+            kwargs["tools"] = tools
+        return kwargs
+
+    def _stream_message(
+        self, kwargs: dict[str, Any], on_event: EventHandler | None
+    ) -> tuple[anthropic.types.Message, bool]:
+        """Stream a response, feeding text to a JSON parser; return (message, aborted)."""
+        parser = JSONStreamParser()
+        with self.client.messages.stream(**kwargs) as stream:
+            for text in stream.text_stream:
+                for event in parser.feed(text):
+                    if self._handle_event(event, on_event):
+                        return stream.current_message_snapshot, True
+            return stream.get_final_message(), False
+
+    async def _astream_message(
+        self, kwargs: dict[str, Any], on_event: EventHandler | None
+    ) -> tuple[anthropic.types.Message, bool]:
+        """Async counterpart of `_stream_message`."""
+        parser = JSONStreamParser()
+        async with self.aclient.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                for event in parser.feed(text):
+                    if self._handle_event(event, on_event):
+                        return stream.current_message_snapshot, True
+            return await stream.get_final_message(), False
+
+    def _replay_events(
+        self, message: anthropic.types.Message, on_event: EventHandler | None
+    ) -> None:
+        """Feed a cached response through the JSON parser as if it were streamed,
+        so `on_event` handlers (logging, early stops) see replays too."""
+        if on_event is None or not self.llm_config.stream:
+            return
+        parser = JSONStreamParser()
+        for block in message.content:
+            if isinstance(block, anthropic.types.TextBlock):
+                for event in parser.feed(block.text):
+                    if self._handle_event(event, on_event):
+                        return
+
+    def _handle_event(self, event: JSONEvent, on_event: EventHandler | None) -> bool:
+        if event.index is None:
+            logger.debug("[%s] received %s", self.agent_name, event.key)
+        if on_event is None or not on_event(event):
+            return False
+        logger.info("[%s] stopping response early after %s", self.agent_name, event.key)
+        return True
+
+    def context_block(self, text: str) -> dict[str, Any]:
+        """Wrap stable message context (task, style guide) as a text block.
+
+        The block is marked as a cache breakpoint when prompt caching is enabled,
+        so it should precede the parts of a message that change between calls.
+        """
+        block: dict[str, Any] = {"type": "text", "text": text}
+        if self.llm_config.prompt_caching:
+            block["cache_control"] = _EPHEMERAL
+        return block
+
+    def _record_llm_call(
+        self,
+        response: anthropic.types.Message,
+        model: str,
+        attempt: int,
+        start: float,
+        cache_key: str | None,
+        aborted: bool = False,
+    ) -> int:
+        """Audit a successful API call, store it in the response cache, and
+        return the tokens it used.
+
+        Responses cut short by an early stop are partial and never cached.
+        """
+        duration_ms = int((time.time() - start) * 1000)
+
+        usage = response.usage
+        tokens = usage.input_tokens + usage.output_tokens if usage else 0
+
+        self.audit.record(
+            pipeline_id=self.state.pipeline_id,
+            agent=self.agent_name,
+            action="llm_call",
+            details={
+                "model": model,
+                "attempt": attempt + 1,
+                "cache_read_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+                "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+                "streamed": self.llm_config.stream,
+                "aborted": aborted,
+            },
+            tokens_used=tokens,
+            duration_ms=duration_ms,
+        )
+
+        if cache_key is not None and self.response_cache is not None and not aborted:
+            self.response_cache.put(cache_key, response.model_dump(mode="json"))
+
+        return tokens
+
+    def _cache_lookup(self, key: str, model: str) -> anthropic.types.Message | None:
+        """Return a cached response for `key`, recording the hit or miss."""
+        assert self.response_cache is not None
+        payload = self.response_cache.get(key)
+
+        self.audit.record(
+            pipeline_id=self.state.pipeline_id,
+            agent=self.agent_name,
+            action="llm_cache",
+            details={
+                "model": model,
+                "hit": payload is not None,
+                "key": key[:16],
+                "hits": self.response_cache.hits,
+                "misses": self.response_cache.misses,
+            },
+        )
+
+        if payload is None:
+            return None
         try:
-            messages = build_confidence_prompt(output, rubric)
-            response = self.call_llm(
-                system=CONFIDENCE_RUBRIC_PROMPT,
-                messages=messages,
-                model=self.llm_config.fallback_model,
-                max_tokens=512,
+            return anthropic.types.Message.model_validate(payload)
+        except ValueError as e:
+            logger.warning("Ignoring incompatible cached response %s: %s", key[:16], e)
+            return None
+
+    def score_confidence(
+        self,
+        output: str,
+        rubric: dict[str, str],
+        signals: ConfidenceSignals | None = None,
+    ) -> float:
+        """Score an output against a rubric.
+
+        When `signals` are given, a local score is tried first and the LLM is
+        only asked when that score is ambiguous (or when calibrating).
+        """
+        return self.score_confidence_batch([(output, rubric)], [signals])[0]
+
+    async def ascore_confidence(
+        self,
+        output: str,
+        rubric: dict[str, str],
+        signals: ConfidenceSignals | None = None,
+    ) -> float:
+        """Async counterpart of `score_confidence`."""
+        return (await self.ascore_confidence_batch([(output, rubric)], [signals]))[0]
+
+    def score_confidence_batch(
+        self,
+        items: list[tuple[str, dict[str, str]]],
+        signals: list[ConfidenceSignals | None] | None = None,
+    ) -> list[float]:
+        """Score several (output, rubric) pairs, packing the ones that need the
+        LLM into as few calls as `supervision.confidence.max_batch_size` allows."""
+        local = [self._local_confidence(s) for s in signals or [None] * len(items)]
+        pending = self._needs_llm_score(local)
+
+        llm_scores: list[float | None] = [None] * len(items)
+        if pending:
+            try:
+                scores = self._request_llm_scores([items[i] for i in pending])
+                for i, score in zip(pending, scores):
+                    llm_scores[i] = score
+            except Exception as e:
+                logger.warning("Confidence scoring failed: %s", e)
+
+        return [
+            self._settle_confidence(rubric, *local[i], llm_scores[i])
+            for i, (_, rubric) in enumerate(items)
+        ]
+
+    async def ascore_confidence_batch(
+        self,
+        items: list[tuple[str, dict[str, str]]],
+        signals: list[ConfidenceSignals | None] | None = None,
+    ) -> list[float]:
+        """Async counterpart of `score_confidence_batch`.
+
+        Requests are coalesced with concurrent ones from other agents on the
+        same event loop, so parallel tasks share scoring calls.
+        """
+        local = [self._local_confidence(s) for s in signals or [None] * len(items)]
+        pending = self._needs_llm_score(local)
+
+        llm_scores: list[float | None] = [None] * len(items)
+        if pending:
+            config = self.config.supervision.confidence
+            batcher = get_confidence_batcher(
+                self.llm_config.fallback_model, config.max_batch_size, config.batch_window_ms
             )
-            text = response.content[0].text if response.content else ""
-            score = parse_confidence_response(text)
-
-            self.audit.record(
-                pipeline_id=self.state.pipeline_id,
-                agent=self.agent_name,
-                action="confidence_score",
-                confidence=score,
-                details={"rubric_keys": list(rubric.keys())},
+            results = await asyncio.gather(
+                *(batcher.submit(self, *items[i]) for i in pending), return_exceptions=True
             )
+            for i, result in zip(pending, results):
+                if isinstance(result, BaseException):
+                    logger.warning("Confidence scoring failed: %s", result)
+                else:
+                    llm_scores[i] = result
+
+        return [
+            self._settle_confidence(rubric, *local[i], llm_scores[i])
+            for i, (_, rubric) in enumerate(items)
+        ]
+
+    def _needs_llm_score(self, local: list[tuple[float | None, bool]]) -> list[int]:
+        calibrate = self.config.supervision.confidence.calibrate
+        return [i for i, (_, decisive) in enumerate(local) if calibrate or not decisive]
+
+    def _request_llm_scores(self, items: list[tuple[str, dict[str, str]]]) -> list[float]:
+        """LLM scores for `items`, one call per `max_batch_size` chunk."""
+        scores: list[float] = []
+        for chunk in self._score_chunks(items):
+            response = self.call_llm(**self._score_request(chunk))
+            scores.extend(self._parse_scores(response, len(chunk)))
+        return scores
+
+    async def _arequest_llm_scores(self, items: list[tuple[str, dict[str, str]]]) -> list[float]:
+        """Async counterpart of `_request_llm_scores`."""
+        scores: list[float] = []
+        for chunk in self._score_chunks(items):
+            response = await self.acall_llm(**self._score_request(chunk))
+            scores.extend(self._parse_scores(response, len(chunk)))
+        return scores
+
+    def _score_chunks(
+        self, items: list[tuple[str, dict[str, str]]]
+    ) -> list[list[tuple[str, dict[str, str]]]]:
+        size = max(1, self.config.supervision.confidence.max_batch_size)
+        return [items[i : i + size] for i in range(0, len(items), size)]
+
+    def _score_request(self, chunk: list[tuple[str, dict[str, str]]]) -> dict[str, Any]:
+        if len(chunk) == 1:
+            return {
+                "system": CONFIDENCE_RUBRIC_PROMPT,
+                "messages": build_confidence_prompt(*chunk[0]),
+                "model": self.llm_config.fallback_model,
+                "max_tokens": 512,
+            }
+        return {
+            "system": CONFIDENCE_BATCH_PROMPT,
+            "messages": build_batch_confidence_prompt(chunk),
+            "model": self.llm_config.fallback_model,
+            "max_tokens": 512 * len(chunk),
+        }
 
-            return score
-        except Exception as e:
-            logger.warning("Confidence scoring failed: %s", e)
-            return 0.5
+    @staticmethod
+    def _parse_scores(response: anthropic.types.Message, count: int) -> list[float]:
+        text = response_text(response)
+        if count == 1:
+            return [parse_confidence_response(text)]
+        return parse_confidence_response(text, count)
+
+    def _local_confidence(self, signals: ConfidenceSignals | None) -> tuple[float | None, bool]:
+        if signals is None or not self.config.supervision.confidence.local:
+            return None, False
+        return self.local_scorer.score(signals)
+
+    def _record_local_confidence(self, score: float, rubric: dict[str, str]) -> float:
+        self.audit.record(
+            pipeline_id=self.state.pipeline_id,
+            agent=self.agent_name,
+            action="confidence_score",
+            confidence=score,
+            details={"rubric_keys": list(rubric.keys()), "method": "local", "local_score": score},
+        )
+        return score
+
+    def _settle_confidence(
+        self,
+        rubric: dict[str, str],
+        local: float | None,
+        decisive: bool,
+        llm_score: float | None,
+    ) -> float:
+        """Pick the final score for one item and audit it."""
+        if llm_score is None:
+            if decisive and local is not None:
+                return self._record_local_confidence(local, rubric)
+            # The LLM call failed; fall back to whatever we have.
+            return local if local is not None else 0.5
+
+        # A decisive local score still wins; the LLM score is kept for calibration.
+        if decisive and local is not None:
+            score, method = local, "local"
+        else:
+            score, method = llm_score, "llm"
+
+        details: dict[str, Any] = {
+            "rubric_keys": list(rubric.keys()),
+            "method": method,
+            "llm_score": llm_score,
+        }
+        if local is not None:
+            details["local_score"] = local
+
+        self.audit.record(
+            pipeline_id=self.state.pipeline_id,
+            agent=self.agent_name,
+            action="confidence_score",
+            confidence=score,
+            details=details,
+        )
+
+        return score
 
     def escalate(self, reason: str) -> EscalationEvent:
         """Log an escalation event and mark the pipeline as waiting for human."""
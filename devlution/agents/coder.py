@@ -5,11 +5,15 @@ from __future__ import annotations
 import json
 import logging
 import time
+from pathlib import Path
 from typing import Any
 
-from devlution.agents.base import AgentInput, AgentOutput, BaseAgent
+from devlution.agents.base import AgentInput, AgentOutput, BaseAgent, response_text
+from devlution.supervision.confidence import ConfidenceSignals, extract_signals
 from devlution.tools import file_editor, git_ops
 from devlution.tools.code_executor import run_command
+from devlution.tools.static_analysis import run_lint
+from devlution.tools.symbol_index import terms_from_text
 
 logger = logging.getLogger(__name__)
 
@@ -24,21 +28,83 @@ CODER_RUBRIC = {
 class CoderAgent(BaseAgent):
     agent_name = "coder"
 
+    @property
+    def use_response_cache(self) -> bool:
+        # Sampled completions are not reproducible; replaying a cached one
+        # would hide the variation that a re-run is meant to produce.
+        return super().use_response_cache and self.llm_config.temperature == 0
+
     def run(self, agent_input: AgentInput) -> AgentOutput:
         start = time.time()
         system_prompt = self.load_prompt()
 
+        try:
+            user_message = self._build_message(agent_input)
+            response = self.call_llm(
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_message}],
+            )
+
+            text = response_text(response, "{}")
+            result = self._parse_response(text)
+
+            confidence = result.get("confidence", 0.0)
+            if confidence < 0.5:
+                confidence = self.score_confidence(
+                    text, CODER_RUBRIC, self._confidence_signals(text, result)
+                )
+
+            return self._finish(result, confidence, start)
+
+        except Exception as e:
+            logger.error("Coder failed: %s", e)
+            return AgentOutput(success=False, error=str(e), confidence=0.0)
+
+    async def arun(self, agent_input: AgentInput) -> AgentOutput:
+        start = time.time()
+        system_prompt = self.load_prompt()
+
+        try:
+            user_message = self._build_message(agent_input)
+            response = await self.acall_llm(
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_message}],
+            )
+
+            text = response_text(response, "{}")
+            result = self._parse_response(text)
+
+            confidence = result.get("confidence", 0.0)
+            if confidence < 0.5:
+                confidence = await self.ascore_confidence(
+                    text, CODER_RUBRIC, self._confidence_signals(text, result)
+                )
+
+            return self._finish(result, confidence, start)
+
+        except Exception as e:
+            logger.error("Coder failed: %s", e)
+            return AgentOutput(success=False, error=str(e), confidence=0.0)
+
+    def _build_message(self, agent_input: AgentInput) -> list[dict[str, Any]]:
+        """Build the user content: the task, criteria and style guide first
+        (fixed for the whole task, so cacheable), then file excerpts, review
+        feedback and instructions.
+
+        The excerpts are re-read every call and change once the coder has
+        edited the files, so they stay after the cache breakpoint. They are
+        selected from the task's own text only, not the review comments.
+        """
         task_title = agent_input.get("title", "")
         task_criteria = agent_input.get("acceptance_criteria", [])
         affected_files = agent_input.get("files_likely_affected", [])
         review_comments = agent_input.get("review_comments", [])
 
-        file_contents: dict[str, str] = {}
-        for fpath in affected_files:
-            try:
-                file_contents[fpath] = file_editor.read_file(fpath)
-            except FileNotFoundError:
-                file_contents[fpath] = "(new file — does not exist yet)"
+        terms = terms_from_text(" ".join([task_title, *task_criteria]))
+        found, callers = self.read_context(affected_files, terms)
+        file_contents = {
+            fpath: found.get(fpath, "(new file — does not exist yet)") for fpath in affected_files
+        }
 
         style_guide = self._load_style_guide()
 
@@ -51,65 +117,79 @@ class CoderAgent(BaseAgent):
         if style_guide:
             context_parts.append(f"## Style Guide\n{style_guide[:2000]}")
 
+        request_parts: list[str] = []
         if file_contents:
             for fpath, content in file_contents.items():
-                context_parts.append(f"## File: {fpath}\n```\n{content[:4000]}\n```")
+                request_parts.append(f"## File: {fpath}\n```\n{content[:4000]}\n```")
+
+        if callers:
+            request_parts.append(
+                "## Callers of the code above\n"
+                + "\n".join(f"### {label}\n```\n{code}\n```" for label, code in callers.items())
+            )
 
         if review_comments:
-            context_parts.append(
+            request_parts.append(
                 "## Review Comments (from previous iteration)\n"
                 + "\n".join(f"- {c}" for c in review_comments)
             )
+        request_parts.append("Implement the required changes. Return JSON with your changes.")
 
-        user_message = "\n\n".join(context_parts)
-        user_message += "\n\nImplement the required changes. Return JSON with your changes."
+        return [
+            self.context_block("\n\n".join(context_parts)),
+            {"type": "text", "text": "\n\n".join(request_parts)},
+        ]
 
+    def _finish(self, result: dict[str, Any], confidence: float, start: float) -> AgentOutput:
         max_iterations = self.config.agents.coder.max_iterations
         iteration = self.state.iterations.get("coder", 0)
-
+        self.state.iterations["coder"] = iteration + 1
+
+        duration_ms = int((time.time() - start) * 1000)
+        self._record_audit(
+            "code_complete",
+            details={
+                "files_modified": result.get("files_modified", []),
+                "iteration": iteration + 1,
+            },
+            confidence=confidence,
+            duration_ms=duration_ms,
+        )
+
+        return AgentOutput(
+            success=True,
+            data=result,
+            confidence=confidence,
+            escalate=iteration + 1 >= max_iterations and confidence < 0.75,
+        )
+
+    def _confidence_signals(self, text: str, result: dict[str, Any]) -> ConfidenceSignals:
+        signals = extract_signals(text, ["files_modified", "summary"])
+        diff = result.get("diff") or result.get("patch")
+        if isinstance(diff, str):
+            signals.diff_lines = diff.count("\n")
+        if self.config.agents.coder.lint_signal:
+            signals.lint_findings = self._lint_findings(result.get("files_modified", []))
+        return signals
+
+    def _lint_findings(self, files: list[str]) -> int | None:
+        """Lint findings in `files`, from a (cached) run of the project's lint command."""
         try:
-            response = self.call_llm(
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_message}],
-            )
-
-            text = response.content[0].text if response.content else "{}"
-            result = self._parse_response(text)
-            confidence = result.get("confidence", 0.0)
-
-            if confidence < 0.5:
-                confidence = self.score_confidence(text, CODER_RUBRIC)
-
-            self.state.iterations["coder"] = iteration + 1
-
-            duration_ms = int((time.time() - start) * 1000)
-            self._record_audit(
-                "code_complete",
-                details={
-                    "files_modified": result.get("files_modified", []),
-                    "iteration": iteration + 1,
-                },
-                confidence=confidence,
-                duration_ms=duration_ms,
-            )
-
-            return AgentOutput(
-                success=True,
-                data=result,
-                confidence=confidence,
-                escalate=iteration + 1 >= max_iterations and confidence < 0.75,
+            lint = run_lint(
+                self.config.project.lint_command, cwd=self.workdir, cache=self.analysis_cache
             )
-
         except Exception as e:
-            logger.error("Coder failed: %s", e)
-            return AgentOutput(success=False, error=str(e), confidence=0.0)
+            logger.warning("Lint for confidence scoring failed: %s", e)
+            return None
+        modified = {Path(f).as_posix() for f in files}
+        return sum(1 for finding in lint.findings if Path(finding.file).as_posix() in modified)
 
     def _load_style_guide(self) -> str:
         """Try to load the project's style guide."""
         guide_path = self.config.agents.coder.style_guide
         for candidate in [guide_path, "CLAUDE.md", ".cursorrules"]:
             try:
-                return file_editor.read_file(candidate)
+                return file_editor.read_file(candidate, base_dir=self.workdir)
             except FileNotFoundError:
                 continue
         return ""
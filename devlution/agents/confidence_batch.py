@@ -0,0 +1,89 @@
+"""Coalesces concurrent confidence-scoring requests into batched LLM calls.
+
+A reviewer scoring each file of a diff, or a task fan-out running several
+agents at once, asks for many LLM confidence scores within milliseconds. `ConfidenceBatcher`
+holds requests for a short window (or until `max_batch_size` accumulate) and
+scores them together in a single `fallback_model` call per pipeline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from devlution.agents.base import BaseAgent
+
+_Pending = tuple["BaseAgent", str, dict[str, str], asyncio.Future[float]]
+
+
+class ConfidenceBatcher:
+    """Per-event-loop queue of (output, rubric) pairs awaiting an LLM score."""
+
+    def __init__(self, max_batch_size: int = 8, window_ms: int = 50):
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = window_ms / 1000
+        self._pending: list[_Pending] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, agent: BaseAgent, output: str, rubric: dict[str, str]) -> float:
+        """Queue one item and wait for its score."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[float] = loop.create_future()
+        self._pending.append((agent, output, rubric, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._score(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, batch: list[_Pending]) -> None:
+        # One call per pipeline, so each call's token usage is audited under the
+        # pipeline that asked for it; parallel tasks of one pipeline still share.
+        groups: dict[str, list[_Pending]] = {}
+        for pending in batch:
+            groups.setdefault(pending[0].state.pipeline_id, []).append(pending)
+        await asyncio.gather(*(self._score_group(group) for group in groups.values()))
+
+    async def _score_group(self, batch: list[_Pending]) -> None:
+        # The first requester's agent makes the call, so the audit entry is
+        # attributed to it; every requester records its own confidence_score.
+        agent = batch[0][0]
+        try:
+            scores = await agent._arequest_llm_scores([(o, r) for _, o, r, _ in batch])
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (*_, future), score in zip(batch, scores):
+            if not future.done():
+                future.set_result(score)
+
+
+_batchers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, ConfidenceBatcher]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_confidence_batcher(model: str, max_batch_size: int, window_ms: int) -> ConfidenceBatcher:
+    """Return the batcher for `model` on the running event loop."""
+    by_model = _batchers.setdefault(asyncio.get_running_loop(), {})
+    batcher = by_model.get(model)
+    if batcher is None:
+        batcher = ConfidenceBatcher(max_batch_size, window_ms)
+        by_model[model] = batcher
+    return batcher
@@ -7,9 +7,10 @@ import logging
 import time
 from typing import Any
 
-from devlution.agents.base import AgentInput, AgentOutput, BaseAgent
-from devlution.tools import file_editor
+from devlution.agents.base import AgentInput, AgentOutput, BaseAgent, response_text
 from devlution.tools.code_executor import run_tests
+from devlution.tools.log_distiller import distill
+from devlution.tools.symbol_index import terms_from_text, traceback_lines
 
 logger = logging.getLogger(__name__)
 
@@ -27,77 +28,115 @@ class DebuggerAgent(BaseAgent):
     def run(self, agent_input: AgentInput) -> AgentOutput:
         start = time.time()
         system_prompt = self.load_prompt()
+        attempt = self.state.iterations.get("debugger", 0) + 1
 
-        failure_log = agent_input.get("failure_log", "")
-        source_files = agent_input.get("source_files", [])
+        try:
+            user_message = self._build_message(agent_input, attempt)
+            response = self.call_llm(
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_message}],
+            )
+
+            text = response_text(response, "{}")
+            return self._finish(self._parse_response(text), attempt, start)
+
+        except Exception as e:
+            return self._fail(e, attempt)
+
+    async def arun(self, agent_input: AgentInput) -> AgentOutput:
+        start = time.time()
+        system_prompt = self.load_prompt()
         attempt = self.state.iterations.get("debugger", 0) + 1
 
-        max_attempts = self.config.agents.debugger.max_fix_attempts
+        try:
+            user_message = self._build_message(agent_input, attempt)
+            response = await self.acall_llm(
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_message}],
+            )
 
-        file_contents: dict[str, str] = {}
-        for fpath in source_files:
-            try:
-                file_contents[fpath] = file_editor.read_file(fpath)
-            except FileNotFoundError:
-                continue
+            text = response_text(response, "{}")
+            return self._finish(self._parse_response(text), attempt, start)
+
+        except Exception as e:
+            return self._fail(e, attempt)
+
+    def _build_message(self, agent_input: AgentInput, attempt: int) -> list[dict[str, Any]]:
+        """Build the user content: the failure log for this attempt, then the
+        source excerpts it points at, then instructions.
+
+        The excerpts are chosen from the failure log's terms and traceback
+        lines, so they change with every attempt and are not marked cacheable.
+        """
+        debugger_config = self.config.agents.debugger
+        raw_log = agent_input.get("failure_log", "")
+        try:
+            failure_log = distill(raw_log, self.workdir, debugger_config.max_log_chars)
+        except Exception as e:
+            logger.warning("Log distilling failed, sending the raw log: %s", e)
+            failure_log = raw_log[-debugger_config.max_log_chars :]
+        source_files = agent_input.get("source_files", [])
+        max_attempts = debugger_config.max_fix_attempts
+
+        file_contents, callers = self.read_context(
+            source_files,
+            terms_from_text(failure_log),
+            lines=traceback_lines(failure_log, source_files),
+        )
 
         context_parts = [
-            f"## Failure Log\n```\n{failure_log[:6000]}\n```",
+            f"## Failure Log\n```\n{failure_log}\n```",
             f"## Fix attempt: {attempt} of {max_attempts}",
         ]
-
-        for fpath, content in file_contents.items():
-            context_parts.append(f"## Source: {fpath}\n```\n{content[:4000]}\n```")
-
+        context_parts.extend(
+            f"## Source: {fpath}\n```\n{text[:4000]}\n```" for fpath, text in file_contents.items()
+        )
+        context_parts.extend(
+            f"## Caller: {label}\n```\n{code}\n```" for label, code in callers.items()
+        )
         user_message = "\n\n".join(context_parts)
         user_message += (
             "\n\nFollow the chain-of-thought protocol: parse error, identify path, "
             "hypothesize top 3 causes, generate minimal fix, verify."
         )
+        return [{"type": "text", "text": user_message}]
 
-        try:
-            response = self.call_llm(
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_message}],
-            )
-
-            text = response.content[0].text if response.content else "{}"
-            analysis = self._parse_response(text)
-
-            self.state.iterations["debugger"] = attempt
-            confidence = analysis.get("confidence", 0.0)
-
-            should_escalate = attempt >= max_attempts and not analysis.get("verified", False)
-
-            duration_ms = int((time.time() - start) * 1000)
-            self._record_audit(
-                "debug_complete",
-                details={
-                    "error_type": analysis.get("error_type", "unknown"),
-                    "root_cause": analysis.get("root_cause", ""),
-                    "attempt": attempt,
-                    "verified": analysis.get("verified", False),
-                },
-                confidence=confidence,
-                duration_ms=duration_ms,
-            )
+    def _finish(self, analysis: dict[str, Any], attempt: int, start: float) -> AgentOutput:
+        max_attempts = self.config.agents.debugger.max_fix_attempts
+        self.state.iterations["debugger"] = attempt
+        confidence = analysis.get("confidence", 0.0)
+
+        should_escalate = attempt >= max_attempts and not analysis.get("verified", False)
+
+        duration_ms = int((time.time() - start) * 1000)
+        self._record_audit(
+            "debug_complete",
+            details={
+                "error_type": analysis.get("error_type", "unknown"),
+                "root_cause": analysis.get("root_cause", ""),
+                "attempt": attempt,
+                "verified": analysis.get("verified", False),
+            },
+            confidence=confidence,
+            duration_ms=duration_ms,
+        )
 
-            return AgentOutput(
-                success=analysis.get("verified", False),
-                data=analysis,
-                confidence=confidence,
-                escalate=should_escalate,
-            )
+        return AgentOutput(
+            success=analysis.get("verified", False),
+            data=analysis,
+            confidence=confidence,
+            escalate=should_escalate,
+        )
 
-        except Exception as e:
-            logger.error("Debugger failed: %s", e)
-            self.state.iterations["debugger"] = attempt
-            return AgentOutput(
-                success=False,
-                error=str(e),
-                confidence=0.0,
-                escalate=attempt >= max_attempts,
-            )
+    def _fail(self, error: Exception, attempt: int) -> AgentOutput:
+        logger.error("Debugger failed: %s", error)
+        self.state.iterations["debugger"] = attempt
+        return AgentOutput(
+            success=False,
+            error=str(error),
+            confidence=0.0,
+            escalate=attempt >= self.config.agents.debugger.max_fix_attempts,
+        )
 
     def _parse_response(self, text: str) -> dict[str, Any]:
         try:
@@ -0,0 +1,208 @@
+"""Host-wide coordination of LLM calls across `devlution` processes.
+
+Several pipelines on one CI runner each have their own in-process rate
+limiter; the governor adds a layer they all share through lock files in a
+common directory:
+
+- **In-flight cap** — `max_in_flight` slot files; a call holds an exclusive
+  `flock` on one of them while the request is open. Locks are released by the
+  kernel if a process dies, so a crashed worker never leaks a slot.
+- **Token throughput** — a token bucket persisted in `tokens.json`, updated
+  under an exclusive lock, so every process draws from one budget.
+
+Requires `fcntl` (POSIX); on other platforms the governor is disabled. The
+default directory is per user; if its files cannot be opened (e.g. a shared
+directory owned by someone else), the governor disables itself with a warning
+rather than failing LLM calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from devlution.config import GovernorConfig
+
+logger = logging.getLogger(__name__)
+
+_POLL_SECONDS = 0.05
+
+
+def _fcntl() -> Any:
+    try:
+        import fcntl
+    except ImportError:
+        return None
+    return fcntl
+
+
+class HostGovernor:
+    """Caps concurrent LLM requests and token throughput for the whole host."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_in_flight: int = 0,
+        tokens_per_minute: int = 0,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_in_flight = max_in_flight
+        self.tokens_per_minute = tokens_per_minute
+        self.disabled = False
+        self._fcntl = _fcntl()
+
+    def _open(self, name: str) -> int | None:
+        """Open (creating if needed) a lock file; None, and the governor disabled, on error."""
+        try:
+            return os.open(self.directory / name, os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError as e:
+            if not self.disabled:
+                path = self.directory / name
+                logger.warning("Cannot open %s (%s); LLM governor disabled", path, e)
+            self.disabled = True
+            return None
+
+    def try_acquire(self) -> int | None:
+        """Lock a free slot without blocking; return its file descriptor."""
+        fcntl = self._fcntl
+        for i in range(self.max_in_flight):
+            fd = self._open(f"slot-{i}.lock")
+            if fd is None:
+                return None
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    def release(self, fd: int) -> None:
+        self._fcntl.flock(fd, self._fcntl.LOCK_UN)
+        os.close(fd)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one in-flight slot for the duration of the block."""
+        if not self.max_in_flight or self.disabled:
+            yield
+            return
+        fd = self.try_acquire()
+        while fd is None and not self.disabled:
+            time.sleep(_POLL_SECONDS * (1 + random.random()))
+            fd = self.try_acquire()
+        try:
+            yield
+        finally:
+            if fd is not None:
+                self.release(fd)
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        """Async counterpart of `slot` that polls without blocking the loop."""
+        if not self.max_in_flight or self.disabled:
+            yield
+            return
+        fd = self.try_acquire()
+        while fd is None and not self.disabled:
+            await asyncio.sleep(_POLL_SECONDS * (1 + random.random()))
+            fd = self.try_acquire()
+        try:
+            yield
+        finally:
+            if fd is not None:
+                self.release(fd)
+
+    def reserve(self, tokens: int) -> float:
+        """Take `tokens` from the host-wide budget; return seconds to wait first."""
+        if not self.tokens_per_minute:
+            return 0.0
+        rate = self.tokens_per_minute / 60.0
+        with self._bucket() as state:
+            if state is None:
+                return 0.0
+            state["level"] -= min(tokens, self.tokens_per_minute)
+            return -state["level"] / rate if state["level"] < 0 else 0.0
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct a reservation once real token usage is known."""
+        if not self.tokens_per_minute:
+            return
+        with self._bucket() as state:
+            if state is None:
+                return
+            state["level"] = min(self.tokens_per_minute, state["level"] + estimated - actual)
+
+    @contextmanager
+    def _bucket(self) -> Iterator[dict[str, float] | None]:
+        """Lock, refill and yield the shared bucket state; write it back on exit.
+
+        Yields None when the bucket file cannot be opened.
+        """
+        fcntl = self._fcntl
+        fd = self._open("tokens.json")
+        if fd is None:
+            yield None
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), "r+") as f:
+                try:
+                    state = json.loads(f.read() or "{}")
+                except json.JSONDecodeError:
+                    state = {}
+                now = time.time()
+                capacity = float(self.tokens_per_minute)
+                elapsed = max(0.0, now - state.get("updated", now))
+                level = state.get("level", capacity) + elapsed * capacity / 60.0
+                state = {"level": min(capacity, level), "updated": now}
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+_governors: dict[tuple[str, int, int], HostGovernor] = {}
+
+
+def get_governor(config: GovernorConfig) -> HostGovernor | None:
+    """Return the governor for `config`, or None when it is disabled."""
+    if not (config.max_in_flight or config.tokens_per_minute):
+        return None
+    if _fcntl() is None:
+        logger.warning("fcntl unavailable; cross-process LLM governor disabled")
+        return None
+
+    directory = config.directory or str(default_directory())
+    key = (directory, config.max_in_flight, config.tokens_per_minute)
+    governor = _governors.get(key)
+    if governor is None:
+        try:
+            governor = HostGovernor(directory, config.max_in_flight, config.tokens_per_minute)
+        except OSError as e:
+            logger.warning("Cannot create %s (%s); LLM governor disabled", directory, e)
+            return None
+        _governors[key] = governor
+    return None if governor.disabled else governor
+
+
+def default_directory() -> Path:
+    """Per-user lock directory: `$XDG_RUNTIME_DIR` or `~/.cache`, so another
+    user's files never get in the way."""
+    base = os.environ.get("XDG_RUNTIME_DIR") or str(Path.home() / ".cache")
+    return Path(base) / "devlution-governor"
@@ -0,0 +1,196 @@
+"""Incremental extraction of JSON fields from a streamed LLM response.
+
+Agents ask the model for a single JSON object, possibly surrounded by prose.
+`JSONStreamParser` is fed text chunks as they arrive and reports each
+top-level field once its value is complete, plus each element of a top-level
+array (e.g. the planner's `tasks`) as soon as that element closes. Every
+character is scanned once, so the cost stays linear in the response length.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_WS = " \t\r\n"
+
+
+@dataclass
+class JSONEvent:
+    """A completed top-level field, or one element of a top-level array field.
+
+    `index` is None for a whole field and the element position otherwise.
+    """
+
+    key: str
+    value: Any
+    index: int | None = None
+
+
+class JSONStreamParser:
+    """Scans the first JSON object in a text stream and emits `JSONEvent`s."""
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self.fields: dict[str, Any] = {}
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Top-level object state: "key" -> "colon" -> "value" -> "comma".
+        self._expect = "key"
+        self._key: str | None = None
+        self._start = 0
+        self._scalar = False
+        # Element tracking when the current top-level value is an array.
+        self._array = False
+        self._item_start = 0
+        self._item_scalar = False
+        self._item_index = 0
+
+    def feed(self, chunk: str) -> list[JSONEvent]:
+        """Consume `chunk` and return the events it completed, in order."""
+        self.buffer += chunk
+        events: list[JSONEvent] = []
+        buf = self.buffer
+        i = self._pos
+        while i < len(buf) and not self.done:
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._string_closed(i, events)
+            elif self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+            elif self._depth == 1:
+                self._top_level(ch, i, events)
+            elif self._depth == 2 and self._array:
+                self._array_level(ch, i, events)
+            else:
+                self._nested(ch, i, events)
+            i += 1
+        self._pos = i
+        return events
+
+    def _top_level(self, ch: str, i: int, events: list[JSONEvent]) -> None:
+        if self._scalar:
+            if ch not in _WS and ch not in ",}":
+                return
+            self._scalar = False
+            self._emit_field(self.buffer[self._start : i], events)
+
+        if self._expect == "key":
+            if ch == '"':
+                self._start = i
+                self._in_string = True
+            elif ch == "}":
+                self._close_root()
+        elif self._expect == "colon":
+            if ch == ":":
+                self._expect = "value"
+        elif self._expect == "value":
+            if ch in _WS:
+                return
+            self._start = i
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth = 2
+                self._array = ch == "["
+                self._item_index = 0
+            else:
+                self._scalar = True
+        elif ch == ",":
+            self._expect = "key"
+        elif ch == "}":
+            self._close_root()
+
+    def _array_level(self, ch: str, i: int, events: list[JSONEvent]) -> None:
+        if self._item_scalar:
+            if ch not in _WS and ch not in ",]":
+                return
+            self._item_scalar = False
+            self._emit_item(self.buffer[self._item_start : i], events)
+
+        if ch in _WS or ch == ",":
+            return
+        if ch == "]":
+            self._depth = 1
+            self._array = False
+            self._emit_field(self.buffer[self._start : i + 1], events)
+            return
+
+        self._item_start = i
+        if ch == '"':
+            self._in_string = True
+        elif ch in "{[":
+            self._depth = 3
+        else:
+            self._item_scalar = True
+
+    def _nested(self, ch: str, i: int, events: list[JSONEvent]) -> None:
+        if ch == '"':
+            self._in_string = True
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            self._depth -= 1
+            if self._depth == 1:
+                self._emit_field(self.buffer[self._start : i + 1], events)
+            elif self._depth == 2 and self._array:
+                self._emit_item(self.buffer[self._item_start : i + 1], events)
+
+    def _string_closed(self, i: int, events: list[JSONEvent]) -> None:
+        if self._depth == 1:
+            raw = self.buffer[self._start : i + 1]
+            if self._expect == "key":
+                self._key = json.loads(raw)
+                self._expect = "colon"
+            elif self._expect == "value":
+                self._emit_field(raw, events)
+        elif self._depth == 2 and self._array:
+            self._emit_item(self.buffer[self._item_start : i + 1], events)
+
+    def _emit_field(self, raw: str, events: list[JSONEvent]) -> None:
+        key, self._key = self._key, None
+        self._expect = "comma"
+        if key is None:
+            return
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.debug("Skipping malformed streamed value for %r: %.80s", key, raw)
+            return
+        self.fields[key] = value
+        events.append(JSONEvent(key, value))
+
+    def _emit_item(self, raw: str, events: list[JSONEvent]) -> None:
+        index = self._item_index
+        self._item_index += 1
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.debug("Skipping malformed streamed element: %.80s", raw)
+            return
+        events.append(JSONEvent(self._key or "", value, index))
+
+    def _close_root(self) -> None:
+        self._depth = 0
+        self.done = True
+
+
+def parse_partial(text: str) -> dict[str, Any]:
+    """Return the top-level fields that are complete in a possibly truncated response."""
+    parser = JSONStreamParser()
+    parser.feed(text)
+    return parser.fields
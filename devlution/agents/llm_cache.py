@@ -0,0 +1,165 @@
+"""Content-addressed on-disk cache for LLM responses.
+
+Requests are keyed by a SHA-256 of the full request payload (model, system,
+messages, tools, max_tokens, temperature), so replaying the same issue
+through the pipeline returns the stored response instead of paying for the
+call again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(request: dict[str, Any]) -> str:
+    """Return a stable hex digest for an LLM request payload."""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Interface for LLM response caches used by BaseAgent.
+
+    Subclasses store serialized response payloads by key and track
+    hit/miss counters for the audit log.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raise NotImplementedError(f"{self.__class__.__name__} must implement get()")
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        raise NotImplementedError(f"{self.__class__.__name__} must implement put()")
+
+
+class DiskResponseCache(ResponseCache):
+    """Stores one JSON file per response under a two-level fan-out directory.
+
+    Entries older than `max_age_hours` are treated as misses and removed.
+    When the directory grows past `max_size_mb`, the least recently used
+    entries (by mtime, refreshed on every hit) are evicted. The directory
+    size is counted once and then tracked on writes, so only a write that
+    crosses the budget scans the directory.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = ".devlution/cache/llm",
+        max_size_mb: int = 256,
+        max_age_hours: int = 168,
+    ):
+        super().__init__()
+        self.directory = Path(directory)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_age_seconds = max_age_hours * 3600
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size: int | None = None  # bytes on disk, counted on first write
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        if time.time() - stat.st_mtime > self.max_age_seconds:
+            path.unlink(missing_ok=True)
+            self._track(-stat.st_size)
+            self.misses += 1
+            return None
+
+        try:
+            payload: dict[str, Any] = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Discarding unreadable cache entry %s", path.name)
+            path.unlink(missing_ok=True)
+            self._track(-stat.st_size)
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        self.hits += 1
+        return payload
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self._size is None:
+            self._size = self._scan()[1]
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Failed to write cache entry %s: %s", path.name, e)
+            Path(tmp).unlink(missing_ok=True)
+            return
+
+        self._track(path.stat().st_size - replaced)
+        if self._size > self.max_size_bytes:
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for entry in self.directory.glob("*/*.json"):
+            entry.unlink(missing_ok=True)
+        self._size = 0
+
+    def _track(self, delta: int) -> None:
+        if self._size is not None:
+            self._size = max(0, self._size + delta)
+
+    def _scan(self) -> tuple[list[tuple[float, int, Path]], int]:
+        """`(entries, total_bytes)` of the live entries; expired ones are removed."""
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+
+        for entry in self.directory.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                entry.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest ones until under the size budget.
+
+        Rescanning also corrects the tracked size for writes by other processes.
+        """
+        entries, total = self._scan()
+        if total > self.max_size_bytes:
+            entries.sort()
+            for _, size, entry in entries:
+                entry.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_size_bytes:
+                    break
+        self._size = total
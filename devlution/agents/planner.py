@@ -7,9 +7,12 @@ import logging
 import time
 from typing import Any
 
-from devlution.agents.base import AgentInput, AgentOutput, BaseAgent
+from devlution.agents.base import AgentInput, AgentOutput, BaseAgent, response_text
+from devlution.agents.json_stream import JSONEvent
 from devlution.config import DevlutionConfig
 from devlution.orchestrator.state import PipelineState, Task
+from devlution.supervision.confidence import ConfidenceSignals, extract_signals
+from devlution.tools.search_index import SearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -27,67 +30,147 @@ class PlannerAgent(BaseAgent):
     def run(self, agent_input: AgentInput) -> AgentOutput:
         start = time.time()
         system_prompt = self.load_prompt()
-
-        issue_title = agent_input.get("title", "")
-        issue_body = agent_input.get("body", "")
-        issue_labels = agent_input.get("labels", [])
-
-        user_message = (
-            f"## Issue\n**Title**: {issue_title}\n\n"
-            f"**Body**:\n{issue_body}\n\n"
-            f"**Labels**: {', '.join(issue_labels) if issue_labels else 'none'}\n\n"
-            f"Maximum subtasks: {self.config.agents.planner.max_subtasks}\n\n"
-            "Analyze this issue and produce a structured task breakdown."
-        )
+        user_message = self._build_message(agent_input)
 
         try:
             response = self.call_llm(
                 system=system_prompt,
                 messages=[{"role": "user", "content": user_message}],
+                on_event=self._report_task,
             )
 
-            text = response.content[0].text if response.content else "{}"
+            text = response_text(response, "{}")
             plan = self._parse_plan(text)
 
-            tasks = [
-                Task(
-                    id=t.get("id", f"T{i+1}"),
-                    title=t.get("title", ""),
-                    files_likely_affected=t.get("files_likely_affected", []),
-                    acceptance_criteria=t.get("acceptance_criteria", []),
-                    estimated_complexity=t.get("estimated_complexity", "medium"),
-                    dependencies=t.get("dependencies", []),
+            confidence = plan.get("confidence", 0.0)
+            if confidence < 0.5:
+                confidence = self.score_confidence(
+                    text, PLANNING_RUBRIC, self._confidence_signals(text, plan)
                 )
-                for i, t in enumerate(plan.get("tasks", []))
-            ]
 
-            confidence = plan.get("confidence", 0.0)
+            return self._finish(plan, confidence, start)
 
-            if confidence < 0.5:
-                confidence = self.score_confidence(text, PLANNING_RUBRIC)
-
-            duration_ms = int((time.time() - start) * 1000)
-            self._record_audit(
-                "plan_complete",
-                details={"task_count": len(tasks), "blockers": plan.get("blockers", [])},
-                confidence=confidence,
-                duration_ms=duration_ms,
-            )
+        except Exception as e:
+            logger.error("Planner failed: %s", e)
+            return AgentOutput(success=False, error=str(e), confidence=0.0, escalate=True)
 
-            return AgentOutput(
-                success=True,
-                data={
-                    "tasks": [t.__dict__ for t in tasks],
-                    "blockers": plan.get("blockers", []),
-                },
-                confidence=confidence,
-                escalate=confidence < 0.5,
+    async def arun(self, agent_input: AgentInput) -> AgentOutput:
+        start = time.time()
+        system_prompt = self.load_prompt()
+        user_message = self._build_message(agent_input)
+
+        try:
+            response = await self.acall_llm(
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_message}],
+                on_event=self._report_task,
             )
 
+            text = response_text(response, "{}")
+            plan = self._parse_plan(text)
+
+            confidence = plan.get("confidence", 0.0)
+            if confidence < 0.5:
+                confidence = await self.ascore_confidence(
+                    text, PLANNING_RUBRIC, self._confidence_signals(text, plan)
+                )
+
+            return self._finish(plan, confidence, start)
+
         except Exception as e:
             logger.error("Planner failed: %s", e)
             return AgentOutput(success=False, error=str(e), confidence=0.0, escalate=True)
 
+    @staticmethod
+    def _report_task(event: JSONEvent) -> None:
+        """Log each planned task as soon as it has been streamed."""
+        if event.key == "tasks" and event.index is not None and isinstance(event.value, dict):
+            logger.info("[planner] task %d: %s", event.index + 1, event.value.get("title", ""))
+
+    def _build_message(self, agent_input: AgentInput) -> str:
+        issue_title = agent_input.get("title", "")
+        issue_body = agent_input.get("body", "")
+        issue_labels = agent_input.get("labels", [])
+
+        candidates = self._candidate_files(f"{issue_title}\n{issue_body}\n{' '.join(issue_labels)}")
+        hints = ""
+        if candidates:
+            hints = (
+                "## Candidate files\n"
+                "Ranked by lexical match with the issue; use them for "
+                "`files_likely_affected` where they fit.\n"
+                + "".join(f"- {path}\n" for path in candidates)
+                + "\n"
+            )
+
+        return (
+            f"## Issue\n**Title**: {issue_title}\n\n"
+            f"**Body**:\n{issue_body}\n\n"
+            f"**Labels**: {', '.join(issue_labels) if issue_labels else 'none'}\n\n"
+            f"{hints}"
+            f"Maximum subtasks: {self.config.agents.planner.max_subtasks}\n\n"
+            "Analyze this issue and produce a structured task breakdown."
+        )
+
+    def _candidate_files(self, text: str) -> list[str]:
+        """Top repository files for `text` from the lexical search index."""
+        index_config = self.config.index
+        if not (index_config.enabled and index_config.search_top_k):
+            return []
+        try:
+            index = SearchIndex(self.workdir, index_config.directory, workers=index_config.workers)
+            try:
+                index.refresh()
+                results = index.search(text, index_config.search_top_k)
+            finally:
+                index.close()
+        except Exception as e:
+            logger.warning("File search failed, planning without hints: %s", e)
+            return []
+        return [path for path, _ in results]
+
+    def _finish(self, plan: dict[str, Any], confidence: float, start: float) -> AgentOutput:
+        tasks = [
+            Task(
+                id=t.get("id", f"T{i+1}"),
+                title=t.get("title", ""),
+                files_likely_affected=t.get("files_likely_affected", []),
+                acceptance_criteria=t.get("acceptance_criteria", []),
+                estimated_complexity=t.get("estimated_complexity", "medium"),
+                dependencies=t.get("dependencies", []),
+            )
+            for i, t in enumerate(plan.get("tasks", []))
+        ]
+
+        duration_ms = int((time.time() - start) * 1000)
+        self._record_audit(
+            "plan_complete",
+            details={"task_count": len(tasks), "blockers": plan.get("blockers", [])},
+            confidence=confidence,
+            duration_ms=duration_ms,
+        )
+
+        return AgentOutput(
+            success=True,
+            data={
+                "tasks": [t.__dict__ for t in tasks],
+                "blockers": plan.get("blockers", []),
+            },
+            confidence=confidence,
+            escalate=confidence < 0.5,
+        )
+
+    def _confidence_signals(self, text: str, plan: dict[str, Any]) -> ConfidenceSignals:
+        """Completeness is the share of tasks with a title, criteria and file hints."""
+        signals = extract_signals(text, ["tasks"])
+        tasks = [t for t in plan.get("tasks", []) if isinstance(t, dict)]
+        if tasks:
+            fields = ("title", "acceptance_criteria", "files_likely_affected")
+            signals.completeness = sum(
+                sum(1 for f in fields if t.get(f)) / len(fields) for t in tasks
+            ) / len(tasks)
+        return signals
+
     def _parse_plan(self, text: str) -> dict[str, Any]:
         """Extract JSON plan from LLM response text."""
         try:
@@ -0,0 +1,129 @@
+"""Client-side rate limiting for LLM calls.
+
+Every agent in the process shares one `RateLimiter` per model, so concurrent
+pipelines draw from the same requests-per-minute and tokens-per-minute
+budgets instead of each discovering the API limit through 429s. When the API
+does return a 429, its `retry-after` pauses the whole model's limiter, so
+callers resume together at a smooth rate rather than retrying in a herd.
+
+Limiters hand out reservations (`reserve()` returns how long to wait) so the
+same object serves both threaded and asyncio callers.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from devlution.config import RateLimitConfig
+
+
+class TokenBucket:
+    """Refills at `per_minute` units per minute up to one minute of burst.
+
+    Reservations may drive the level negative; the deficit is the wait.
+    A rate of 0 means unlimited.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` units; return seconds until they are actually available."""
+        if not self.rate:
+            return 0.0
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return -self.level / self.rate if self.level < 0 else 0.0
+
+    def refund(self, amount: float, now: float) -> None:
+        """Return (or, if negative, additionally take) units after the fact."""
+        if not self.rate:
+            return
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """Requests/min and tokens/min buckets plus a shared retry-after pause."""
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens; return seconds to wait first."""
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self.requests.reserve(1, now),
+                self.tokens.reserve(tokens, now),
+                self._paused_until - now,
+                0.0,
+            )
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct a reservation once the real token usage is known."""
+        with self._lock:
+            self.tokens.refund(estimated - actual, time.monotonic())
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller of this limiter for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model: str, config: RateLimitConfig) -> RateLimiter:
+    """Return the process-wide limiter for `model`, creating it on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limits = config.models.get(model)
+            limiter = RateLimiter(
+                requests_per_minute=(
+                    limits.requests_per_minute if limits else config.requests_per_minute
+                ),
+                tokens_per_minute=limits.tokens_per_minute if limits else config.tokens_per_minute,
+            )
+            _limiters[model] = limiter
+        return limiter
+
+
+def estimate_tokens(request: dict[str, Any]) -> int:
+    """Rough input-token estimate (~4 characters per token) for a request."""
+    payload = [request.get("system"), request.get("messages"), request.get("tools")]
+    return len(json.dumps(payload, default=str)) // 4
+
+
+def retry_delay(error: Exception, attempt: int, max_backoff: float) -> float:
+    """Seconds to wait after a rate-limit error.
+
+    Honours the `retry-after` header when the API sends one, otherwise uses
+    exponential backoff with full jitter so concurrent callers spread out.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(float(retry_after), max_backoff)
+        except ValueError:
+            pass
+    return random.uniform(0, min(max_backoff, 2.0 ** (attempt + 1)))
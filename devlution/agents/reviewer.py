@@ -4,14 +4,19 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 import time
 from typing import Any
 
-from devlution.agents.base import AgentInput, AgentOutput, BaseAgent
+from devlution.agents.base import AgentInput, AgentOutput, BaseAgent, response_text
+from devlution.agents.json_stream import JSONEvent, parse_partial
 from devlution.orchestrator.state import ReviewComment
+from devlution.supervision.confidence import ConfidenceSignals, extract_signals
 
 logger = logging.getLogger(__name__)
 
+_DIFF_HEADER = re.compile(r"^diff --git a/.* b/(?P<path>.*)$", re.MULTILINE)
+
 REVIEW_RUBRIC = {
     "correctness": "Does it solve the task without logic errors?",
     "security": "No vulnerabilities, secrets, or unsafe operations?",
@@ -21,86 +26,173 @@ REVIEW_RUBRIC = {
 }
 
 
+def split_diff(diff: str) -> dict[str, str]:
+    """Split a unified git diff into per-file sections, keyed by the new path."""
+    headers = list(_DIFF_HEADER.finditer(diff))
+    ends = [h.start() for h in headers[1:]] + [len(diff)]
+    return {h.group("path"): diff[h.start() : end] for h, end in zip(headers, ends)}
+
+
 class ReviewerAgent(BaseAgent):
     agent_name = "reviewer"
 
     def run(self, agent_input: AgentInput) -> AgentOutput:
         start = time.time()
         system_prompt = self.load_prompt()
-
-        diff_text = agent_input.get("diff", "")
-        task_title = agent_input.get("task_title", "")
-
-        user_message = (
-            f"## Task\n{task_title}\n\n"
-            f"## Diff to Review\n```diff\n{diff_text[:8000]}\n```\n\n"
-            f"Auto-approve threshold: {self.config.agents.reviewer.auto_approve_threshold}\n"
-            f"Block on: {', '.join(self.config.agents.reviewer.block_on)}\n\n"
-            "Review this diff and return your structured assessment."
-        )
+        user_message = self._build_message(agent_input)
 
         try:
             response = self.call_llm(
                 system=system_prompt,
                 messages=[{"role": "user", "content": user_message}],
+                on_event=self._stop_on_escalation,
             )
 
-            text = response.content[0].text if response.content else "{}"
+            text = response_text(response, "{}")
             review = self._parse_review(text)
+            if review.get("confidence", 0.0) < 0.5:
+                items, signals = self._score_items(text, agent_input, review)
+                review["confidence"] = min(self.score_confidence_batch(items, signals))
+            return self._finish(review, start)
 
-            confidence = review.get("confidence", 0.0)
-            decision = review.get("decision", "escalate_to_human")
-
-            threshold = self.config.agents.reviewer.auto_approve_threshold
-            if confidence < threshold and decision == "approve":
-                decision = "escalate_to_human"
-
-            comments = [
-                ReviewComment(
-                    file=c.get("file", ""),
-                    line=c.get("line", 0),
-                    severity=c.get("severity", "warning"),
-                    body=c.get("body", ""),
-                )
-                for c in review.get("comments", [])
-            ]
-
-            duration_ms = int((time.time() - start) * 1000)
-            self._record_audit(
-                "review_complete",
-                details={
-                    "decision": decision,
-                    "comment_count": len(comments),
-                    "scores": review.get("scores", {}),
-                },
-                confidence=confidence,
-                duration_ms=duration_ms,
+        except Exception as e:
+            logger.error("Reviewer failed: %s", e)
+            return AgentOutput(
+                success=False, error=str(e), confidence=0.0, escalate=True
             )
 
-            return AgentOutput(
-                success=True,
-                data={
-                    "decision": decision,
-                    "comments": [c.__dict__ for c in comments],
-                    "scores": review.get("scores", {}),
-                    "summary": review.get("summary", ""),
-                },
-                confidence=confidence,
-                escalate=decision == "escalate_to_human",
+    async def arun(self, agent_input: AgentInput) -> AgentOutput:
+        start = time.time()
+        system_prompt = self.load_prompt()
+        user_message = self._build_message(agent_input)
+
+        try:
+            response = await self.acall_llm(
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_message}],
+                on_event=self._stop_on_escalation,
             )
 
+            text = response_text(response, "{}")
+            review = self._parse_review(text)
+            if review.get("confidence", 0.0) < 0.5:
+                items, signals = self._score_items(text, agent_input, review)
+                review["confidence"] = min(await self.ascore_confidence_batch(items, signals))
+            return self._finish(review, start)
+
         except Exception as e:
             logger.error("Reviewer failed: %s", e)
             return AgentOutput(
                 success=False, error=str(e), confidence=0.0, escalate=True
             )
 
+    def _build_message(self, agent_input: AgentInput) -> str:
+        diff_text = agent_input.get("diff", "")
+        task_title = agent_input.get("task_title", "")
+
+        return (
+            f"## Task\n{task_title}\n\n"
+            f"## Diff to Review\n```diff\n{diff_text[:8000]}\n```\n\n"
+            f"Auto-approve threshold: {self.config.agents.reviewer.auto_approve_threshold}\n"
+            f"Block on: {', '.join(self.config.agents.reviewer.block_on)}\n\n"
+            "Review this diff and return your structured assessment."
+        )
+
+    def _score_items(
+        self, text: str, agent_input: AgentInput, review: dict[str, Any]
+    ) -> tuple[list[tuple[str, dict[str, str]]], list[ConfidenceSignals | None]]:
+        """One (output, rubric) item per file of the diff with the review's
+        comments on it, so all files are scored in one batched call, and
+        the signals (comment counts and severity) for each file."""
+        comments: dict[str, list[dict[str, Any]]] = {}
+        for c in review.get("comments", []):
+            comments.setdefault(c.get("file", ""), []).append(c)
+        items: list[tuple[str, dict[str, str]]] = []
+        signals: list[ConfidenceSignals | None] = []
+        for path, file_diff in split_diff(agent_input.get("diff", "")).items():
+            file_comments = comments.get(path, [])
+            notes = "\n".join(
+                f"- [{c.get('severity', 'warning')}] line {c.get('line', 0)}: {c.get('body', '')}"
+                for c in file_comments
+            )
+            output = (
+                f"## Decision: {review.get('decision', '')}\n\n"
+                f"## Diff: {path}\n```diff\n{file_diff[:4000]}\n```\n\n"
+                f"## Review comments\n{notes or '(no comments)'}"
+            )
+            items.append((output, REVIEW_RUBRIC))
+            signals.append(self._confidence_signals(text, file_comments))
+        if not items:
+            all_comments = review.get("comments", [])
+            return [(json.dumps(review), REVIEW_RUBRIC)], [
+                self._confidence_signals(text, all_comments)
+            ]
+        return items, signals
+
+    @staticmethod
+    def _confidence_signals(text: str, comments: list[dict[str, Any]]) -> ConfidenceSignals:
+        signals = extract_signals(text, ["decision", "summary"])
+        signals.review_comments = len(comments)
+        signals.blocking_comments = sum(1 for c in comments if c.get("severity") == "blocking")
+        return signals
+
+    @staticmethod
+    def _stop_on_escalation(event: JSONEvent) -> bool:
+        """Once the reviewer has decided to escalate, the rest of the review is moot."""
+        return event.key == "decision" and event.value == "escalate_to_human"
+
+    def _finish(self, review: dict[str, Any], start: float) -> AgentOutput:
+        confidence = review.get("confidence", 0.0)
+        decision = review.get("decision", "escalate_to_human")
+
+        threshold = self.config.agents.reviewer.auto_approve_threshold
+        if confidence < threshold and decision == "approve":
+            decision = "escalate_to_human"
+
+        comments = [
+            ReviewComment(
+                file=c.get("file", ""),
+                line=c.get("line", 0),
+                severity=c.get("severity", "warning"),
+                body=c.get("body", ""),
+            )
+            for c in review.get("comments", [])
+        ]
+
+        duration_ms = int((time.time() - start) * 1000)
+        self._record_audit(
+            "review_complete",
+            details={
+                "decision": decision,
+                "comment_count": len(comments),
+                "scores": review.get("scores", {}),
+            },
+            confidence=confidence,
+            duration_ms=duration_ms,
+        )
+
+        return AgentOutput(
+            success=True,
+            data={
+                "decision": decision,
+                "comments": [c.__dict__ for c in comments],
+                "scores": review.get("scores", {}),
+                "summary": review.get("summary", ""),
+            },
+            confidence=confidence,
+            escalate=decision == "escalate_to_human",
+        )
+
     def _parse_review(self, text: str) -> dict[str, Any]:
         try:
             start = text.index("{")
             end = text.rindex("}") + 1
             return json.loads(text[start:end])
         except (ValueError, json.JSONDecodeError):
+            partial = parse_partial(text)
+            if "decision" in partial:
+                # A stream stopped early: keep whatever the reviewer produced.
+                return partial
             return {
                 "decision": "escalate_to_human",
                 "confidence": 0.3,
@@ -4,12 +4,33 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import sqlite3
 import time
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
-from devlution.agents.base import AgentInput, AgentOutput, BaseAgent
+from devlution.agents.base import AgentInput, AgentOutput, BaseAgent, response_text
 from devlution.orchestrator.state import TestResult
-from devlution.tools.code_executor import run_tests
+from devlution.supervision.confidence import ConfidenceSignals, extract_signals
+from devlution.tools import git_ops
+from devlution.tools.code_executor import (
+    ExecutionResult,
+    RunReport,
+    arun_sharded_tests,
+    collect_results,
+    report_args,
+    run_sharded_tests,
+)
+from devlution.tools.test_impact import (
+    COVERAGE_ARGS,
+    ImpactMap,
+    changed_files_from_diff,
+    is_test_file,
+    read_coverage_contexts,
+)
+from devlution.tools.test_worker import pytest_args
 
 logger = logging.getLogger(__name__)
 
@@ -21,24 +42,33 @@ TESTER_RUBRIC = {
 }
 
 
+@dataclass
+class _TestPlan:
+    changed: list[str]
+    selected: list[str] | None = None  # None = full suite
+    args: str = ""  # reporter, coverage and impact-analysis arguments
+    fallback_args: str = ""  # `args` without the ones that need pytest-cov
+    env: dict[str, str] | None = None  # points COVERAGE_FILE under .devlution/coverage
+    record_contexts: bool = False  # per-test coverage contexts for the impact map
+
+    @property
+    def uses_cov(self) -> bool:
+        return self.args != self.fallback_args
+
+    def drop_cov(self) -> None:
+        self.args, self.env, self.record_contexts = self.fallback_args, None, False
+
+
 class TesterAgent(BaseAgent):
     agent_name = "tester"
+    # Set on the instance once pytest rejects `--cov`, so later runs leave
+    # coverage out instead of failing and re-running the suite each time.
+    _no_pytest_cov = False
 
     def run(self, agent_input: AgentInput) -> AgentOutput:
         start = time.time()
         system_prompt = self.load_prompt()
-
-        changed_files = agent_input.get("changed_files", [])
-        task_title = agent_input.get("task_title", "")
-
-        user_message = (
-            f"## Task\n{task_title}\n\n"
-            f"## Changed Files\n" + "\n".join(f"- {f}" for f in changed_files) + "\n\n"
-            f"Test framework: {', '.join(self.config.agents.tester.frameworks)}\n"
-            f"Coverage threshold: {self.config.agents.tester.coverage_threshold}%\n"
-            f"Generate on: {', '.join(self.config.agents.tester.generate_on)}\n\n"
-            "Generate targeted tests for the changed code and return the result."
-        )
+        user_message = self._build_message(agent_input)
 
         try:
             response = self.call_llm(
@@ -46,52 +76,288 @@ class TesterAgent(BaseAgent):
                 messages=[{"role": "user", "content": user_message}],
             )
 
-            text = response.content[0].text if response.content else "{}"
+            text = response_text(response, "{}")
             result = self._parse_response(text)
 
+            plan = self._plan_tests(agent_input, result)
             test_command = self.config.project.test_command
-            exec_result = run_tests(test_command)
-
-            test_output = TestResult(
-                passed=exec_result.success,
-                total_tests=result.get("test_results", {}).get("total_tests", 0),
-                passed_tests=result.get("test_results", {}).get("passed_tests", 0),
-                failed_tests=result.get("test_results", {}).get("failed_tests", 0),
-                coverage_percent=result.get("test_results", {}).get("coverage_percent", 0.0),
-                output=exec_result.stdout[:5000],
-                failure_log=exec_result.stderr[:5000] if not exec_result.success else "",
-            )
+            exec_result = run_sharded_tests(test_command, **self._run_options(plan))
+            if plan.uses_cov and self._missing_pytest_cov(exec_result):
+                plan.drop_cov()
+                exec_result = run_sharded_tests(test_command, **self._run_options(plan))
+            if plan.record_contexts:
+                self._update_impact_map(plan.selected)
 
+            report = self._collect_report(plan)
             confidence = result.get("confidence", 0.0)
-            threshold = self.config.agents.tester.coverage_threshold
-            if test_output.coverage_percent < threshold:
-                confidence = min(confidence, test_output.coverage_percent / 100.0)
-
-            duration_ms = int((time.time() - start) * 1000)
-            self._record_audit(
-                "test_complete",
-                details={
-                    "passed": test_output.passed,
-                    "total": test_output.total_tests,
-                    "coverage": test_output.coverage_percent,
-                },
-                confidence=confidence,
-                duration_ms=duration_ms,
-            )
+            if confidence < 0.5:
+                confidence = self.score_confidence(
+                    text, TESTER_RUBRIC, self._confidence_signals(text, report)
+                )
+            return self._finish(result, exec_result, start, plan, report, confidence)
 
-            return AgentOutput(
-                success=test_output.passed,
-                data={
-                    "test_results": test_output.__dict__,
-                    "tests_written": result.get("tests_written", []),
-                },
-                confidence=confidence,
+        except Exception as e:
+            logger.error("Tester failed: %s", e)
+            return AgentOutput(success=False, error=str(e), confidence=0.0)
+
+    async def arun(self, agent_input: AgentInput) -> AgentOutput:
+        start = time.time()
+        system_prompt = self.load_prompt()
+        user_message = self._build_message(agent_input)
+
+        try:
+            response = await self.acall_llm(
+                system=system_prompt,
+                messages=[{"role": "user", "content": user_message}],
             )
 
+            text = response_text(response, "{}")
+            result = self._parse_response(text)
+
+            plan = self._plan_tests(agent_input, result)
+            test_command = self.config.project.test_command
+            exec_result = await arun_sharded_tests(test_command, **self._run_options(plan))
+            if plan.uses_cov and self._missing_pytest_cov(exec_result):
+                plan.drop_cov()
+                exec_result = await arun_sharded_tests(test_command, **self._run_options(plan))
+            if plan.record_contexts:
+                self._update_impact_map(plan.selected)
+
+            report = self._collect_report(plan)
+            confidence = result.get("confidence", 0.0)
+            if confidence < 0.5:
+                confidence = await self.ascore_confidence(
+                    text, TESTER_RUBRIC, self._confidence_signals(text, report)
+                )
+            return self._finish(result, exec_result, start, plan, report, confidence)
+
         except Exception as e:
             logger.error("Tester failed: %s", e)
             return AgentOutput(success=False, error=str(e), confidence=0.0)
 
+    def _build_message(self, agent_input: AgentInput) -> str:
+        changed_files = agent_input.get("changed_files", [])
+        task_title = agent_input.get("task_title", "")
+
+        return (
+            f"## Task\n{task_title}\n\n"
+            f"## Changed Files\n" + "\n".join(f"- {f}" for f in changed_files) + "\n\n"
+            f"Test framework: {', '.join(self.config.agents.tester.frameworks)}\n"
+            f"Coverage threshold: {self.config.agents.tester.coverage_threshold}%\n"
+            f"Generate on: {', '.join(self.config.agents.tester.generate_on)}\n\n"
+            "Generate targeted tests for the changed code and return the result."
+        )
+
+    @property
+    def _coverage_file(self) -> Path:
+        return Path(self.workdir) / ".devlution" / "coverage" / ".coverage"
+
+    @property
+    def _impact_map_path(self) -> Path:
+        return Path(self.workdir) / self.config.agents.tester.impact_map
+
+    @property
+    def _report_dir(self) -> Path:
+        return Path(self.workdir) / ".devlution" / "reports"
+
+    def _changed_files(self, agent_input: AgentInput, result: dict[str, Any]) -> list[str]:
+        """Files changed by the task: its inputs, the tests written, and the git diff."""
+        changed = set(agent_input.get("changed_files", []))
+        changed.update(t for t in result.get("tests_written", []) if isinstance(t, str))
+        for staged in (False, True):
+            changed.update(changed_files_from_diff(git_ops.diff(staged, cwd=self.workdir)))
+        return sorted(changed)
+
+    def _plan_tests(self, agent_input: AgentInput, result: dict[str, Any]) -> _TestPlan:
+        """Which tests to run, with which reporter and coverage arguments.
+
+        Reports (JUnit XML, coverage JSON) give the real counts and coverage.
+        With impact analysis, the run also records per-test coverage contexts
+        and is narrowed to the tests the impact map links to the changed files.
+        Coverage data goes to `.devlution/coverage` (one file per shard), never
+        the worktree root where it would be committed with the task's edits.
+        """
+        tester_config = self.config.agents.tester
+        changed = self._changed_files(agent_input, result)
+        # Reporter and coverage flags are pytest's; other runners would reject them.
+        runs_pytest = (
+            "pytest" in tester_config.frameworks
+            and pytest_args(self.config.project.test_command) is not None
+        )
+
+        junit_args = coverage_args = ""
+        if tester_config.collect_reports and runs_pytest:
+            self._report_dir.mkdir(parents=True, exist_ok=True)
+            for pattern in ("junit-*.xml", "coverage-*.json"):
+                for stale in self._report_dir.glob(pattern):
+                    stale.unlink(missing_ok=True)
+            junit_args, coverage_args = report_args(tester_config.frameworks, self._report_dir)
+
+        selected: list[str] | None = None
+        record_contexts = tester_config.impact_analysis and runs_pytest
+        if record_contexts:
+            selected = ImpactMap(self._impact_map_path).select(changed, self.workdir)
+            coverage_args = " ".join(filter(None, [COVERAGE_ARGS, coverage_args]))
+            scope = f"{len(selected)} impacted test files" if selected else "full suite"
+            logger.info("[tester] running %s", scope)
+
+        plan = _TestPlan(
+            changed=changed,
+            selected=selected,
+            args=" ".join(filter(None, [junit_args, coverage_args])),
+            fallback_args=junit_args,
+            record_contexts=record_contexts,
+        )
+        if self._no_pytest_cov:
+            plan.drop_cov()
+        elif plan.uses_cov:
+            self._coverage_file.parent.mkdir(parents=True, exist_ok=True)
+            for stale in self._coverage_files():
+                stale.unlink(missing_ok=True)
+            plan.env = {**os.environ, "COVERAGE_FILE": str(self._coverage_file)}
+        return plan
+
+    def _run_options(self, plan: _TestPlan) -> dict[str, Any]:
+        """Keyword arguments for `run_sharded_tests` from the plan and tester config."""
+        tester_config = self.config.agents.tester
+        return {
+            "cwd": self.workdir,
+            "shards": tester_config.shards,
+            "warm": tester_config.warm_worker,
+            "env": plan.env,
+            "paths": plan.selected,
+            "args": plan.args,
+            "on_line": self._report_line,
+            "spill_dir": (
+                Path(self.workdir) / ".devlution" / "runs" if tester_config.keep_run_logs else None
+            ),
+        }
+
+    @staticmethod
+    def _report_line(stream: str, line: str) -> None:
+        """Surface failures as soon as the test run prints them."""
+        if line.startswith(("FAILED ", "ERROR ")):
+            logger.info("[tester] %s", line)
+
+    def _coverage_files(self) -> list[Path]:
+        """The run's coverage data: one file, or one per shard (`.coverage.<n>`)."""
+        return sorted(self._coverage_file.parent.glob(self._coverage_file.name + "*"))
+
+    def _missing_pytest_cov(self, exec_result: ExecutionResult) -> bool:
+        if "unrecognized arguments: --cov" not in exec_result.stderr:
+            return False
+        logger.warning("pytest-cov is not installed; running tests without coverage")
+        self._no_pytest_cov = True
+        return True
+
+    def _update_impact_map(self, selected: list[str] | None) -> None:
+        """Fold the run's coverage contexts into the impact map."""
+        files = self._coverage_files()
+        if not files:
+            return
+        coverage: dict[str, set[str]] = {}
+        for data_file in files:
+            try:
+                contexts = read_coverage_contexts(data_file, self.workdir)
+            except sqlite3.Error as e:
+                logger.warning("Cannot read coverage data %s: %s", data_file, e)
+                return
+            for path, tests in contexts.items():
+                coverage.setdefault(path, set()).update(tests)
+        impact_map = ImpactMap(self._impact_map_path)
+        impact_map.update(coverage, selected)
+        impact_map.save()
+
+    def _collect_report(self, plan: _TestPlan) -> RunReport | None:
+        """The run's JUnit and coverage reports, with coverage over the changed sources."""
+        report = None
+        if self.config.agents.tester.collect_reports:
+            sources = [f for f in plan.changed if not is_test_file(f)]
+            report = collect_results(self._report_dir, sources)
+        if report is None:
+            logger.warning("[tester] no test report found; using LLM-reported results")
+        return report
+
+    def _confidence_signals(self, text: str, report: RunReport | None) -> ConfidenceSignals:
+        signals = extract_signals(text, ["tests_written", "test_results"])
+        # Only measured results count as evidence; the LLM's own figures are
+        # already reflected in its self-reported confidence.
+        if report is not None:
+            signals.tests_total = report.total
+            signals.tests_failed = report.failed + report.errors
+            signals.coverage_percent = report.coverage_percent
+        return signals
+
+    def _finish(
+        self,
+        result: dict[str, Any],
+        exec_result: ExecutionResult,
+        start: float,
+        plan: _TestPlan,
+        report: RunReport | None,
+        confidence: float,
+    ) -> AgentOutput:
+        # Counts and coverage come from the run's reports; the LLM's own
+        # figures are only used when no report was written.
+        reported = result.get("test_results", {})
+        test_output = TestResult(
+            passed=exec_result.success,
+            total_tests=report.total if report else reported.get("total_tests", 0),
+            passed_tests=report.passed if report else reported.get("passed_tests", 0),
+            failed_tests=(
+                report.failed + report.errors if report else reported.get("failed_tests", 0)
+            ),
+            coverage_percent=(
+                report.coverage_percent
+                if report and report.coverage_percent is not None
+                else reported.get("coverage_percent", 0.0)
+            ),
+            output=exec_result.stdout[:5000],
+            failure_log=(
+                (exec_result.failures or exec_result.stderr)[:5000]
+                if not exec_result.success
+                else ""
+            ),
+        )
+
+        threshold = self.config.agents.tester.coverage_threshold
+        if test_output.coverage_percent < threshold:
+            confidence = min(confidence, test_output.coverage_percent / 100.0)
+
+        duration_ms = int((time.time() - start) * 1000)
+        self._record_audit(
+            "test_complete",
+            details={
+                "passed": test_output.passed,
+                "total": test_output.total_tests,
+                "coverage": test_output.coverage_percent,
+                "measured": report is not None,
+                "coverage_measured": report is not None and report.coverage_percent is not None,
+                "selected_tests": len(plan.selected) if plan.selected else "all",
+                "shards": [
+                    {"tests": shard.tests, "duration_ms": shard.duration_ms}
+                    for shard in exec_result.shards
+                ],
+                "run_logs": [
+                    path
+                    for path in [exec_result.spill_path]
+                    + [shard.spill_path for shard in exec_result.shards]
+                    if path
+                ],
+            },
+            confidence=confidence,
+            duration_ms=duration_ms,
+        )
+
+        return AgentOutput(
+            success=test_output.passed,
+            data={
+                "test_results": test_output.__dict__,
+                "tests_written": result.get("tests_written", []),
+            },
+            confidence=confidence,
+        )
+
     def _parse_response(self, text: str) -> dict[str, Any]:
         try:
             start = text.index("{")
@@ -7,30 +7,49 @@ import json
 import typer
 from rich.console import Console
 from rich.syntax import Syntax
+from rich.table import Table
 
 from devlution.supervision.audit_log import AuditLogger
+from devlution.supervision.confidence import calibration_report
 
 app = typer.Typer()
 console = Console()
 
 
+def _load_audit_logger(config_path: str) -> AuditLogger:
+    try:
+        from devlution.config import load_config
+        config = load_config(config_path)
+        return AuditLogger.from_config(config.supervision)
+    except FileNotFoundError:
+        return AuditLogger(".devlution/audit.jsonl")
+
+
 @app.callback(invoke_without_command=True)
 def audit(
+    ctx: typer.Context,
     last: int = typer.Option(20, "--last", help="Number of recent entries to show"),
     pipeline_id: str = typer.Option("", help="Filter by pipeline ID"),
+    agent: str = typer.Option("", help="Filter by agent name"),
+    action: str = typer.Option("", help="Filter by action"),
+    since: str = typer.Option("", help="Only entries at or after this ISO timestamp/date"),
+    until: str = typer.Option("", help="Only entries before this ISO timestamp/date"),
     raw: bool = typer.Option(False, "--raw", help="Output raw JSONL"),
     config_path: str = typer.Option("devlution.yaml", "--config", help="Path to devlution.yaml"),
 ) -> None:
     """View the devlution audit log."""
-    try:
-        from devlution.config import load_config
-        config = load_config(config_path)
-        audit_path = config.supervision.audit_log
-    except FileNotFoundError:
-        audit_path = ".devlution/audit.jsonl"
+    if ctx.invoked_subcommand is not None:
+        return
 
-    logger = AuditLogger(audit_path)
-    entries = logger.read(last_n=last, pipeline_id=pipeline_id or None)
+    logger = _load_audit_logger(config_path)
+    entries = logger.query(
+        pipeline_id=pipeline_id or None,
+        agent=agent or None,
+        action=action or None,
+        since=since or None,
+        until=until or None,
+        last_n=last,
+    )
 
     if not entries:
         console.print("[yellow]No audit entries found.[/yellow]")
@@ -45,3 +64,63 @@ def audit(
             syntax = Syntax(formatted, "json", theme="monokai")
             console.print(syntax)
             console.print()
+
+
+@app.command("migrate")
+def migrate(
+    config_path: str = typer.Option("devlution.yaml", "--config", help="Path to devlution.yaml"),
+) -> None:
+    """Build the SQLite audit index from an existing audit.jsonl."""
+    logger = _load_audit_logger(config_path)
+    if not logger.path.exists():
+        console.print(f"[yellow]No audit log at {logger.path}.[/yellow]")
+        raise typer.Exit()
+
+    try:
+        count = logger.migrate()
+    finally:
+        if logger.index is not None:
+            logger.index.close()
+    console.print(f"[green]Indexed {count} entries into {logger.index_path}[/green]")
+    if logger.index is None:
+        console.print("  Set `supervision.audit_index: true` to query through the index.")
+
+
+@app.command("calibration")
+def calibration(
+    since: str = typer.Option("", help="Only entries at or after this ISO timestamp/date"),
+    config_path: str = typer.Option("devlution.yaml", "--config", help="Path to devlution.yaml"),
+) -> None:
+    """Compare local and LLM confidence scores recorded in the audit log."""
+    logger = _load_audit_logger(config_path)
+    entries = logger.query(action="confidence_score", since=since or None)
+    report = calibration_report(entries)
+
+    if not report["samples"]:
+        console.print(
+            "[yellow]No runs with both local and LLM scores. "
+            "Enable `supervision.confidence.calibrate` to record them.[/yellow]"
+        )
+        raise typer.Exit()
+
+    def fmt(value: float | None) -> str:
+        return "-" if value is None else f"{value:.3f}"
+
+    table = Table(title="Local vs. LLM confidence")
+    table.add_column("Agent", style="cyan")
+    table.add_column("Samples", justify="right")
+    table.add_column("MAE", justify="right")
+    table.add_column("Correlation", justify="right")
+    table.add_column("Pass/fail agreement", justify="right")
+
+    rows = [*report["agents"].items(), ("all", report)]
+    for agent_name, stats in rows:
+        table.add_row(
+            agent_name,
+            str(stats["samples"]),
+            fmt(stats["mae"]),
+            fmt(stats["correlation"]),
+            fmt(stats["agreement"]),
+        )
+
+    console.print(table)
@@ -4,12 +4,17 @@ from __future__ import annotations
 
 import logging
 import uuid
+from contextlib import ExitStack
+from typing import Any
 
 import typer
 from rich.console import Console
 
 from devlution.config import load_config
 from devlution.orchestrator.graph import build_pipeline
+from devlution.orchestrator.persistence import open_checkpointer, thread_config
+from devlution.orchestrator.scheduler import TaskFailedError
+from devlution.supervision.audit_log import flush_all
 
 app = typer.Typer()
 console = Console()
@@ -21,6 +26,7 @@ def run(
     trigger: str = typer.Option("github_issue", help="Trigger type: github_issue|ci_failure|sentry_alert|manual"),
     issue: int = typer.Option(0, help="GitHub issue number (for github_issue trigger)"),
     config_path: str = typer.Option("devlution.yaml", "--config", help="Path to devlution.yaml"),
+    resume: str = typer.Option("", "--resume", help="Resume an interrupted pipeline by ID"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable debug logging"),
 ) -> None:
     """Run the Devlution pipeline end-to-end."""
@@ -35,10 +41,60 @@ def run(
         console.print("[red]Config file not found. Run `devlution init` first.[/red]")
         raise typer.Exit(1)
 
-    pipeline_id = uuid.uuid4().hex[:12]
-    console.print(f"[bold]Pipeline {pipeline_id}[/bold] — trigger={trigger}")
+    with ExitStack() as stack:
+        checkpointer = None
+        if config.pipeline.checkpoint_db:
+            checkpointer = stack.enter_context(open_checkpointer(config.pipeline.checkpoint_db))
+        elif resume:
+            console.print("[red]Checkpointing is disabled (pipeline.checkpoint_db is empty).[/red]")
+            raise typer.Exit(1)
 
-    initial_state = {
+        compiled = build_pipeline(config).compile(checkpointer=checkpointer)
+
+        run_input: dict[str, Any] | None
+        if resume:
+            pipeline_id = resume
+            snapshot = compiled.get_state(thread_config(pipeline_id))
+            if not snapshot.values:
+                console.print(f"[red]No checkpoint found for pipeline {pipeline_id}.[/red]")
+                raise typer.Exit(1)
+            if not snapshot.next:
+                console.print(f"[yellow]Pipeline {pipeline_id} already completed.[/yellow]")
+                raise typer.Exit()
+            console.print(
+                f"[bold]Pipeline {pipeline_id}[/bold] — resuming at {', '.join(snapshot.next)}"
+            )
+            run_input = None
+        else:
+            pipeline_id = uuid.uuid4().hex[:12]
+            console.print(f"[bold]Pipeline {pipeline_id}[/bold] — trigger={trigger}")
+            run_input = _initial_state(pipeline_id, trigger, issue)
+
+        console.print("[cyan]Running pipeline...[/cyan]\n")
+
+        try:
+            final_state = compiled.invoke(run_input, thread_config(pipeline_id))
+        except TaskFailedError as e:
+            console.print(f"[red]Pipeline {pipeline_id} stopped: {e}[/red]")
+            if checkpointer is not None:
+                console.print(f"Retry the tasks with `devlution run --resume {pipeline_id}`.")
+            raise typer.Exit(1)
+        finally:
+            flush_all()
+
+    console.print("\n[bold green]Pipeline complete![/bold green]")
+    console.print(f"  PR URL: {final_state.get('pr_url', 'N/A')}")
+    console.print(f"  Status: {final_state.get('status', 'unknown')}")
+
+    scores = final_state.get("confidence_scores", {})
+    if scores:
+        console.print("  Confidence scores:")
+        for agent_name, score in scores.items():
+            console.print(f"    {agent_name}: {score:.2f}")
+
+
+def _initial_state(pipeline_id: str, trigger: str, issue: int) -> dict[str, Any]:
+    return {
         "pipeline_id": pipeline_id,
         "trigger": {"type": trigger, "issue_number": issue if issue else None},
         "tasks": [],
@@ -51,24 +107,8 @@ def run(
         "patch": "",
         "pr_url": "",
         "gate_decisions": {},
+        "task_results": {},
         "audit_entries": [],
         "status": "pending",
         "error": "",
     }
-
-    graph = build_pipeline(config)
-    compiled = graph.compile()
-
-    console.print("[cyan]Running pipeline...[/cyan]\n")
-
-    final_state = compiled.invoke(initial_state)
-
-    console.print("\n[bold green]Pipeline complete![/bold green]")
-    console.print(f"  PR URL: {final_state.get('pr_url', 'N/A')}")
-    console.print(f"  Status: {final_state.get('status', 'unknown')}")
-
-    scores = final_state.get("confidence_scores", {})
-    if scores:
-        console.print("  Confidence scores:")
-        for agent_name, score in scores.items():
-            console.print(f"    {agent_name}: {score:.2f}")
@@ -21,11 +21,10 @@ def status(
     try:
         from devlution.config import load_config
         config = load_config(config_path)
-        audit_path = config.supervision.audit_log
+        audit = AuditLogger.from_config(config.supervision)
     except FileNotFoundError:
-        audit_path = ".devlution/audit.jsonl"
+        audit = AuditLogger(".devlution/audit.jsonl")
 
-    audit = AuditLogger(audit_path)
     entries = audit.read(last_n=50, pipeline_id=pipeline_id or None)
 
     if not entries:
@@ -17,12 +17,43 @@ class ProjectConfig(BaseModel):
     main_branch: str = "main"
 
 
+class LLMCacheConfig(BaseModel):
+    enabled: bool = False
+    directory: str = ".devlution/cache/llm"
+    max_size_mb: int = 256
+    max_age_hours: int = 168
+    skip_agents: list[str] = Field(default_factory=list)
+
+
+class ModelRateLimitConfig(BaseModel):
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+
+class RateLimitConfig(BaseModel):
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    max_backoff_seconds: float = 60.0
+    models: dict[str, ModelRateLimitConfig] = Field(default_factory=dict)
+
+
+class GovernorConfig(BaseModel):
+    max_in_flight: int = 0
+    tokens_per_minute: int = 0
+    directory: str = ""
+
+
 class LLMConfig(BaseModel):
     provider: Literal["anthropic", "openai"] = "anthropic"
     model: str = "claude-sonnet-4-20250514"
     fallback_model: str = "claude-sonnet-4-20250514"
     max_tokens: int = 8192
     temperature: float = 0.2
+    prompt_caching: bool = True
+    stream: bool = False
+    cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+    rate_limit: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    governor: GovernorConfig = Field(default_factory=GovernorConfig)
 
 
 class PlannerAgentConfig(BaseModel):
@@ -34,6 +65,7 @@ class CoderAgentConfig(BaseModel):
     enabled: bool = True
     max_iterations: int = 3
     style_guide: str = ".cursor/rules"
+    lint_signal: bool = False
 
 
 class ReviewerAgentConfig(BaseModel):
@@ -49,11 +81,18 @@ class TesterAgentConfig(BaseModel):
     generate_on: list[str] = Field(
         default_factory=lambda: ["new_file", "modified_function"]
     )
+    impact_analysis: bool = False
+    impact_map: str = ".devlution/test_impact.json"
+    shards: int = 1
+    warm_worker: bool = False
+    keep_run_logs: bool = True
+    collect_reports: bool = True
 
 
 class DebuggerAgentConfig(BaseModel):
     enabled: bool = True
     max_fix_attempts: int = 3
+    max_log_chars: int = 6000
     sources: list[str] = Field(
         default_factory=lambda: ["ci_logs", "sentry", "test_output"]
     )
@@ -80,9 +119,35 @@ class GateConfig(BaseModel):
     required_approvers: int = 0
 
 
+class AuditWriterConfig(BaseModel):
+    mode: Literal["sync", "buffered"] = "sync"
+    flush_interval_ms: int = 1000
+    flush_max_entries: int = 256
+    fsync: bool = False
+
+
+class AuditRotationConfig(BaseModel):
+    max_mb: int = 0
+    daily: bool = False
+    compression: Literal["gzip", "zstd", "none"] = "gzip"
+
+
+class ConfidenceConfig(BaseModel):
+    local: bool = False
+    ambiguous_low: float = 0.35
+    ambiguous_high: float = 0.65
+    calibrate: bool = False
+    max_batch_size: int = 8
+    batch_window_ms: int = 50
+
+
 class SupervisionConfig(BaseModel):
     gates: list[GateConfig] = Field(default_factory=list)
     audit_log: str = ".devlution/audit.jsonl"
+    audit_index: bool = False
+    audit_writer: AuditWriterConfig = Field(default_factory=AuditWriterConfig)
+    audit_rotation: AuditRotationConfig = Field(default_factory=AuditRotationConfig)
+    confidence: ConfidenceConfig = Field(default_factory=ConfidenceConfig)
 
 
 class GitHubLabelsConfig(BaseModel):
@@ -129,6 +194,18 @@ class TriggerConfig(BaseModel):
 class PipelineConfig(BaseModel):
     flow: list[str] = Field(default_factory=list)
     triggers: list[TriggerConfig] = Field(default_factory=list)
+    max_parallel_tasks: int = 1
+    worktree_pool_size: int = 0
+    worktree_root: str = ".devlution/worktrees"
+    checkpoint_db: str = ".devlution/checkpoints.db"
+
+
+class IndexConfig(BaseModel):
+    enabled: bool = True
+    directory: str = ".devlution/index"
+    max_callers: int = 5
+    workers: int = 0
+    search_top_k: int = 10
 
 
 class DevlutionConfig(BaseModel):
@@ -140,6 +217,7 @@ class DevlutionConfig(BaseModel):
     supervision: SupervisionConfig = Field(default_factory=SupervisionConfig)
     integrations: IntegrationsConfig = Field(default_factory=IntegrationsConfig)
     pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
+    index: IndexConfig = Field(default_factory=IndexConfig)
 
 
 def load_config(path: Path | str = "devlution.yaml") -> DevlutionConfig:
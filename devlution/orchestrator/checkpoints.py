@@ -23,7 +23,7 @@ class CheckpointManager:
         self.gates: dict[str, GateConfig] = {
             g.id: g for g in config.supervision.gates
         }
-        self.audit = AuditLogger(config.supervision.audit_log)
+        self.audit = AuditLogger.from_config(config.supervision)
 
     def get_gate(self, gate_id: str) -> GateConfig | None:
         return self.gates.get(gate_id)
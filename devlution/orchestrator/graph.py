@@ -2,13 +2,18 @@
 
 The graph mirrors the spec's flow: planner → coder → reviewer → tester → gate → PR,
 with conditional edges for retries, escalation, and debugging loops.
+When `pipeline.max_parallel_tasks > 1`, the coder → reviewer → tester loop runs
+as a per-task subgraph fanned out over the planner's task DAG instead.
 Stub nodes are used until real agents replace them.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
@@ -20,13 +25,29 @@ from devlution.orchestrator.router import (
     route_gate,
     route_planner,
     route_reviewer,
+    route_tasks,
     route_tester,
 )
+from devlution.orchestrator.scheduler import (
+    TaskFailedError,
+    TaskScheduler,
+    merge_task_results,
+    topological_order,
+)
+from devlution.orchestrator.state import PipelineStatus
+from devlution.tools.worktree import WorktreePool
 
 logger = logging.getLogger(__name__)
 
+Node = Callable[[dict[str, Any]], dict[str, Any]]
+AsyncNode = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+NodeFactory = Callable[[str], Any]  # name -> Node or AsyncNode
+# State is a plain dict (each node's output replaces it), which LangGraph's
+# StateLike bound does not cover, so the graph is typed over Any.
+PipelineGraph = StateGraph[Any]
+
 
-def _make_stub(name: str):
+def _make_stub(name: str) -> Node:
     """Create a stub node function that logs and passes state through."""
 
     def stub(state: dict[str, Any]) -> dict[str, Any]:
@@ -83,20 +104,146 @@ def _make_stub(name: str):
     return stub
 
 
-def build_pipeline(config: DevlutionConfig) -> StateGraph:
-    """Construct the Devlution pipeline graph (uses stubs until real agents are wired)."""
+def _make_async_stub(name: str) -> AsyncNode:
+    """Create a coroutine stub node for graphs driven with `ainvoke()`.
 
-    graph = StateGraph(dict)
+    It returns exactly what the sync stub returns for the same state.
+    """
+    sync_stub = _make_stub(name)
 
-    graph.add_node("planner", _make_stub("planner"))
-    graph.add_node("coder", _make_stub("coder"))
-    graph.add_node("reviewer", _make_stub("reviewer"))
-    graph.add_node("tester", _make_stub("tester"))
-    graph.add_node("debugger", _make_stub("debugger"))
-    graph.add_node("gate", _make_stub("gate"))
-    graph.add_node("pr", _make_stub("pr"))
+    async def stub(state: dict[str, Any]) -> dict[str, Any]:
+        return sync_stub(state)
 
-    graph.set_entry_point("planner")
+    stub.__name__ = f"astub_{name}"
+    return stub
+
+
+def build_task_pipeline(config: DevlutionConfig, async_nodes: bool = False) -> PipelineGraph:
+    """Construct the per-task coder → reviewer → tester subgraph.
+
+    Escalations, passing tests and exhausted debug retries all end the
+    subgraph; the outer pipeline's gate decides what happens next.
+    """
+    make_node: NodeFactory = _make_async_stub if async_nodes else _make_stub
+
+    graph: PipelineGraph = StateGraph(dict)
+
+    graph.add_node("coder", make_node("coder"))
+    graph.add_node("reviewer", make_node("reviewer"))
+    graph.add_node("tester", make_node("tester"))
+    graph.add_node("debugger", make_node("debugger"))
+
+    graph.set_entry_point("coder")
+    graph.add_edge("coder", "reviewer")
+
+    graph.add_conditional_edges(
+        "reviewer",
+        route_reviewer,
+        {"approve": "tester", "request_changes": "coder", "escalate": END},
+    )
+
+    graph.add_conditional_edges(
+        "tester",
+        route_tester,
+        {"pass": END, "fail": "debugger", "coverage_fail": "coder"},
+    )
+
+    graph.add_conditional_edges(
+        "debugger",
+        route_debugger,
+        {"fixed": "tester", "max_retries": END, "abort": END},
+    )
+
+    return graph
+
+
+def _make_fanout_node(config: DevlutionConfig, async_nodes: bool) -> Any:  # Node or AsyncNode
+    """Create the node that runs every planner task through the task subgraph."""
+    # The fan-out node is the checkpointed step; the per-task subgraphs must not
+    # inherit the run's (synchronous) checkpointer through ainvoke().
+    task_graph = build_task_pipeline(config, async_nodes=async_nodes).compile(checkpointer=False)
+    scheduler = TaskScheduler(config.pipeline.max_parallel_tasks)
+    pool = (
+        WorktreePool(config.pipeline.worktree_pool_size, root=config.pipeline.worktree_root)
+        if config.pipeline.worktree_pool_size > 0
+        else None
+    )
+
+    async def run_task(state: dict[str, Any], task: Any) -> dict[str, Any]:
+        if pool is None:
+            return await run_in(state, task, state.get("workdir", "."))
+
+        if isinstance(task, dict):
+            task_id, deps = task["id"], list(task.get("dependencies", []))
+        else:
+            task_id, deps = task.id, list(task.dependencies)
+        # Dependent tasks start from their dependencies' edits, not the base ref.
+        workdir = await asyncio.to_thread(pool.acquire, task_id, depends_on=deps)
+        try:
+            return await run_in(state, task, workdir)
+        finally:
+            pool.release(workdir)
+
+    async def run_in(state: dict[str, Any], task: Any, workdir: str) -> dict[str, Any]:
+        task_state = {
+            **state,
+            "tasks": [task],
+            "current_task_idx": 0,
+            "iterations": {},
+            "confidence_scores": {},
+            "review_comments": [],
+            "review_decision": "",
+            "test_results": None,
+            "patch": "",
+            "workdir": workdir,
+        }
+        return await task_graph.ainvoke(task_state)
+
+    async def fanout(state: dict[str, Any]) -> dict[str, Any]:
+        tasks = state.get("tasks", [])
+        try:
+            topological_order(tasks)
+        except ValueError as e:
+            # A cyclic plan is the planner's mistake: hand it to a human.
+            logger.error("Cannot schedule the planned tasks: %s", e)
+            return {
+                "task_results": {},
+                "review_decision": "escalate_to_human",
+                "status": PipelineStatus.WAITING_FOR_HUMAN.value,
+                "error": str(e),
+            }
+
+        results = await scheduler.run(tasks, lambda task: run_task(state, task))
+        if any(result.get("status") == "failed" for result in results.values()):
+            raise TaskFailedError(results)
+        updates = merge_task_results(results)
+        scores = dict(state.get("confidence_scores", {}))
+        scores.update(updates["confidence_scores"])
+        updates["confidence_scores"] = scores
+        return updates
+
+    if async_nodes:
+        return fanout
+
+    def fanout_sync(state: dict[str, Any]) -> dict[str, Any]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(fanout(state))
+        # The sync graph was invoked from async code: this thread's loop is
+        # busy, so the fan-out gets its own loop on a worker thread.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, fanout(state)).result()
+
+    return fanout_sync
+
+
+def _add_task_loop(graph: PipelineGraph, make_node: NodeFactory) -> None:
+    """Wire the single-task coder → reviewer → tester loop into the main graph."""
+    graph.add_node("coder", make_node("coder"))
+    graph.add_node("reviewer", make_node("reviewer"))
+    graph.add_node("tester", make_node("tester"))
+    graph.add_node("debugger", make_node("debugger"))
 
     graph.add_conditional_edges(
         "planner",
@@ -124,6 +271,36 @@ def build_pipeline(config: DevlutionConfig) -> StateGraph:
         {"fixed": "tester", "max_retries": "gate", "abort": END},
     )
 
+
+def build_pipeline(config: DevlutionConfig, async_nodes: bool = False) -> PipelineGraph:
+    """Construct the Devlution pipeline graph (uses stubs until real agents are wired).
+
+    With `async_nodes=True` every node is a coroutine, so the compiled graph
+    can be driven with `ainvoke()` and many pipelines can share one event loop.
+    """
+    make_node: NodeFactory = _make_async_stub if async_nodes else _make_stub
+
+    graph: PipelineGraph = StateGraph(dict)
+
+    graph.add_node("planner", make_node("planner"))
+    graph.add_node("gate", make_node("gate"))
+    graph.add_node("pr", make_node("pr"))
+
+    graph.set_entry_point("planner")
+
+    if config.pipeline.max_parallel_tasks > 1:
+        graph.add_node("tasks", _make_fanout_node(config, async_nodes))
+        graph.add_conditional_edges(
+            "planner",
+            route_planner,
+            {"proceed": "tasks", "escalate": "gate", "abort": END},
+        )
+        graph.add_conditional_edges(
+            "tasks", route_tasks, {"done": "gate", "escalate": "gate", "abort": END}
+        )
+    else:
+        _add_task_loop(graph, make_node)
+
     graph.add_conditional_edges(
         "gate",
         route_gate,
@@ -0,0 +1,32 @@
+"""Durable LangGraph checkpointing so interrupted pipelines can resume.
+
+Checkpoints are stored in a local SQLite database (default
+`.devlution/checkpoints.db`), keyed by pipeline ID as the LangGraph thread ID.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+def thread_config(pipeline_id: str) -> RunnableConfig:
+    """LangGraph run config addressing the checkpoints of one pipeline."""
+    return {"configurable": {"thread_id": pipeline_id}}
+
+
+@contextmanager
+def open_checkpointer(path: str | Path) -> Iterator[SqliteSaver]:
+    """Open a SQLite-backed checkpointer for the duration of a run."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    try:
+        yield SqliteSaver(conn)
+    finally:
+        conn.close()
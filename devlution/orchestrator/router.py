@@ -23,6 +23,16 @@ def route_planner(state: dict[str, Any]) -> str:
     return "proceed"
 
 
+def route_tasks(state: dict[str, Any]) -> str:
+    """After the parallel task fan-out: gate, escalate an unschedulable plan, or abort."""
+    status = state.get("status", "")
+    if status == PipelineStatus.FAILED or status == "failed":
+        return "abort"
+    if state.get("review_decision") == "escalate_to_human":
+        return "escalate"
+    return "done"
+
+
 def route_reviewer(state: dict[str, Any]) -> str:
     """After reviewer: approve → tester, request_changes → coder, or escalate."""
     decision = state.get("review_decision", "")
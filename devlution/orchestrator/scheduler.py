@@ -0,0 +1,199 @@
+"""DAG scheduler that fans independent planner tasks out concurrently.
+
+Tasks are ordered by their `dependencies` and each one is started as soon as
+everything it depends on has finished, bounded by a concurrency limit. Per-task
+results are merged back into a single set of pipeline state updates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from devlution.orchestrator.state import Task
+
+logger = logging.getLogger(__name__)
+
+TaskLike = Task | dict[str, Any]
+
+# Worst decision wins when merging reviewer outcomes across tasks.
+_DECISION_RANK = {"": 0, "approve": 1, "request_changes": 2, "escalate_to_human": 3}
+
+
+class TaskFailedError(RuntimeError):
+    """Some tasks of a fan-out raised; `results` holds every task's outcome.
+
+    Raised out of the fan-out node so a checkpointed run stops before it and
+    `--resume` runs the tasks again, instead of finishing with them failed.
+    """
+
+    def __init__(self, results: dict[str, dict[str, Any]]):
+        self.results = results
+        failed = [
+            f"{tid}: {result.get('error', '')}"
+            for tid, result in results.items()
+            if result.get("status") == "failed"
+        ]
+        super().__init__("Tasks failed: " + "; ".join(failed))
+
+
+def _task_id(task: TaskLike) -> str:
+    return task["id"] if isinstance(task, dict) else task.id
+
+
+def _task_deps(task: TaskLike) -> list[str]:
+    if isinstance(task, dict):
+        return list(task.get("dependencies", []))
+    return list(task.dependencies)
+
+
+def topological_order(tasks: list[TaskLike]) -> list[TaskLike]:
+    """Return tasks ordered so every task follows its dependencies.
+
+    Input order is preserved among tasks that are ready at the same time.
+    Dependencies on unknown task IDs are ignored; cycles raise ValueError.
+    """
+    by_id = {_task_id(t): t for t in tasks}
+    remaining: dict[str, set[str]] = {}
+    for task in tasks:
+        tid = _task_id(task)
+        deps = set()
+        for dep in _task_deps(task):
+            if dep in by_id:
+                deps.add(dep)
+            else:
+                logger.warning("Task %s depends on unknown task %s; ignoring", tid, dep)
+        remaining[tid] = deps
+
+    ordered: list[TaskLike] = []
+    while remaining:
+        ready = [tid for tid, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Task dependency cycle among: {', '.join(sorted(remaining))}")
+        for tid in ready:
+            ordered.append(by_id[tid])
+            del remaining[tid]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return ordered
+
+
+class TaskScheduler:
+    """Runs a task DAG with at most `max_concurrency` tasks in flight."""
+
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def run(
+        self,
+        tasks: list[TaskLike],
+        run_task: Callable[[TaskLike], Awaitable[dict[str, Any]]],
+    ) -> dict[str, dict[str, Any]]:
+        """Execute `run_task` for every task and return results keyed by task ID.
+
+        A task whose `run_task` raises is recorded with `status="failed"`;
+        tasks depending on it are not started and are recorded as `skipped`.
+        """
+        ordered = topological_order(tasks)
+        known = {_task_id(t) for t in ordered}
+        finished = {tid: asyncio.Event() for tid in known}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results: dict[str, dict[str, Any]] = {}
+        failed: set[str] = set()
+
+        async def worker(task: TaskLike) -> None:
+            tid = _task_id(task)
+            deps = [d for d in _task_deps(task) if d in known]
+            try:
+                for dep in deps:
+                    await finished[dep].wait()
+
+                blocked = [d for d in deps if d in failed]
+                if blocked:
+                    failed.add(tid)
+                    results[tid] = {"status": "skipped", "error": f"blocked by {blocked}"}
+                    return
+
+                async with semaphore:
+                    logger.info("Starting task %s", tid)
+                    results[tid] = await run_task(task)
+            except Exception as e:
+                logger.error("Task %s failed: %s", tid, e)
+                failed.add(tid)
+                results[tid] = {"status": "failed", "error": str(e)}
+            finally:
+                finished[tid].set()
+
+        await asyncio.gather(*(worker(t) for t in ordered))
+        return {_task_id(t): results[_task_id(t)] for t in ordered}
+
+
+def merge_task_results(results: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Fold per-task final states into pipeline-level state updates.
+
+    Confidence is the minimum per agent, the review decision and test outcome
+    are the worst across tasks, and patches and comments are concatenated.
+    """
+    scores: dict[str, float] = {}
+    iterations: dict[str, int] = {}
+    comments: list[Any] = []
+    patches: list[str] = []
+    decision = ""
+    test_results: dict[str, Any] | None = None
+    status = ""
+
+    for result in results.values():
+        for agent, score in result.get("confidence_scores", {}).items():
+            scores[agent] = min(score, scores.get(agent, score))
+        for agent, count in result.get("iterations", {}).items():
+            iterations[agent] = max(count, iterations.get(agent, 0))
+        comments.extend(result.get("review_comments", []))
+        if result.get("patch"):
+            patches.append(result["patch"])
+
+        task_decision = result.get("review_decision", "")
+        if _DECISION_RANK.get(task_decision, 0) > _DECISION_RANK.get(decision, 0):
+            decision = task_decision
+
+        task_tests = result.get("test_results")
+        if isinstance(task_tests, dict):
+            test_results = _merge_test_results(test_results, task_tests)
+
+        if result.get("status") in ("failed", "skipped"):
+            status = "failed"
+
+    updates: dict[str, Any] = {
+        "task_results": results,
+        "confidence_scores": scores,
+        "iterations": iterations,
+        "review_comments": comments,
+        "review_decision": decision,
+        "test_results": test_results,
+        "patch": "\n".join(patches),
+    }
+    if status:
+        updates["status"] = status
+    return updates
+
+
+def _merge_test_results(
+    merged: dict[str, Any] | None, result: dict[str, Any]
+) -> dict[str, Any]:
+    if merged is None:
+        return dict(result)
+    return {
+        "passed": merged.get("passed", True) and result.get("passed", True),
+        "total_tests": merged.get("total_tests", 0) + result.get("total_tests", 0),
+        "passed_tests": merged.get("passed_tests", 0) + result.get("passed_tests", 0),
+        "failed_tests": merged.get("failed_tests", 0) + result.get("failed_tests", 0),
+        "coverage_percent": min(
+            merged.get("coverage_percent", 0.0), result.get("coverage_percent", 0.0)
+        ),
+        "output": "\n".join(filter(None, [merged.get("output"), result.get("output")])),
+        "failure_log": "\n".join(
+            filter(None, [merged.get("failure_log"), result.get("failure_log")])
+        ),
+    }
@@ -93,6 +93,8 @@ class PipelineState:
     patch: str = ""
     pr_url: str = ""
     gate_decisions: dict[str, GateDecision] = field(default_factory=dict)
+    task_results: dict[str, dict[str, Any]] = field(default_factory=dict)
+    workdir: str = "."
     audit_entries: list[AuditEntry] = field(default_factory=list)
     status: PipelineStatus = PipelineStatus.PENDING
     error: str = ""
@@ -0,0 +1,217 @@
+"""SQLite sidecar index over the JSONL audit log.
+
+The JSONL file stays the append-only source of truth. The index remembers the
+byte offset it has consumed and catches up incrementally, so lookups by
+pipeline, agent, action or time range hit B-tree indexes instead of
+re-parsing the whole log.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    pipeline_id TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    action TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_pipeline ON entries (pipeline_id, id);
+CREATE INDEX IF NOT EXISTS idx_entries_agent ON entries (agent, id);
+CREATE INDEX IF NOT EXISTS idx_entries_action ON entries (action, id);
+CREATE INDEX IF NOT EXISTS idx_entries_ts ON entries (ts);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+_INSERT = "INSERT INTO entries (ts, pipeline_id, agent, action, data) VALUES (?, ?, ?, ?, ?)"
+
+
+class AuditIndex:
+    """Queryable index of audit entries kept in sync with a JSONL log."""
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.executescript(_SCHEMA)
+
+    def sync(self, log_path: str | Path) -> int:
+        """Index any lines appended to `log_path` since the last sync.
+
+        Returns the number of newly indexed entries. A new live file (after
+        rotation) is read from the start while keeping existing entries; if the
+        same file shrank (truncated) the index is rebuilt from scratch.
+        """
+        log_path = Path(log_path)
+        try:
+            stat = log_path.stat()
+            size, inode = stat.st_size, str(stat.st_ino)
+        except FileNotFoundError:
+            size, inode = 0, ""
+
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                offset = int(self._get_meta(cur, "offset") or 0)
+                if inode and inode != self._get_meta(cur, "inode"):
+                    offset = 0
+                elif size < offset:
+                    logger.info("Audit log shrank; rebuilding index %s", self.db_path)
+                    cur.execute("DELETE FROM entries")
+                    offset = 0
+
+                count = 0
+                if size > offset:
+                    count, offset = self._ingest(cur, log_path, offset)
+
+                self._set_meta(cur, "offset", str(offset))
+                self._set_meta(cur, "inode", inode)
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        return count
+
+    def mark_rotated(self) -> None:
+        """Record that the live log was moved aside; the next sync starts a new file.
+
+        Needed because a fresh live file can reuse the rotated file's inode.
+        """
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            self._set_meta(cur, "offset", "0")
+            self._set_meta(cur, "inode", "")
+            cur.execute("COMMIT")
+
+    def rebuild(self, log_path: str | Path, history: Iterable[str] = ()) -> int:
+        """Drop the index and re-ingest from the beginning.
+
+        `history` yields lines from rotated segments (oldest first), which are
+        indexed before the live file at `log_path`.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.execute("DELETE FROM meta")
+                rows = [row for row in map(self._row, history) if row is not None]
+                self._conn.executemany(_INSERT, rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows) + self.sync(log_path)
+
+    def query(
+        self,
+        pipeline_id: str | None = None,
+        agent: str | None = None,
+        action: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        last_n: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return matching entries in log order.
+
+        `since` and `until` are ISO-8601 timestamps (or date prefixes) compared
+        against each entry's `ts`; `until` is exclusive.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in (("pipeline_id", pipeline_id), ("agent", agent), ("action", action)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until:
+            clauses.append("ts < ?")
+            params.append(until)
+
+        sql = "SELECT data FROM entries"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if last_n is not None:
+            sql += " ORDER BY id DESC LIMIT ?"
+            params.append(last_n)
+        else:
+            sql += " ORDER BY id"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        if last_n is not None:
+            rows.reverse()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _ingest(self, cur: sqlite3.Cursor, log_path: Path, offset: int) -> tuple[int, int]:
+        """Insert complete lines after `offset`; return (count, new offset)."""
+        rows: list[tuple[str, str, str, str, str]] = []
+        with open(log_path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # a writer is mid-line; pick it up next sync
+                offset += len(raw)
+                row = self._row(raw.decode())
+                if row is not None:
+                    rows.append(row)
+
+        cur.executemany(_INSERT, rows)
+        return len(rows), offset
+
+    @staticmethod
+    def _row(line: str) -> tuple[str, str, str, str, str] | None:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning("Skipping malformed audit line: %.80s", line)
+            return None
+        return (
+            entry.get("ts", ""),
+            entry.get("pipeline_id", ""),
+            entry.get("agent", ""),
+            entry.get("action", ""),
+            line,
+        )
+
+    @staticmethod
+    def _get_meta(cur: sqlite3.Cursor, key: str) -> str | None:
+        row = cur.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(cur: sqlite3.Cursor, key: str, value: str) -> None:
+        cur.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
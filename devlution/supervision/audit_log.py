@@ -2,18 +2,278 @@
 
 from __future__ import annotations
 
+import atexit
 import json
+import logging
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from devlution.supervision.audit_index import AuditIndex
+from devlution.supervision.audit_rotation import (
+    SegmentRotator,
+    iter_segment_lines,
+    list_segments,
+)
+
+if TYPE_CHECKING:
+    from devlution.config import SupervisionConfig
+
+logger = logging.getLogger(__name__)
+
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _append(path: Path, data: str, fsync: bool) -> None:
+    with open(path, "a") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _rotate_if_due(path: Path, rotator: SegmentRotator | None, index: AuditIndex | None) -> None:
+    """Rotate the live log if `rotator` says so, keeping `index` in step."""
+    if rotator is None or not rotator.due(path):
+        return
+    if index is not None:
+        index.sync(path)
+    if rotator.rotate(path) is not None and index is not None:
+        index.mark_rotated()
+
+
+def _rotation_settings(rotator: SegmentRotator | None) -> tuple[Any, ...] | None:
+    return None if rotator is None else (rotator.max_bytes, rotator.daily, rotator.compression)
+
+
+class _BufferedWriter:
+    """Batches audit lines in memory and appends them from a background thread.
+
+    Lines are written when `max_entries` accumulate or every `flush_interval`
+    seconds, whichever comes first, in the order they were recorded. Lines
+    whose write fails stay buffered and are retried on the next flush.
+
+    The writer owns the log's rotator and index, since it is shared by every
+    logger of the file and outlives any one of them.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float,
+        max_entries: int,
+        fsync: bool,
+        rotator: SegmentRotator | None = None,
+        index: AuditIndex | None = None,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_entries = max(1, max_entries)
+        self.fsync = fsync
+        self.rotator = rotator
+        self.index = index
+        self._buffer: list[str] = []
+        self._buffer_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"audit-flush:{path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def same_settings(
+        self, flush_interval: float, max_entries: int, fsync: bool, rotator: SegmentRotator | None
+    ) -> bool:
+        return (self.flush_interval, self.max_entries, self.fsync) == (
+            flush_interval,
+            max(1, max_entries),
+            fsync,
+        ) and _rotation_settings(self.rotator) == _rotation_settings(rotator)
+
+    def write(self, line: str) -> None:
+        with self._buffer_lock:
+            self._buffer.append(line)
+            full = len(self._buffer) >= self.max_entries
+        if full:
+            self._wake.set()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._buffer_lock:
+                lines, self._buffer = self._buffer, []
+            if not lines:
+                return
+            try:
+                _rotate_if_due(self.path, self.rotator, self.index)
+                _append(self.path, "".join(lines), self.fsync)
+            except BaseException:
+                with self._buffer_lock:
+                    self._buffer[:0] = lines
+                raise
+
+    def discard(self) -> None:
+        with self._buffer_lock:
+            self._buffer.clear()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit flush to %s failed; retrying later", self.path)
+
+
+_writers: dict[Path, _BufferedWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(
+    path: Path,
+    flush_interval: float,
+    max_entries: int,
+    fsync: bool,
+    rotator: SegmentRotator | None = None,
+    index: AuditIndex | None = None,
+) -> _BufferedWriter:
+    """Return the process-wide writer for `path`, so every logger shares one buffer.
+
+    The writer keeps the settings of the logger that created it, so a later
+    logger asking for different flush, fsync or rotation settings is rejected
+    with ValueError rather than silently getting the first one's. A later
+    indexed logger hands its index over if the writer has none yet.
+    """
+    key = path.resolve()
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _BufferedWriter(path, flush_interval, max_entries, fsync, rotator, index)
+            _writers[key] = writer
+        elif not writer.same_settings(flush_interval, max_entries, fsync, rotator):
+            raise ValueError(
+                f"Audit log {path} is already buffered with different writer settings"
+            )
+        elif writer.index is None:
+            writer.index = index
+        return writer
+
+
+def flush_all() -> None:
+    """Flush every buffered audit writer. Called at pipeline end and interpreter exit."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        try:
+            writer.flush()
+        except Exception as e:
+            logger.error("Audit flush to %s failed: %s", writer.path, e)
+
+
+atexit.register(flush_all)
+
+
+def _iter_lines_reversed(path: Path, block_size: int | None = None) -> Iterator[str]:
+    """Yield the lines of `path` last-to-first, reading fixed-size blocks from the end.
+
+    Only the blocks needed to produce the consumed lines are read, so taking
+    the last few entries costs the same regardless of file size.
+    """
+    block_size = block_size or _TAIL_BLOCK_SIZE
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step) + remainder
+            lines = chunk.split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode()
+        if remainder.strip():
+            yield remainder.decode()
 
 
 class AuditLogger:
-    """Writes and reads structured audit entries to a JSONL file."""
+    """Writes and reads structured audit entries to a JSONL file.
 
-    def __init__(self, path: str | Path = ".devlution/audit.jsonl"):
+    With `indexed=True`, a SQLite sidecar (`<log>.db`) is kept in sync so
+    `read()` and `query()` avoid scanning the whole file.
+
+    By default every `record()` is appended to the file before returning.
+    With `buffered=True`, entries are batched by a shared background writer
+    and reach disk within `flush_interval_ms`; `flush()` (or the module-level
+    `flush_all()`) forces them out. `fsync=True` additionally syncs each write
+    to stable storage.
+
+    A `rotator` moves the live file to compressed, timestamped segments;
+    reads stream across those segments transparently.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ".devlution/audit.jsonl",
+        indexed: bool = False,
+        buffered: bool = False,
+        flush_interval_ms: int = 1000,
+        flush_max_entries: int = 256,
+        fsync: bool = False,
+        rotator: SegmentRotator | None = None,
+    ):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index = AuditIndex(self.index_path) if indexed else None
+        self.fsync = fsync
+        self.rotator = rotator
+        self._writer = (
+            _get_writer(
+                self.path, flush_interval_ms / 1000, flush_max_entries, fsync, rotator, self.index
+            )
+            if buffered
+            else None
+        )
+
+    @classmethod
+    def from_config(cls, supervision: SupervisionConfig) -> AuditLogger:
+        writer = supervision.audit_writer
+        rotation = supervision.audit_rotation
+        rotator = (
+            SegmentRotator(
+                max_bytes=rotation.max_mb * 1024 * 1024,
+                daily=rotation.daily,
+                compression=rotation.compression,
+            )
+            if rotation.max_mb or rotation.daily
+            else None
+        )
+        return cls(
+            supervision.audit_log,
+            indexed=supervision.audit_index,
+            buffered=writer.mode == "buffered",
+            flush_interval_ms=writer.flush_interval_ms,
+            flush_max_entries=writer.flush_max_entries,
+            fsync=writer.fsync,
+            rotator=rotator,
+        )
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_suffix(".db")
 
     def record(
         self,
@@ -40,37 +300,143 @@ class AuditLogger:
         if duration_ms is not None:
             entry["duration_ms"] = duration_ms
 
-        with open(self.path, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        line = json.dumps(entry) + "\n"
+        if self._writer is not None:
+            self._writer.write(line)
+        else:
+            _rotate_if_due(self.path, self.rotator, self.index)
+            _append(self.path, line, self.fsync)
 
         return entry
 
+    def segments(self) -> list[Path]:
+        """Closed (rotated) segments of this log, oldest first."""
+        return list_segments(self.path)
+
+    def flush(self) -> None:
+        """Write out any buffered entries (no-op in unbuffered mode)."""
+        if self._writer is not None:
+            self._writer.flush()
+
     def read(
         self,
         last_n: int | None = None,
         pipeline_id: str | None = None,
     ) -> list[dict[str, Any]]:
         """Read audit entries, optionally filtering by pipeline or limiting count."""
-        if not self.path.exists():
-            return []
+        return self.query(pipeline_id=pipeline_id, last_n=last_n)
+
+    def query(
+        self,
+        pipeline_id: str | None = None,
+        agent: str | None = None,
+        action: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        last_n: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return entries matching every given filter, oldest first.
+
+        `since`/`until` are ISO-8601 timestamps or date prefixes; `until` is
+        exclusive. Uses the SQLite index when enabled, otherwise scans the file.
+        """
+        self.flush()
+
+        if self.index is not None:
+            self.index.sync(self.path)
+            return self.index.query(
+                pipeline_id=pipeline_id,
+                agent=agent,
+                action=action,
+                since=since,
+                until=until,
+                last_n=last_n,
+            )
+
+        def matches(entry: dict[str, Any]) -> bool:
+            return not (
+                (pipeline_id and entry.get("pipeline_id") != pipeline_id)
+                or (agent and entry.get("agent") != agent)
+                or (action and entry.get("action") != action)
+                or (since and entry.get("ts", "") < since)
+                or (until and entry.get("ts", "") >= until)
+            )
+
+        if last_n is not None:
+            return self._tail(last_n, matches)
 
         entries: list[dict[str, Any]] = []
-        with open(self.path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                if pipeline_id and entry.get("pipeline_id") != pipeline_id:
-                    continue
+        for line in self._iter_lines():
+            entry = json.loads(line)
+            if matches(entry):
                 entries.append(entry)
 
-        if last_n is not None:
-            entries = entries[-last_n:]
+        return entries
+
+    def _iter_lines(self) -> Iterator[str]:
+        """Yield every entry line, oldest segment first, live file last."""
+        for segment in self.segments():
+            yield from iter_segment_lines(segment)
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield line
+
+    def _tail(
+        self, last_n: int, matches: Callable[[dict[str, Any]], bool]
+    ) -> list[dict[str, Any]]:
+        """Collect the last `last_n` matching entries, newest data first.
+
+        The live file is read backwards block by block. Compressed segments
+        cannot be read backwards, so each is streamed forward keeping only the
+        last matches still needed; memory stays bounded by `last_n`.
+        """
+        entries: list[dict[str, Any]] = []
+        if last_n <= 0:
+            return entries
+
+        if self.path.exists():
+            for line in _iter_lines_reversed(self.path):
+                entry = json.loads(line)
+                if matches(entry):
+                    entries.append(entry)
+                    if len(entries) >= last_n:
+                        break
+        entries.reverse()
+
+        for segment in reversed(self.segments()):
+            remaining = last_n - len(entries)
+            if remaining <= 0:
+                break
+            recent: deque[dict[str, Any]] = deque(maxlen=remaining)
+            for line in iter_segment_lines(segment):
+                entry = json.loads(line)
+                if matches(entry):
+                    recent.append(entry)
+            entries[:0] = recent
 
         return entries
 
+    def migrate(self) -> int:
+        """Build (or rebuild) the SQLite index from the existing log and its segments."""
+        self.flush()
+        index = self.index or AuditIndex(self.index_path)
+        history = (line for seg in self.segments() for line in iter_segment_lines(seg))
+        try:
+            return index.rebuild(self.path, history=history)
+        finally:
+            if index is not self.index:
+                index.close()
+
     def clear(self) -> None:
-        """Remove the audit file (for testing)."""
+        """Remove the audit file and its segments (for testing)."""
+        if self._writer is not None:
+            self._writer.discard()
+        for segment in self.segments():
+            segment.unlink()
         if self.path.exists():
             self.path.unlink()
+        if self.index is not None:
+            self.index.rebuild(self.path)
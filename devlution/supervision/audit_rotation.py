@@ -0,0 +1,155 @@
+"""Segment rotation and compression for the JSONL audit log.
+
+The live file (`audit.jsonl`) is renamed to a timestamped segment such as
+`audit.20261015T101500123456.jsonl.gz` once it passes a size limit or the UTC
+day changes, then compressed. Segment names sort chronologically.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import IO, Any
+
+logger = logging.getLogger(__name__)
+
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def list_segments(path: Path) -> list[Path]:
+    """Return closed segments for the live log at `path`, oldest first.
+
+    A rotated file whose compressed copy is already in place (its deletion is
+    pending) is skipped, so no entry is listed twice.
+    """
+    names = {p.name for p in path.parent.glob(f"{path.stem}.*{path.suffix}*")}
+    return sorted(
+        path.parent / name
+        for name in names
+        if name != path.name
+        and not any(name + suffix in names for suffix in _SUFFIXES.values() if suffix)
+    )
+
+
+def _open_segment(segment: Path) -> IO[str]:
+    if segment.suffix == ".gz":
+        return gzip.open(segment, "rt")
+    if segment.suffix == ".zst":
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError(f"Reading {segment.name} requires the 'zstandard' package")
+        stream: IO[str] = zstandard.open(segment, "rt")
+        return stream
+    return open(segment)
+
+
+def iter_segment_lines(segment: Path) -> Iterator[str]:
+    """Yield the non-empty lines of a (possibly compressed) segment."""
+    with _open_segment(segment) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class SegmentRotator:
+    """Decides when the live log is due for rotation and performs it.
+
+    `max_bytes=0` disables size-based rotation; `daily=True` rotates when the
+    first entry in the live file is from an earlier UTC day.
+    """
+
+    def __init__(self, max_bytes: int = 0, daily: bool = False, compression: str = "gzip"):
+        if compression == "zstd" and _zstandard() is None:
+            logger.warning("zstandard not installed; compressing audit segments with gzip")
+            compression = "gzip"
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._day_cache: tuple[int, str] | None = None
+
+    def due(self, path: Path) -> bool:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return False
+        if stat.st_size == 0:
+            return False
+        if self.max_bytes and stat.st_size >= self.max_bytes:
+            return True
+        if self.daily:
+            today = datetime.now(UTC).date().isoformat()
+            return self._first_day(path, stat.st_ino) < today
+        return False
+
+    def rotate(self, path: Path) -> Path | None:
+        """Move the live log to a compressed segment; return the segment path.
+
+        Returns None if another writer rotated the file first.
+        """
+        with self._lock:
+            if not self.due(path):
+                return None
+
+            stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+            closed = path.with_name(f"{path.stem}.{stamp}{path.suffix}")
+            try:
+                os.rename(path, closed)
+            except FileNotFoundError:
+                return None
+            self._day_cache = None
+
+        if self.compression == "none":
+            return closed
+
+        segment = closed.with_name(closed.name + _SUFFIXES[self.compression])
+        # Compress under a dot-name outside the segment glob so readers never
+        # see a partial segment; list_segments() hides `closed` once it lands.
+        partial = closed.with_name(f".{segment.name}.tmp")
+        try:
+            self._compress(closed, partial)
+            os.replace(partial, segment)
+        except OSError as e:
+            logger.error("Failed to compress audit segment %s: %s", closed.name, e)
+            partial.unlink(missing_ok=True)
+            return closed
+        closed.unlink()
+        logger.info("Rotated audit log to %s", segment.name)
+        return segment
+
+    def _compress(self, source: Path, dest: Path) -> None:
+        if self.compression == "zstd":
+            zstandard = _zstandard()
+            with open(source, "rb") as src, open(dest, "wb") as raw:
+                zstandard.ZstdCompressor().copy_stream(src, raw)
+            return
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+
+    def _first_day(self, path: Path, inode: int) -> str:
+        if self._day_cache is not None and self._day_cache[0] == inode:
+            return self._day_cache[1]
+        try:
+            with open(path) as f:
+                first = f.readline()
+            day = str(json.loads(first).get("ts", ""))[:10]
+        except (OSError, json.JSONDecodeError):
+            day = ""
+        self._day_cache = (inode, day)
+        return day
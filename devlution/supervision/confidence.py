@@ -1,10 +1,17 @@
-"""Confidence scoring utilities used by agents to self-evaluate output quality."""
+"""Confidence scoring utilities used by agents to self-evaluate output quality.
+
+Scores come from two sources: a local, rubric-style score computed from
+structured signals (parse success, lint findings, test results, diff size,
+review comments),
+and LLM self-scoring against a rubric, used when the local score is ambiguous.
+"""
 
 from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, overload
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +42,57 @@ def build_confidence_prompt(output: str, rubric: dict[str, str]) -> list[dict[st
     ]
 
 
-def parse_confidence_response(text: str) -> float:
-    """Extract the overall confidence score from an LLM response."""
+CONFIDENCE_BATCH_PROMPT = """You are evaluating the quality of several AI agent outputs.
+
+Each numbered item has its own rubric. Score every item on a scale from 0.0 to 1.0
+against each criterion in its rubric.
+Return ONLY a JSON object with this exact schema, one result per item, in order:
+{
+  "results": [
+    {"id": <item number>, "scores": {"<criterion>": <float 0.0-1.0>, ...},
+     "overall": <float 0.0-1.0>, "reasoning": "<one sentence>"},
+    ...
+  ]
+}
+"""
+
+
+def build_batch_confidence_prompt(
+    items: list[tuple[str, dict[str, str]]],
+) -> list[dict[str, Any]]:
+    """Build the messages list for scoring several (output, rubric) pairs in one call."""
+    sections = []
+    for i, (output, rubric) in enumerate(items, start=1):
+        rubric_text = "\n".join(f"- {k}: {v}" for k, v in rubric.items())
+        sections.append(
+            f"## Item {i}\n### Rubric\n{rubric_text}\n\n"
+            f"### Agent Output\n```\n{output}\n```"
+        )
+    return [
+        {
+            "role": "user",
+            "content": "\n\n".join(sections)
+            + f"\n\nScore all {len(items)} items. Return JSON only.",
+        }
+    ]
+
+
+@overload
+def parse_confidence_response(text: str) -> float: ...
+
+
+@overload
+def parse_confidence_response(text: str, count: int) -> list[float]: ...
+
+
+def parse_confidence_response(text: str, count: int | None = None) -> float | list[float]:
+    """Extract the overall confidence score from an LLM response.
+
+    With `count`, parse a batched response (`{"results": [...]}`) and return
+    one score per item; items that are missing or malformed default to 0.5.
+    """
+    if count is not None:
+        return _parse_batch_response(text, count)
     try:
         start = text.index("{")
         end = text.rindex("}") + 1
@@ -46,3 +102,180 @@ def parse_confidence_response(text: str) -> float:
     except (ValueError, json.JSONDecodeError, TypeError):
         logger.warning("Failed to parse confidence response, defaulting to 0.5")
         return 0.5
+
+
+def _parse_batch_response(text: str, count: int) -> list[float]:
+    scores = [0.5] * count
+    try:
+        start = text.index("{")
+        end = text.rindex("}") + 1
+        results = json.loads(text[start:end]).get("results", [])
+    except (ValueError, json.JSONDecodeError, AttributeError):
+        logger.warning("Failed to parse batched confidence response, defaulting to 0.5")
+        return scores
+
+    for position, result in enumerate(results):
+        if not isinstance(result, dict):
+            continue
+        item_id = result.get("id")
+        index = item_id - 1 if isinstance(item_id, int) else position
+        if not 0 <= index < count:
+            continue
+        try:
+            scores[index] = max(0.0, min(1.0, float(result.get("overall", 0.0))))
+        except (TypeError, ValueError):
+            continue
+    return scores
+
+
+@dataclass
+class ConfidenceSignals:
+    """Structured evidence about an agent output, used for local scoring.
+
+    Every field is optional; the local scorer only weighs signals that are set.
+    """
+
+    parsed: bool | None = None
+    completeness: float | None = None
+    self_reported: float | None = None
+    lint_findings: int | None = None
+    tests_total: int | None = None
+    tests_failed: int | None = None
+    coverage_percent: float | None = None
+    diff_lines: int | None = None
+    review_comments: int | None = None
+    blocking_comments: int | None = None
+
+
+def extract_signals(text: str, expected_fields: list[str]) -> ConfidenceSignals:
+    """Derive parse success, field completeness and self-reported confidence."""
+    try:
+        start = text.index("{")
+        end = text.rindex("}") + 1
+        data = json.loads(text[start:end])
+    except (ValueError, json.JSONDecodeError):
+        return ConfidenceSignals(parsed=False, completeness=0.0)
+    if not isinstance(data, dict):
+        return ConfidenceSignals(parsed=False, completeness=0.0)
+
+    present = sum(1 for f in expected_fields if data.get(f) not in (None, "", [], {}))
+    reported = data.get("confidence")
+    return ConfidenceSignals(
+        parsed=True,
+        completeness=present / len(expected_fields) if expected_fields else 1.0,
+        self_reported=float(reported) if isinstance(reported, (int, float)) else None,
+    )
+
+
+def _components(signals: ConfidenceSignals) -> list[tuple[float, float]]:
+    """(weight, score in [0, 1]) for each signal that is present."""
+    parts: list[tuple[float, float]] = []
+    if signals.parsed is not None:
+        parts.append((2.0, 1.0 if signals.parsed else 0.0))
+    if signals.completeness is not None:
+        parts.append((1.0, signals.completeness))
+    if signals.self_reported is not None:
+        parts.append((1.0, max(0.0, min(1.0, signals.self_reported))))
+    if signals.lint_findings is not None:
+        parts.append((1.0, 1.0 / (1.0 + signals.lint_findings / 5.0)))
+    if signals.tests_total:
+        failed = signals.tests_failed or 0
+        parts.append((2.0, max(0.0, 1.0 - failed / signals.tests_total)))
+    if signals.coverage_percent is not None:
+        parts.append((0.5, max(0.0, min(1.0, signals.coverage_percent / 100.0))))
+    if signals.diff_lines is not None:
+        # Small, focused diffs are trusted more; confidence tapers past 200 lines.
+        parts.append((0.5, max(0.3, 1.0 - max(0, signals.diff_lines - 200) / 1000.0)))
+    if signals.review_comments is not None:
+        parts.append((0.5, 1.0 / (1.0 + signals.review_comments / 5.0)))
+    if signals.blocking_comments is not None:
+        parts.append((2.0, 0.0 if signals.blocking_comments else 1.0))
+    return parts
+
+
+def score_locally(signals: ConfidenceSignals) -> float | None:
+    """Weighted rubric score from structured signals, or None if there are none."""
+    parts = _components(signals)
+    if not parts:
+        return None
+    total = sum(weight for weight, _ in parts)
+    return round(sum(weight * value for weight, value in parts) / total, 3)
+
+
+class LocalConfidenceScorer:
+    """Scores outputs without an LLM call, deferring when the result is ambiguous.
+
+    Scores inside the open interval (`ambiguous_low`, `ambiguous_high`) are not
+    trusted; callers should fall back to LLM self-scoring for those. A high
+    score is only decisive when independent evidence (lint, tests, coverage)
+    backs it: parse success and field completeness say the output is
+    well-formed, not that it is right, and must not overrule a low self-report.
+    """
+
+    def __init__(self, ambiguous_low: float = 0.35, ambiguous_high: float = 0.65):
+        self.ambiguous_low = ambiguous_low
+        self.ambiguous_high = ambiguous_high
+
+    def score(self, signals: ConfidenceSignals) -> tuple[float | None, bool]:
+        """Return (local score, decisive). Not decisive means use the LLM."""
+        local = score_locally(signals)
+        if local is None:
+            return None, False
+        if local <= self.ambiguous_low:
+            return local, True
+        return local, local >= self.ambiguous_high and _has_independent_evidence(signals)
+
+
+def _has_independent_evidence(signals: ConfidenceSignals) -> bool:
+    return (
+        signals.lint_findings is not None
+        or bool(signals.tests_total)
+        or signals.coverage_percent is not None
+    )
+
+
+def calibration_report(entries: list[dict[str, Any]]) -> dict[str, Any]:
+    """Compare local and LLM scores recorded on `confidence_score` audit entries.
+
+    Only entries carrying both `local_score` and `llm_score` (written when
+    `supervision.confidence.calibrate` is on, or when the LLM fallback ran)
+    are used. Returns sample count, mean absolute error, correlation, how often
+    both sides agree on the 0.5 pass/fail line, and per-agent breakdowns.
+    """
+    pairs: dict[str, list[tuple[float, float]]] = {}
+    for entry in entries:
+        details = entry.get("details", {})
+        local, llm = details.get("local_score"), details.get("llm_score")
+        if local is None or llm is None:
+            continue
+        pairs.setdefault(entry.get("agent", ""), []).append((float(local), float(llm)))
+
+    report = _calibration_stats([p for agent_pairs in pairs.values() for p in agent_pairs])
+    report["agents"] = {agent: _calibration_stats(p) for agent, p in sorted(pairs.items())}
+    return report
+
+
+def _calibration_stats(pairs: list[tuple[float, float]]) -> dict[str, Any]:
+    n = len(pairs)
+    if not n:
+        return {"samples": 0, "mae": None, "correlation": None, "agreement": None}
+
+    locals_, llms = [p[0] for p in pairs], [p[1] for p in pairs]
+    mae = sum(abs(a - b) for a, b in pairs) / n
+    agreement = sum((a >= 0.5) == (b >= 0.5) for a, b in pairs) / n
+
+    correlation = None
+    if n > 1:
+        mean_a, mean_b = sum(locals_) / n, sum(llms) / n
+        cov = sum((a - mean_a) * (b - mean_b) for a, b in pairs)
+        var_a = sum((a - mean_a) ** 2 for a in locals_)
+        var_b = sum((b - mean_b) ** 2 for b in llms)
+        if var_a and var_b:
+            correlation = round(cov / (var_a * var_b) ** 0.5, 3)
+
+    return {
+        "samples": n,
+        "mae": round(mae, 3),
+        "correlation": correlation,
+        "agreement": round(agreement, 3),
+    }
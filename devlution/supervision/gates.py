@@ -26,7 +26,7 @@ class HumanGate:
         self.gates: dict[str, GateConfig] = {
             g.id: g for g in config.supervision.gates
         }
-        self.audit = AuditLogger(config.supervision.audit_log)
+        self.audit = AuditLogger.from_config(config.supervision)
         self._pending_decisions: dict[str, GateDecision] = {}
 
     def check(self, state: dict[str, Any]) -> dict[str, Any]:
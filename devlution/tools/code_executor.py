@@ -1,19 +1,49 @@
 """Safe subprocess wrapper for running tests and commands.
 
 Provides timeout-bounded execution with captured stdout/stderr,
-used primarily by the Tester Agent.
+used primarily by the Tester Agent. Test runs stream their output
+(`stream_command`) so memory stays bounded however verbose the suite is.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import os
+import re
+import shlex
+import signal
 import subprocess
-from dataclasses import dataclass
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 300  # 5 minutes
 
+# `pytest --collect-only -qq` prints one `path/to/test_file.py: <count>` line per file.
+_COLLECTED_FILE = re.compile(r"^(?P<path>\S.*?\.py): (?P<count>\d+)$", re.MULTILINE)
+
+
+@dataclass
+class ShardResult:
+    index: int
+    files: list[str]
+    tests: int
+    returncode: int
+    duration_ms: int
+    timed_out: bool = False
+    spill_path: str = ""
+
 
 @dataclass
 class ExecutionResult:
@@ -22,6 +52,9 @@ class ExecutionResult:
     stderr: str
     returncode: int
     timed_out: bool = False
+    shards: list[ShardResult] = field(default_factory=list)
+    failures: str = ""  # failure sections extracted while streaming
+    spill_path: str = ""  # full output, when streamed with a spill directory
 
 
 def run_command(
@@ -74,13 +107,407 @@ def run_command(
         )
 
 
+async def arun_command(
+    cmd: str | list[str],
+    cwd: str = ".",
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+) -> ExecutionResult:
+    """Async counterpart of `run_command` that does not block the event loop."""
+    cmd_display = cmd if isinstance(cmd, str) else " ".join(cmd)
+    logger.info("Executing: %s (cwd=%s, timeout=%ds)", cmd_display, cwd, timeout)
+
+    try:
+        if isinstance(cmd, str):
+            proc = await asyncio.create_subprocess_shell(
+                cmd,
+                cwd=cwd,
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        else:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=cwd,
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+    except FileNotFoundError as e:
+        return ExecutionResult(
+            success=False,
+            stdout="",
+            stderr=str(e),
+            returncode=-1,
+        )
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        logger.warning("Command timed out after %ds: %s", timeout, cmd_display)
+        return ExecutionResult(
+            success=False,
+            stdout="",
+            stderr=f"Command timed out after {timeout}s",
+            returncode=-1,
+            timed_out=True,
+        )
+
+    returncode = proc.returncode if proc.returncode is not None else -1
+    return ExecutionResult(
+        success=returncode == 0,
+        stdout=stdout.decode(errors="replace"),
+        stderr=stderr.decode(errors="replace"),
+        returncode=returncode,
+    )
+
+
+# --- streaming execution -------------------------------------------------------
+
+LineHandler = Callable[[str, str], None]  # (stream name, line)
+
+HEAD_LINES = 200
+TAIL_LINES = 800
+FAILURE_LINES = 600  # total kept across all failure sections
+SECTION_LINES = 60  # lines kept from the start of each failure section
+SECTION_TAIL_LINES = 20  # ...and from its end
+MAX_SPILL_FILES = 20
+_MAX_LINE_BYTES = 64 * 1024
+_READER_GRACE_SECONDS = 5  # wait for output still in the pipes after the process exits
+
+# Lines that open a failure section in pytest, unittest, Go and Jest output.
+_FAILURE_START = re.compile(
+    r"^(?:_{3,} .+ _{3,}$"  # pytest per-test header
+    r"|={3,} (?:FAILURES|ERRORS) ={3,}$"
+    r"|Traceback \(most recent call last\)"
+    r"|(?:FAIL|ERROR): \w+ \("  # unittest
+    r"|FAILED |ERROR "  # pytest short summary
+    r"|--- FAIL: "  # go test
+    r"|\s*● )"  # jest
+)
+
+# Lines kept from the middle of a long failure section: pytest's `E` lines and
+# `path.py:N:` locations (also Go's), Python traceback frames and Jest frames.
+_KEY_LINE = re.compile(
+    r"^E\s"
+    r"|^\s*[\w./\\-]+\.\w+:\d+"
+    r"|^\s*File \".+\", line \d+"
+    r"|^\s+at .+:\d+:\d+\)?$"
+)
+
+
+class OutputBuffer:
+    """Bounded view of a long output: the first and last lines plus failure sections.
+
+    A failure section runs from one failure marker to the next. Each keeps
+    its first `section_lines` and last `section_tail` lines; in between only
+    error and location lines survive, so a long traceback still yields the
+    assertion and the `file:line` that the log distiller needs.
+    """
+
+    def __init__(
+        self,
+        head: int = HEAD_LINES,
+        tail: int = TAIL_LINES,
+        failure_lines: int = FAILURE_LINES,
+        section_lines: int = SECTION_LINES,
+        section_tail: int = SECTION_TAIL_LINES,
+    ):
+        self.head_size = head
+        self.head: list[str] = []
+        self.tail: deque[str] = deque(maxlen=tail)
+        self.failure_lines = failure_lines
+        self.section_lines = section_lines
+        self.lines_seen = 0
+        self._failures: list[str] = []
+        self._section: list[str] | None = None  # head and key lines of the open section
+        self._section_tail: deque[str] = deque(maxlen=section_tail)
+        self._section_seen = 0
+        self._section_omitted = 0
+
+    def add(self, line: str) -> None:
+        self.lines_seen += 1
+        if len(self.head) < self.head_size:
+            self.head.append(line)
+        else:
+            self.tail.append(line)
+
+        if _FAILURE_START.match(line):
+            self._failures = self.failures
+            self._section = [line]
+            self._section_tail.clear()
+            self._section_seen = 1
+            self._section_omitted = 0
+            return
+        if self._section is None:
+            return
+
+        self._section_seen += 1
+        if self._section_seen <= self.section_lines:
+            self._section.append(line)
+            return
+        tail = self._section_tail
+        evicted: str | None = line
+        if tail.maxlen:
+            evicted = tail[0] if len(tail) == tail.maxlen else None
+            tail.append(line)  # drops tail[0] once full
+        if evicted is None:
+            return
+        if _KEY_LINE.match(evicted):
+            self._section.append(evicted)
+        else:
+            self._section_omitted += 1
+
+    @property
+    def failures(self) -> list[str]:
+        """Kept failure lines so far, including the section still being read."""
+        if self._section is None:
+            return self._failures
+        section = list(self._section)
+        if self._section_omitted:
+            section.append(f"... [{self._section_omitted} lines omitted] ...")
+        section.extend(self._section_tail)
+        return (self._failures + section)[: self.failure_lines]
+
+    @property
+    def text(self) -> str:
+        omitted = self.lines_seen - len(self.head) - len(self.tail)
+        parts = self.head + ([f"... [{omitted} lines omitted] ..."] if omitted else [])
+        return "\n".join(parts + list(self.tail))
+
+
+class OutputCapture:
+    """Feeds a process's output lines to bounded buffers, a spill file and a callback.
+
+    `result()` closes the capture under the same lock `feed()` takes, so a
+    reader still draining a pipe held open by a leftover grandchild cannot
+    change the buffers or write to the spill file after the result is built.
+    """
+
+    def __init__(self, on_line: LineHandler | None, spill_dir: str | Path | None):
+        self.buffers = {"stdout": OutputBuffer(), "stderr": OutputBuffer()}
+        self.on_line = on_line
+        self.spill_path = ""
+        self._spill: BinaryIO | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        if spill_dir is not None:
+            self._open_spill(Path(spill_dir))
+
+    def _open_spill(self, spill_dir: Path) -> None:
+        try:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+            for old in sorted(spill_dir.glob("run-*.log"))[: -MAX_SPILL_FILES + 1 or None]:
+                old.unlink(missing_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = spill_dir / f"run-{stamp}-{uuid.uuid4().hex[:6]}.log"
+            self._spill = open(path, "wb")
+            self.spill_path = str(path)
+        except OSError as e:
+            logger.warning("Cannot write run log under %s: %s", spill_dir, e)
+
+    def feed(self, stream: str, raw: bytes) -> None:
+        line = raw.decode(errors="replace").rstrip("\r\n")
+        with self._lock:
+            if self._closed:
+                return
+            self.buffers[stream].add(line)
+            if self._spill is not None:
+                self._spill.write(raw if raw.endswith(b"\n") else raw + b"\n")
+            if self.on_line is not None:
+                self.on_line(stream, line)
+
+    def result(self, returncode: int, timed_out: bool = False, note: str = "") -> ExecutionResult:
+        with self._lock:
+            self._closed = True
+            if self._spill is not None:
+                self._spill.close()
+            stdout, stderr = self.buffers["stdout"], self.buffers["stderr"]
+            return ExecutionResult(
+                success=returncode == 0 and not timed_out,
+                stdout=stdout.text,
+                stderr="\n".join(filter(None, [stderr.text, note])),
+                returncode=returncode,
+                timed_out=timed_out,
+                failures="\n".join(stdout.failures + stderr.failures),
+                spill_path=self.spill_path,
+            )
+
+
+def _kill_group(proc: subprocess.Popen[bytes] | asyncio.subprocess.Process) -> None:
+    """Kill the process and anything it started (e.g. the shell's children)."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+def stream_command(
+    cmd: str | list[str],
+    cwd: str = ".",
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    on_line: LineHandler | None = None,
+    spill_dir: str | Path | None = None,
+) -> ExecutionResult:
+    """Execute a command, reading its output incrementally with bounded memory.
+
+    `stdout`/`stderr` of the result hold the head and tail of each stream,
+    and `failures` the failure sections found along the way. Every line is
+    passed to `on_line` as it arrives and, with `spill_dir`, written in full
+    to a `run-*.log` file there. Output read before a timeout is kept.
+    """
+    cmd_display = cmd if isinstance(cmd, str) else " ".join(cmd)
+    logger.info("Executing: %s (cwd=%s, timeout=%ds, streaming)", cmd_display, cwd, timeout)
+
+    capture = OutputCapture(on_line, spill_dir)
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            shell=isinstance(cmd, str),
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+    except FileNotFoundError as e:
+        return capture.result(-1, note=str(e))
+
+    def pump(stream: str, pipe: BinaryIO) -> None:
+        for raw in iter(lambda: pipe.readline(_MAX_LINE_BYTES), b""):
+            capture.feed(stream, raw)
+
+    assert proc.stdout is not None and proc.stderr is not None
+    readers = [
+        threading.Thread(target=pump, args=("stdout", proc.stdout), daemon=True),
+        threading.Thread(target=pump, args=("stderr", proc.stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    timed_out = False
+    try:
+        proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        logger.warning("Command timed out after %ds: %s", timeout, cmd_display)
+        _kill_group(proc)
+        proc.wait()
+        timed_out = True
+    # Pipes close when the process exits unless a detached grandchild still
+    # holds them; give the readers a moment, then take what they have.
+    for reader in readers:
+        reader.join(_READER_GRACE_SECONDS)
+    if any(reader.is_alive() for reader in readers):
+        logger.warning("Output of %s is still open after exit; ignoring the rest", cmd_display)
+
+    note = f"Command timed out after {timeout}s" if timed_out else ""
+    return capture.result(-1 if timed_out else proc.returncode, timed_out, note)
+
+
+async def astream_command(
+    cmd: str | list[str],
+    cwd: str = ".",
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    on_line: LineHandler | None = None,
+    spill_dir: str | Path | None = None,
+) -> ExecutionResult:
+    """Async counterpart of `stream_command`."""
+    cmd_display = cmd if isinstance(cmd, str) else " ".join(cmd)
+    logger.info("Executing: %s (cwd=%s, timeout=%ds, streaming)", cmd_display, cwd, timeout)
+
+    capture = OutputCapture(on_line, spill_dir)
+    options: dict[str, Any] = {
+        "cwd": cwd,
+        "env": env,
+        "stdout": asyncio.subprocess.PIPE,
+        "stderr": asyncio.subprocess.PIPE,
+        "limit": _MAX_LINE_BYTES,
+        "start_new_session": True,
+    }
+    try:
+        if isinstance(cmd, str):
+            proc = await asyncio.create_subprocess_shell(cmd, **options)
+        else:
+            proc = await asyncio.create_subprocess_exec(*cmd, **options)
+    except FileNotFoundError as e:
+        return capture.result(-1, note=str(e))
+
+    async def pump(stream: str, reader: asyncio.StreamReader) -> None:
+        while True:
+            try:
+                raw = await reader.readline()
+            except ValueError:  # line longer than the limit: take it in pieces
+                raw = await reader.read(_MAX_LINE_BYTES)
+            if not raw:
+                return
+            capture.feed(stream, raw)
+
+    assert proc.stdout is not None and proc.stderr is not None
+    readers = asyncio.gather(pump("stdout", proc.stdout), pump("stderr", proc.stderr))
+    timed_out = False
+    try:
+        await asyncio.wait_for(asyncio.shield(proc.wait()), timeout)
+    except TimeoutError:
+        logger.warning("Command timed out after %ds: %s", timeout, cmd_display)
+        _kill_group(proc)
+        await proc.wait()
+        timed_out = True
+    try:
+        await asyncio.wait_for(readers, 5)
+    except TimeoutError:
+        pass
+
+    returncode = proc.returncode if proc.returncode is not None and not timed_out else -1
+    note = f"Command timed out after {timeout}s" if timed_out else ""
+    return capture.result(returncode, timed_out, note)
+
+
 def run_tests(
     test_command: str,
     cwd: str = ".",
     timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    warm: bool = False,
+    on_line: LineHandler | None = None,
+    spill_dir: str | Path | None = None,
+) -> ExecutionResult:
+    """Run the project's test suite, streaming its output (see `stream_command`).
+
+    With `warm`, pytest commands run in the worktree's warm worker
+    (`test_worker`), falling back to a subprocess when it is unavailable.
+    """
+    if warm:
+        from devlution.tools.test_worker import run_warm  # imports this module
+
+        result = run_warm(test_command, cwd, timeout, env, on_line, spill_dir)
+        if result is not None:
+            return result
+    return stream_command(test_command, cwd, timeout, env, on_line, spill_dir)
+
+
+async def arun_tests(
+    test_command: str,
+    cwd: str = ".",
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    warm: bool = False,
+    on_line: LineHandler | None = None,
+    spill_dir: str | Path | None = None,
 ) -> ExecutionResult:
-    """Run the project's test suite."""
-    return run_command(test_command, cwd=cwd, timeout=timeout)
+    """Run the project's test suite without blocking the event loop."""
+    if warm:
+        return await asyncio.to_thread(
+            run_tests, test_command, cwd, timeout, env, True, on_line, spill_dir
+        )
+    return await astream_command(test_command, cwd, timeout, env, on_line, spill_dir)
 
 
 def run_lint(
@@ -90,3 +517,309 @@ def run_lint(
 ) -> ExecutionResult:
     """Run the project's linter."""
     return run_command(lint_command, cwd=cwd, timeout=timeout)
+
+
+def test_command_line(test_command: str, paths: list[str] | None = None, args: str = "") -> str:
+    """`test_command` followed by extra `args` and the test `paths` to run."""
+    parts = [test_command]
+    if args:
+        parts.append(args)
+    parts.extend(shlex.quote(p) for p in paths or [])
+    return " ".join(parts)
+
+
+def parse_collected(output: str) -> dict[str, int]:
+    """Test count per file from `pytest --collect-only -qq` output."""
+    return {m.group("path"): int(m.group("count")) for m in _COLLECTED_FILE.finditer(output)}
+
+
+def plan_shards(counts: dict[str, int], shards: int) -> list[list[str]]:
+    """Split test files into up to `shards` groups with balanced test counts.
+
+    Whole files stay together so module- and class-scoped fixtures are set
+    up once. Largest files are placed first, each on the lightest shard.
+    """
+    shards = max(1, min(shards, len(counts)))
+    groups: list[list[str]] = [[] for _ in range(shards)]
+    loads = [0] * shards
+    for path, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+        lightest = loads.index(min(loads))
+        groups[lightest].append(path)
+        loads[lightest] += count
+    return [sorted(group) for group in groups if group]
+
+
+def _collect_stdout(lines: list[str]) -> LineHandler:
+    """Line handler that keeps every stdout line (collection output must not be cut)."""
+
+    def handle(stream: str, line: str) -> None:
+        if stream == "stdout":
+            lines.append(line)
+
+    return handle
+
+
+def _shard_count(shards: int) -> int:
+    return shards if shards > 0 else os.cpu_count() or 1
+
+
+def _shard_args(args: str, index: int) -> str:
+    """Fill the `{shard}` placeholder, used for per-shard report file names."""
+    return args.replace("{shard}", str(index))
+
+
+def _shard_env(env: dict[str, str] | None, index: int) -> dict[str, str] | None:
+    """Give each shard its own coverage data file so parallel writers don't collide."""
+    if env is None or "COVERAGE_FILE" not in env:
+        return env
+    return {**env, "COVERAGE_FILE": f"{env['COVERAGE_FILE']}.{index}"}
+
+
+def _merge_shards(results: list[tuple[ShardResult, ExecutionResult]]) -> ExecutionResult:
+    stdout: list[str] = []
+    stderr: list[str] = []
+    for shard, result in results:
+        header = (
+            f"===== shard {shard.index + 1}/{len(results)}: {shard.tests} tests in "
+            f"{len(shard.files)} files, {shard.duration_ms / 1000:.1f}s, "
+            f"exit {shard.returncode} ====="
+        )
+        stdout.append(f"{header}\n{result.stdout}")
+        if result.stderr:
+            stderr.append(f"{header}\n{result.stderr}")
+    failed = [shard.returncode for shard, _ in results if shard.returncode != 0]
+    return ExecutionResult(
+        success=not failed,
+        stdout="\n".join(stdout),
+        stderr="\n".join(stderr),
+        returncode=failed[0] if failed else 0,
+        timed_out=any(shard.timed_out for shard, _ in results),
+        shards=[shard for shard, _ in results],
+        failures="\n".join(result.failures for _, result in results if result.failures),
+    )
+
+
+def _shard_result(
+    index: int, files: list[str], counts: dict[str, int], result: ExecutionResult, started: float
+) -> ShardResult:
+    shard = ShardResult(
+        index=index,
+        files=files,
+        tests=sum(counts[f] for f in files),
+        returncode=result.returncode,
+        duration_ms=int((time.monotonic() - started) * 1000),
+        timed_out=result.timed_out,
+        spill_path=result.spill_path,
+    )
+    logger.info(
+        "Shard %d finished: %d tests in %.1fs (exit %d)",
+        index + 1, shard.tests, shard.duration_ms / 1000, shard.returncode,
+    )
+    return shard
+
+
+def run_sharded_tests(
+    test_command: str,
+    cwd: str = ".",
+    shards: int = 0,
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    paths: list[str] | None = None,
+    args: str = "",
+    warm: bool = False,
+    on_line: LineHandler | None = None,
+    spill_dir: str | Path | None = None,
+) -> ExecutionResult:
+    """Run pytest tests split across parallel worker processes.
+
+    Tests under `paths` (default: everything the command collects) are
+    grouped by file into `shards` processes (0 = one per CPU); `args` is
+    appended to each shard's command, with `{shard}` replaced by the shard
+    number so report paths don't collide. Falls back to a single run when
+    sharding is off, collection fails, or there is only one test file.
+    `warm` runs collection and shards through the warm test worker.
+    """
+    n = _shard_count(shards)
+    counts: dict[str, int] = {}
+    if n > 1:
+        lines: list[str] = []
+        collected = run_tests(
+            test_command_line(test_command, paths, "--collect-only -qq"),
+            cwd,
+            timeout,
+            warm=warm,
+            on_line=_collect_stdout(lines),
+        )
+        counts = parse_collected("\n".join(lines)) if collected.success else {}
+    if n <= 1 or len(counts) < 2:
+        command = test_command_line(test_command, paths, _shard_args(args, 0))
+        return run_tests(command, cwd, timeout, env, warm, on_line, spill_dir)
+
+    groups = plan_shards(counts, n)
+    logger.info("Running %d test files in %d shards", len(counts), len(groups))
+
+    def run_shard(index: int) -> tuple[ShardResult, ExecutionResult]:
+        started = time.monotonic()
+        command = test_command_line(test_command, groups[index], _shard_args(args, index))
+        result = run_tests(
+            command, cwd, timeout, _shard_env(env, index), warm, on_line, spill_dir
+        )
+        return _shard_result(index, groups[index], counts, result, started), result
+
+    with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        results = list(pool.map(run_shard, range(len(groups))))
+    return _merge_shards(results)
+
+
+async def arun_sharded_tests(
+    test_command: str,
+    cwd: str = ".",
+    shards: int = 0,
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    paths: list[str] | None = None,
+    args: str = "",
+    warm: bool = False,
+    on_line: LineHandler | None = None,
+    spill_dir: str | Path | None = None,
+) -> ExecutionResult:
+    """Async counterpart of `run_sharded_tests`."""
+    n = _shard_count(shards)
+    counts: dict[str, int] = {}
+    if n > 1:
+        lines: list[str] = []
+        collected = await arun_tests(
+            test_command_line(test_command, paths, "--collect-only -qq"),
+            cwd,
+            timeout,
+            warm=warm,
+            on_line=_collect_stdout(lines),
+        )
+        counts = parse_collected("\n".join(lines)) if collected.success else {}
+    if n <= 1 or len(counts) < 2:
+        command = test_command_line(test_command, paths, _shard_args(args, 0))
+        return await arun_tests(command, cwd, timeout, env, warm, on_line, spill_dir)
+
+    groups = plan_shards(counts, n)
+    logger.info("Running %d test files in %d shards", len(counts), len(groups))
+
+    async def run_shard(index: int) -> tuple[ShardResult, ExecutionResult]:
+        started = time.monotonic()
+        command = test_command_line(test_command, groups[index], _shard_args(args, index))
+        result = await arun_tests(
+            command, cwd, timeout, _shard_env(env, index), warm, on_line, spill_dir
+        )
+        return _shard_result(index, groups[index], counts, result, started), result
+
+    results = await asyncio.gather(*(run_shard(i) for i in range(len(groups))))
+    return _merge_shards(list(results))
+
+
+# --- structured results ----------------------------------------------------------
+
+# Reporter arguments per framework: (JUnit XML, coverage JSON). `{dir}` is the
+# report directory and `{shard}` the shard number. Coverage needs pytest-cov.
+REPORT_ARGS: dict[str, tuple[str, str]] = {
+    "pytest": (
+        "--junitxml={dir}/junit-{shard}.xml",
+        "--cov=. --cov-report=json:{dir}/coverage-{shard}.json",
+    ),
+}
+
+
+@dataclass
+class RunReport:
+    """Counts and coverage read from a run's machine-readable reports."""
+
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    skipped: int = 0
+    coverage_percent: float | None = None
+    failed_tests: list[str] = field(default_factory=list)
+
+
+def report_args(frameworks: list[str], report_dir: str | Path) -> tuple[str, str]:
+    """`(junit_args, coverage_args)` for the first framework with known reporters."""
+    for framework in frameworks:
+        if framework in REPORT_ARGS:
+            junit, coverage = REPORT_ARGS[framework]
+            return (
+                junit.replace("{dir}", shlex.quote(str(report_dir))),
+                coverage.replace("{dir}", shlex.quote(str(report_dir))),
+            )
+    return "", ""
+
+
+def parse_junit(paths: list[Path], report: RunReport, max_failed: int = 50) -> None:
+    """Add the test cases of JUnit XML files to `report`.
+
+    Streams with `iterparse` and clears each case once counted, so large
+    reports are not held in memory.
+    """
+    for path in paths:
+        try:
+            for _, elem in ET.iterparse(path, events=("end",)):
+                if elem.tag != "testcase":
+                    continue
+                outcomes = {child.tag for child in elem}
+                report.total += 1
+                if "failure" in outcomes or "error" in outcomes:
+                    if "failure" in outcomes:
+                        report.failed += 1
+                    else:
+                        report.errors += 1
+                    if len(report.failed_tests) < max_failed:
+                        name = "::".join(filter(None, [elem.get("classname"), elem.get("name")]))
+                        report.failed_tests.append(name)
+                elif "skipped" in outcomes:
+                    report.skipped += 1
+                else:
+                    report.passed += 1
+                elem.clear()
+        except (ET.ParseError, OSError) as e:
+            logger.warning("Cannot parse JUnit report %s: %s", path, e)
+
+
+def parse_coverage_json(paths: list[Path], files: list[str] | None = None) -> float | None:
+    """Line coverage percent from coverage.py JSON reports.
+
+    Reports from parallel shards are merged by taking the union of executed
+    lines per file. With `files`, only those files count (when any of them
+    was measured), so coverage reflects the changed code.
+    """
+    executed: dict[str, set[int]] = {}
+    statements: dict[str, set[int]] = {}
+    for path in paths:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Cannot parse coverage report %s: %s", path, e)
+            continue
+        for name, info in data.get("files", {}).items():
+            ran = set(info.get("executed_lines", []))
+            executed.setdefault(name, set()).update(ran)
+            statements.setdefault(name, set()).update(ran, info.get("missing_lines", []))
+
+    if not statements:
+        return None
+    wanted = [f for f in files or [] if f in statements] or list(statements)
+    total = sum(len(statements[f]) for f in wanted)
+    if not total:
+        return 100.0
+    return round(100.0 * sum(len(executed[f]) for f in wanted) / total, 2)
+
+
+def collect_results(report_dir: str | Path, files: list[str] | None = None) -> RunReport | None:
+    """Read the JUnit and coverage reports a run wrote to `report_dir`; None if absent."""
+    report_dir = Path(report_dir)
+    junit = sorted(report_dir.glob("junit-*.xml"))
+    if not junit:
+        return None
+    report = RunReport()
+    parse_junit(junit, report)
+    report.coverage_percent = parse_coverage_json(
+        sorted(report_dir.glob("coverage-*.json")), files
+    )
+    return report
@@ -42,11 +42,20 @@ def patch_file(path: str, old: str, new: str, base_dir: str = ".") -> bool:
     return True
 
 
-def list_files(directory: str = ".", extensions: list[str] | None = None) -> list[str]:
-    """List files in a directory, optionally filtered by extension."""
+def list_files(
+    directory: str = ".",
+    extensions: list[str] | None = None,
+    skip_dirs: set[str] | None = None,
+) -> list[str]:
+    """List files in a directory, optionally filtered by extension.
+
+    Directories named in `skip_dirs` (e.g. `.git`) are not descended into.
+    """
     results: list[str] = []
     base = Path(directory)
-    for root, _, files in os.walk(base):
+    for root, dirs, files in os.walk(base):
+        if skip_dirs:
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
         for f in files:
             if extensions and not any(f.endswith(ext) for ext in extensions):
                 continue
@@ -7,7 +7,9 @@ audit logging, and consistent error handling.
 from __future__ import annotations
 
 import logging
+import os
 import subprocess
+import tempfile
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -21,7 +23,22 @@ class GitResult:
     returncode: int
 
 
-def _run(args: list[str], cwd: str = ".") -> GitResult:
+# Identity for the internal commits made by snapshot() and merge().
+_PIPELINE_IDENTITY = {
+    "GIT_AUTHOR_NAME": "devlution",
+    "GIT_AUTHOR_EMAIL": "devlution@localhost",
+    "GIT_COMMITTER_NAME": "devlution",
+    "GIT_COMMITTER_EMAIL": "devlution@localhost",
+}
+
+
+# Generated files that snapshot() leaves out: devlution's own state (symbol
+# index, run logs, reports) and coverage data. Binary databases that differ per
+# worktree would otherwise conflict when dependency snapshots are merged.
+SNAPSHOT_EXCLUDES = (":(exclude).devlution", ":(exclude,glob)**/.coverage*")
+
+
+def _run(args: list[str], cwd: str = ".", env: dict[str, str] | None = None) -> GitResult:
     """Run a git command and return structured output."""
     try:
         result = subprocess.run(
@@ -30,6 +47,7 @@ def _run(args: list[str], cwd: str = ".") -> GitResult:
             capture_output=True,
             text=True,
             timeout=30,
+            env={**os.environ, **env} if env else None,
         )
         return GitResult(
             success=result.returncode == 0,
@@ -92,3 +110,84 @@ def status(cwd: str = ".") -> str:
 def log(n: int = 10, cwd: str = ".") -> str:
     result = _run(["log", f"-{n}", "--oneline"], cwd)
     return result.stdout
+
+
+def rev_parse(ref: str = "HEAD", cwd: str = ".") -> str:
+    result = _run(["rev-parse", ref], cwd)
+    return result.stdout if result.success else ""
+
+
+def reset_hard(ref: str = "HEAD", cwd: str = ".") -> GitResult:
+    return _run(["reset", "--hard", ref], cwd)
+
+
+def clean(cwd: str = ".") -> GitResult:
+    return _run(["clean", "-fd"], cwd)
+
+
+def snapshot(message: str, cwd: str = ".") -> str:
+    """Commit the work tree, untracked files included, without moving HEAD.
+
+    The commit is built in a throwaway index, so the checkout, its index and
+    its `git diff` output are left exactly as they were. Paths matching
+    `SNAPSHOT_EXCLUDES` are not added. Returns the commit SHA, or "" on failure.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**_PIPELINE_IDENTITY, "GIT_INDEX_FILE": os.path.join(tmp, "index")}
+        for args in (["read-tree", "HEAD"], ["add", "-A", "--", ".", *SNAPSHOT_EXCLUDES]):
+            if not _run(args, cwd, env).success:
+                return ""
+        tree = _run(["write-tree"], cwd, env)
+        if not tree.success:
+            return ""
+        result = _run(["commit-tree", tree.stdout, "-p", "HEAD", "-m", message], cwd, env)
+    return result.stdout if result.success else ""
+
+
+def merge(refs: list[str], message: str, cwd: str = ".") -> GitResult:
+    """Merge `refs` into HEAD; a conflicting merge is aborted and reported as failed."""
+    result = _run(["merge", "--no-edit", "-m", message, *refs], cwd, _PIPELINE_IDENTITY)
+    if not result.success:
+        _run(["merge", "--abort"], cwd)
+    return result
+
+
+def worktree_add(path: str, ref: str = "HEAD", cwd: str = ".") -> GitResult:
+    return _run(["worktree", "add", "--detach", path, ref], cwd)
+
+
+def worktree_remove(path: str, force: bool = False, cwd: str = ".") -> GitResult:
+    args = ["worktree", "remove"]
+    if force:
+        args.append("--force")
+    args.append(path)
+    return _run(args, cwd)
+
+
+def worktree_prune(cwd: str = ".") -> GitResult:
+    return _run(["worktree", "prune"], cwd)
+
+
+def ls_files_stage(pathspec: list[str], cwd: str = ".") -> dict[str, str] | None:
+    """Map tracked paths matching `pathspec` to their index blob hashes.
+
+    Returns None when `cwd` is not inside a git work tree.
+    """
+    result = _run(["ls-files", "-s", "-z", "--", *pathspec], cwd)
+    if not result.success:
+        return None
+    blobs: dict[str, str] = {}
+    for record in result.stdout.split("\0"):
+        if not record:
+            continue
+        meta, _, path = record.partition("\t")
+        blobs[path] = meta.split()[1]
+    return blobs
+
+
+def ls_files_dirty(pathspec: list[str], cwd: str = ".") -> list[str]:
+    """Paths matching `pathspec` that are modified in the work tree or untracked."""
+    result = _run(["ls-files", "-z", "-m", "-o", "--exclude-standard", "--", *pathspec], cwd)
+    if not result.success:
+        return []
+    return sorted({path for path in result.stdout.split("\0") if path})
@@ -0,0 +1,345 @@
+"""Failure log distillation for the debugger.
+
+Raw test output is mostly noise for a fix: collection chatter, passing
+tests, warning summaries, captured output and the same traceback repeated
+for every parametrized case. A prefix of it often holds none of the actual
+failure. `distill()` parses the failures out of pytest, unittest (and any
+Python traceback), `go test` and Jest output, keeps the first error of each
+failing test with the frames leading to it, folds identical failures
+together, and shows each frame under the repository root with its current
+source line.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+MAX_FRAMES = 6  # per failure; the outermost two and the innermost rest are kept
+MAX_ERROR_LINES = 12
+
+_VENDOR_DIRS = {"site-packages", "dist-packages", "node_modules", ".venv", "venv", "vendor"}
+
+# Failure headers, one per framework.
+_PYTEST_HEADER = re.compile(r"^_{3,} (?P<test>.+?) _{3,}$")
+_UNITTEST_HEADER = re.compile(r"^(?:FAIL|ERROR): (?P<name>\w+) \((?P<where>[^)]+)\)")
+_GO_HEADER = re.compile(r"^\s*--- (?P<result>FAIL|PASS|SKIP): (?P<test>\S+)")
+_GO_RUN = re.compile(r"^=== (?:RUN|CONT) +(?P<test>\S+)")  # `go test -v` logs after this
+_JEST_HEADER = re.compile(r"^\s*● (?P<test>.+)$")
+# Lines that end the current failure without starting another.
+_RULE = re.compile(r"^(?:={3,}|-{3,})(?: .* (?:={3,}|-{3,}))?$")
+
+_PY_FRAME = re.compile(r'^\s*File "(?P<path>[^"]+)", line (?P<line>\d+)(?:, in (?P<func>.+))?')
+# pytest's own traceback entries: `path.py:12: in func`, `path.py:12: ` or `path.py:12: Error`
+_PYTEST_LOCATION = re.compile(r"^(?P<path>[^\s:][^\s:]*\.py):(?P<line>\d+):(?: (?P<rest>.*))?$")
+_PY_DEF = re.compile(r"^\s*(?:async\s+)?def (?P<func>\w+)\(")
+_GO_LOCATION = re.compile(r"^\s+(?P<path>[\w./-]+\.go):(?P<line>\d+): ?(?P<msg>.*)$")
+_GO_STACK = re.compile(r"^\s+(?P<path>\S+\.go):(?P<line>\d+)(?: \+0x[0-9a-f]+)?$")
+_JS_FRAME = re.compile(r"^\s+at (?:(?P<func>.+?) \()?(?P<path>[^\s()]+?):(?P<line>\d+):\d+\)?$")
+_JEST_CODE = re.compile(r"^\s*>?\s*\d*\s*\|")  # code frame: `> 12 |   expect(x)`
+_CHAINED = ("During handling of the above exception", "The above exception was the direct cause")
+_ADDRESS = re.compile(r"0x[0-9a-fA-F]+")
+
+
+@dataclass
+class Frame:
+    path: str
+    line: int
+    function: str = ""
+    code: str = ""  # the source line, as printed in the log or read from disk
+
+
+@dataclass
+class Failure:
+    test: str
+    error: list[str] = field(default_factory=list)
+    frames: list[Frame] = field(default_factory=list)
+    same_as: list[str] = field(default_factory=list)  # tests that failed identically
+
+    def key(self) -> tuple[str, tuple[tuple[str, int], ...]]:
+        """Identity for folding repeats: first error line and frame locations."""
+        first = _ADDRESS.sub("0x?", self.error[0]) if self.error else ""
+        return first, tuple((f.path, f.line) for f in self.frames)
+
+
+class _Parser:
+    """Line-by-line state machine over mixed test output."""
+
+    def __init__(self) -> None:
+        self.failures: list[Failure] = []
+        self.current: Failure | None = None
+        self.kind = ""
+        self.done = False  # first error of the current failure is complete
+        self.in_traceback = False
+        self.in_error = False
+        self.pending_code = ""
+        self.pending_func = ""
+
+    def start(self, test: str, kind: str) -> None:
+        self.close()
+        self.current = Failure(test=test)
+        self.kind = kind
+
+    def close(self, keep: bool = True) -> None:
+        if keep and self.current is not None and (self.current.error or self.current.frames):
+            self.failures.append(self.current)
+        self.current = None
+        self.kind = ""
+        self.done = self.in_traceback = self.in_error = False
+        self.pending_code = self.pending_func = ""
+
+    def feed(self, line: str) -> None:
+        line = line.rstrip()
+        if match := _PYTEST_HEADER.match(line):
+            self.start(match.group("test"), "pytest")
+        elif match := _UNITTEST_HEADER.match(line):
+            name, where = match.group("name"), match.group("where")
+            self.start(where if where.endswith(name) else f"{where}.{name}", "python")
+        elif match := _GO_RUN.match(line):
+            self.close()
+            self.start(match.group("test"), "go")
+        elif match := _GO_HEADER.match(line):
+            self._go_result(match.group("result"), match.group("test"))
+        elif match := _JEST_HEADER.match(line):
+            self.start(match.group("test"), "jest")
+        elif _RULE.match(line):
+            if self.kind != "python" or self.done:
+                self.close()
+        elif line.startswith("Traceback (most recent call last)"):
+            if self.current is None:
+                self.start("", "python")
+            if not self.done:
+                self.in_traceback = True
+        elif line.startswith("panic: ") and (self.current is None or self.kind != "go"):
+            self.start("panic", "go")
+            self.current.error.append(line)  # type: ignore[union-attr]
+        elif self.current is not None and not self.done:
+            self._feed_failure(line)
+
+    def _go_result(self, result: str, test: str) -> None:
+        """`--- FAIL: TestX` follows the test's messages with `-v` and precedes them without."""
+        logged = self.kind == "go" and self.current is not None and self.current.test == test
+        if result != "FAIL":
+            if logged:
+                self.close(keep=False)
+        elif not logged:
+            self.start(test, "go")
+
+    def _add_error(self, text: str) -> None:
+        if self.current is not None and len(self.current.error) < MAX_ERROR_LINES:
+            self.current.error.append(text)
+
+    def _feed_failure(self, line: str) -> None:
+        failure = self.current
+        assert failure is not None
+        if line.startswith(_CHAINED):
+            self.done = bool(failure.error)
+            return
+
+        if match := _PY_FRAME.match(line):
+            if failure.error:
+                self.done = True
+                return
+            self.in_traceback = True
+            failure.frames.append(
+                Frame(match.group("path"), int(match.group("line")), match.group("func") or "")
+            )
+            return
+
+        if self.kind == "pytest":
+            self._feed_pytest(failure, line)
+        elif self.kind == "go":
+            self._feed_go(failure, line)
+        elif self.kind == "jest":
+            self._feed_jest(failure, line)
+        else:
+            self._feed_python(failure, line)
+
+    def _feed_python(self, failure: Failure, line: str) -> None:
+        if not self.in_traceback:
+            return
+        if self.in_error:
+            if line:
+                self._add_error(line)
+            else:
+                self.done = True
+        elif line.startswith((" ", "\t")):
+            stripped = line.strip()
+            if failure.frames and not failure.frames[-1].code and stripped.strip("^~ "):
+                failure.frames[-1].code = stripped
+        elif line and failure.frames:
+            self.in_error = True
+            self._add_error(line)
+
+    def _feed_pytest(self, failure: Failure, line: str) -> None:
+        if line.startswith("E "):
+            self._add_error(line[1:].strip())
+            return
+        if self.in_traceback:
+            # `--tb=native`: the exception line follows the frames
+            self._feed_python(failure, line)
+            return
+        if match := _PYTEST_LOCATION.match(line):
+            rest = match.group("rest") or ""
+            final = bool(rest) and not rest.startswith("in ")
+            if failure.error and not final:
+                self.done = True  # a chained exception's traceback
+                return
+            func = rest[3:] if rest.startswith("in ") else self.pending_func
+            failure.frames.append(
+                Frame(match.group("path"), int(match.group("line")), func, self.pending_code)
+            )
+            self.pending_code = self.pending_func = ""
+            self.done = final
+        elif line.startswith(">"):
+            self.pending_code = line[1:].strip()
+        elif match := _PY_DEF.match(line):
+            self.pending_func = match.group("func")
+        elif failure.frames and not failure.frames[-1].code and line.startswith("    "):
+            failure.frames[-1].code = line.strip()  # `--tb=short` prints the line after
+
+    def _feed_go(self, failure: Failure, line: str) -> None:
+        if line.startswith("panic: "):
+            if not failure.error:
+                self._add_error(line)
+        elif match := _GO_STACK.match(line):
+            failure.frames.append(
+                Frame(match.group("path"), int(match.group("line")), self.pending_func)
+            )
+        elif match := _GO_LOCATION.match(line):
+            if failure.error:
+                self.done = True
+                return
+            failure.frames.append(Frame(match.group("path"), int(match.group("line"))))
+            self._add_error(match.group("msg"))
+        elif failure.error and line.startswith(("        ", "\t\t")):
+            self._add_error(line.strip())  # continuation of a multi-line t.Errorf
+        elif line and not line.startswith(("goroutine ", "\t")):
+            self.pending_func = line.strip().split("(", 1)[0]  # `pkg.Func(0x1?)`
+
+    def _feed_jest(self, failure: Failure, line: str) -> None:
+        if match := _JS_FRAME.match(line):
+            failure.frames.append(
+                Frame(
+                    match.group("path"),
+                    int(match.group("line")),
+                    match.group("func") or "",
+                    self.pending_code,
+                )
+            )
+            self.pending_code = ""
+        elif _JEST_CODE.match(line):
+            if line.lstrip().startswith(">"):
+                self.pending_code = line.split("|", 1)[1].strip()
+            # other code-frame lines are context and carets
+        elif line.strip() and not failure.frames:
+            self._add_error(line.strip())
+
+
+def parse_failures(log: str) -> list[Failure]:
+    """Failures found in `log`, in order, with only the first error of each test."""
+    parser = _Parser()
+    for line in log.splitlines():
+        parser.feed(line)
+    parser.close()
+    return parser.failures
+
+
+def _local_path(path: str, root: Path) -> str | None:
+    """`path` relative to `root` if it names a project file (not a dependency)."""
+    candidate = Path(path)
+    if candidate.is_absolute():
+        try:
+            candidate = candidate.resolve().relative_to(root)
+        except (OSError, ValueError):
+            return None
+    if any(part in _VENDOR_DIRS or part == ".." for part in candidate.parts):
+        return None
+    return candidate.as_posix() if (root / candidate).is_file() else None
+
+
+def localize(failures: list[Failure], root: str | Path = ".") -> None:
+    """Rewrite frames under `root` to relative paths with their current source line.
+
+    Frames outside the project are dropped from failures that have any
+    project frames, since the fix belongs in project code.
+    """
+    root = Path(root).resolve()
+    sources: dict[str, list[str]] = {}
+    for failure in failures:
+        local: list[Frame] = []
+        for frame in failure.frames:
+            rel = _local_path(frame.path, root)
+            if rel is None:
+                continue
+            if rel not in sources:
+                try:
+                    sources[rel] = (root / rel).read_text(errors="replace").splitlines()
+                except OSError:
+                    sources[rel] = []
+            lines = sources[rel]
+            code = lines[frame.line - 1].strip() if 0 < frame.line <= len(lines) else frame.code
+            local.append(Frame(rel, frame.line, frame.function, code))
+        if local:
+            failure.frames = local
+
+
+def fold(failures: list[Failure]) -> list[Failure]:
+    """Merge failures with the same first error line and frames into the first one."""
+    folded: dict[tuple[str, tuple[tuple[str, int], ...]], Failure] = {}
+    for failure in failures:
+        first = folded.setdefault(failure.key(), failure)
+        if first is not failure:
+            first.same_as.append(failure.test or "(unnamed)")
+    return list(folded.values())
+
+
+def _render(failure: Failure) -> str:
+    lines = [f"FAILED {failure.test}" if failure.test else "FAILED"]
+    frames = failure.frames
+    if len(frames) > MAX_FRAMES:
+        omitted = len(frames) - MAX_FRAMES
+        frames = frames[:2] + [Frame("", omitted)] + frames[-(MAX_FRAMES - 2):]
+    for frame in frames:
+        if not frame.path:
+            lines.append(f"  ... {frame.line} frames omitted")
+            continue
+        location = f"  {frame.path}:{frame.line}"
+        lines.append(f"{location} in {frame.function}" if frame.function else location)
+        if frame.code:
+            lines.append(f"      {frame.code}")
+    lines.extend(f"  {text}" for text in failure.error)
+    if failure.same_as:
+        shown = ", ".join(failure.same_as[:5])
+        more = f" and {len(failure.same_as) - 5} more" if len(failure.same_as) > 5 else ""
+        lines.append(f"  (same failure in {shown}{more})")
+    return "\n".join(lines)
+
+
+def distill(log: str, root: str | Path = ".", max_chars: int = 6000) -> str:
+    """A compact failure report from raw test output, at most `max_chars` long.
+
+    When no failure can be parsed, the end of the log is returned, since
+    runners print errors after the collection and progress output.
+    """
+    failures = fold(parse_failures(log))
+    if not failures:
+        if len(log) <= max_chars:
+            return log
+        tail = log[-max_chars:]
+        return tail.split("\n", 1)[1] if "\n" in tail else tail
+
+    localize(failures, root)
+    total = len(failures) + sum(len(f.same_as) for f in failures)
+    header = f"Failing tests: {total} ({len(failures)} distinct failures)\n\n"
+    blocks: list[str] = []
+    size = len(header)
+    for i, failure in enumerate(failures):
+        block = _render(failure)
+        if blocks and size + len(block) + 2 > max_chars:
+            blocks.append(f"... {len(failures) - i} more distinct failures omitted")
+            break
+        blocks.append(block)
+        size += len(block) + 2
+    return (header + "\n\n".join(blocks))[:max_chars]
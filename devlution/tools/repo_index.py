@@ -0,0 +1,117 @@
+"""Change detection and parallel parsing for repository indexes.
+
+Indexes (symbols, lexical search) store a content key per file and re-parse a
+file only when its key changes. In a git work tree the key is the blob hash
+from `git ls-files -s`, so an unchanged file costs nothing beyond one line of
+`ls-files` output; files that are modified or untracked fall back to an
+mtime/size key. Outside git every file uses the mtime/size key.
+
+Changed files are parsed over a process pool once there are enough of them to
+pay for the pool's startup.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+from devlution.tools import git_ops
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SKIP_DIRS = {".git", ".devlution", "__pycache__", "node_modules", ".venv", "venv", ".tox"}
+
+# Below this many changed files, parsing in-process beats starting workers.
+PARALLEL_MIN_FILES = 64
+
+
+def stat_key(path: Path) -> str | None:
+    """Key from a file's mtime and size; None when it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return f"stat:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def content_keys(
+    root: str | Path,
+    suffixes: Iterable[str] = (".py",),
+    paths: list[str] | None = None,
+) -> dict[str, str]:
+    """Content key for every file under `root` with one of `suffixes`.
+
+    With `paths`, only those (root-relative) files are keyed; missing ones
+    are left out.
+    """
+    root = Path(root)
+    pathspec = list(paths) if paths is not None else [f"*{s}" for s in suffixes]
+    if not pathspec:
+        return {}
+
+    keys = git_ops.ls_files_stage(pathspec, cwd=str(root))
+    if keys is None:
+        return _walk_keys(root, tuple(suffixes), paths)
+
+    for path in git_ops.ls_files_dirty(pathspec, cwd=str(root)):
+        key = stat_key(root / path)
+        if key is None:
+            keys.pop(path, None)
+        else:
+            keys[path] = key
+    return keys
+
+
+def _walk_keys(root: Path, suffixes: tuple[str, ...], paths: list[str] | None) -> dict[str, str]:
+    if paths is None:
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                if name.endswith(suffixes):
+                    paths.append(os.path.relpath(os.path.join(dirpath, name), root))
+
+    keys: dict[str, str] = {}
+    for path in paths:
+        key = stat_key(root / path)
+        if key is not None:
+            keys[path] = key
+    return keys
+
+
+def diff_keys(
+    stored: dict[str, str], current: dict[str, str]
+) -> tuple[list[str], list[str]]:
+    """Return (changed or new paths, removed paths) between two key maps."""
+    changed = sorted(p for p, key in current.items() if stored.get(p) != key)
+    removed = sorted(p for p in stored if p not in current)
+    return changed, removed
+
+
+def parse_files(
+    parse: Callable[[str, str], T],
+    root: str | Path,
+    paths: list[str],
+    workers: int = 0,
+) -> list[tuple[str, T]]:
+    """Run `parse(root, path)` for each path, over a process pool for large batches.
+
+    `parse` must be a module-level function so it can be pickled. `workers=0`
+    uses one worker per CPU.
+    """
+    root = str(root)
+    if len(paths) < PARALLEL_MIN_FILES or workers == 1:
+        return [(path, parse(root, path)) for path in paths]
+
+    max_workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results: list[Any] = list(pool.map(parse, [root] * len(paths), paths, chunksize=chunksize))
+    logger.debug("Parsed %d files with %d workers", len(paths), max_workers)
+    return list(zip(paths, results))
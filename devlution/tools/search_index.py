@@ -0,0 +1,217 @@
+"""Lexical search over repository files for planner file hints.
+
+Files from `file_editor.list_files` are tokenized into identifier parts (the
+same splitting the symbol index uses) and stored as BM25 postings in SQLite
+under `.devlution/index/search.db`, refreshed incrementally by mtime/size.
+Path components count extra so a file named after a concept ranks above one
+that merely mentions it.
+
+BM25 only matches whole tokens, so results are blended with a trigram score
+on file names: "authentication" in an issue still surfaces `auth.py`.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import sqlite3
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+
+from devlution.tools import file_editor, repo_index
+from devlution.tools.symbol_index import identifier_parts
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+DEFAULT_EXTENSIONS = [
+    ".py", ".ts", ".tsx", ".js", ".jsx", ".go", ".java", ".md", ".rst",
+    ".toml", ".yaml", ".yml", ".json", ".cfg", ".ini", ".sql", ".html", ".css",
+]
+
+# BM25 parameters (the usual defaults).
+K1 = 1.2
+B = 0.75
+
+# Times each path token is counted, relative to one occurrence in the body.
+PATH_BOOST = 3
+# Only the head of a file is indexed; enough to capture imports, docstrings and names.
+MAX_BYTES = 64 * 1024
+# Weight of the file-name trigram score next to the (max-normalized) BM25 score.
+TRIGRAM_WEIGHT = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    path TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    path TEXT NOT NULL,
+    tf INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_postings_term ON postings (term);
+CREATE INDEX IF NOT EXISTS idx_postings_path ON postings (path);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def trigrams(text: str) -> set[str]:
+    """Character trigrams of `text` (the whole text when shorter than three)."""
+    text = text.lower()
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _tokenize_file(root: str, path: str) -> Counter[str]:
+    """Process-pool worker: term counts for one file, path tokens boosted.
+
+    Binary files contribute their path tokens only.
+    """
+    counts: Counter[str] = Counter()
+    for _ in range(PATH_BOOST):
+        counts.update(identifier_parts(path))
+    try:
+        with open(Path(root) / path, "rb") as f:
+            head = f.read(MAX_BYTES)
+    except OSError:
+        return counts
+    if b"\0" not in head:
+        counts.update(identifier_parts(head.decode(errors="replace")))
+    return counts
+
+
+class SearchIndex:
+    """BM25 + file-name trigram search over the files under `root`."""
+
+    def __init__(
+        self,
+        root: str | Path = ".",
+        index_dir: str | Path = ".devlution/index",
+        extensions: list[str] | None = None,
+        workers: int = 0,
+    ):
+        self.root = Path(root)
+        index_dir = Path(index_dir)
+        self.index_dir = index_dir if index_dir.is_absolute() else self.root / index_dir
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.index_dir / "search.db"
+        self.extensions = extensions if extensions is not None else DEFAULT_EXTENSIONS
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.executescript(_SCHEMA)
+        self._check_version()
+
+    def _check_version(self) -> None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row and row[0] == str(INDEX_VERSION):
+            return
+        with self._transaction() as cur:
+            cur.execute("DELETE FROM postings")
+            cur.execute("DELETE FROM docs")
+            cur.execute(
+                "INSERT INTO meta (key, value) VALUES ('version', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(INDEX_VERSION),),
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                yield cur
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def refresh(self) -> int:
+        """Re-tokenize new or changed files and drop deleted ones; return the count."""
+        files = file_editor.list_files(str(self.root), self.extensions, repo_index.SKIP_DIRS)
+        current: dict[str, str] = {}
+        for path in files:
+            key = repo_index.stat_key(self.root / path)
+            if key is not None:
+                current[path] = key
+        with self._lock:
+            stored = dict(self._conn.execute("SELECT path, key FROM docs").fetchall())
+        changed, removed = repo_index.diff_keys(stored, current)
+        if not changed and not removed:
+            return 0
+
+        tokenized = repo_index.parse_files(_tokenize_file, self.root, changed, self.workers)
+        with self._transaction() as cur:
+            for path in [*removed, *changed]:
+                cur.execute("DELETE FROM postings WHERE path = ?", (path,))
+                cur.execute("DELETE FROM docs WHERE path = ?", (path,))
+            for path, counts in tokenized:
+                cur.execute(
+                    "INSERT INTO docs (path, key, length) VALUES (?, ?, ?)",
+                    (path, current[path], sum(counts.values())),
+                )
+                cur.executemany(
+                    "INSERT INTO postings (term, path, tf) VALUES (?, ?, ?)",
+                    [(term, path, tf) for term, tf in counts.items()],
+                )
+        logger.debug("Search index: %d changed, %d removed", len(changed), len(removed))
+        return len(changed) + len(removed)
+
+    def search(self, text: str, top_k: int = 10) -> list[tuple[str, float]]:
+        """Files best matching `text`, highest score first."""
+        terms = set(identifier_parts(text))
+        if not terms or top_k <= 0:
+            return []
+
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), SUM(length) FROM docs").fetchone()
+            if not count:
+                return []
+            lengths = dict(self._conn.execute("SELECT path, length FROM docs").fetchall())
+            postings = {
+                term: self._conn.execute(
+                    "SELECT path, tf FROM postings WHERE term = ?", (term,)
+                ).fetchall()
+                for term in terms
+            }
+
+        avgdl = (total or 0) / count or 1.0
+        bm25: dict[str, float] = {}
+        for rows in postings.values():
+            if not rows:
+                continue
+            idf = math.log(1 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+            for path, tf in rows:
+                norm = tf + K1 * (1 - B + B * lengths[path] / avgdl)
+                bm25[path] = bm25.get(path, 0.0) + idf * tf * (K1 + 1) / norm
+
+        top = max(bm25.values(), default=0.0) or 1.0
+        scores = {path: score / top for path, score in bm25.items()}
+        query_grams = set().union(*(trigrams(term) for term in terms))
+        for path in lengths:
+            name = trigrams(PurePosixPath(path).stem)
+            if len(name) < 2:
+                continue
+            overlap = len(name & query_grams) / len(name)
+            if overlap >= 0.5:
+                scores[path] = scores.get(path, 0.0) + TRIGRAM_WEIGHT * overlap
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k]
@@ -2,15 +2,94 @@
 
 Wraps common tools (ruff, eslint, mypy, tsc) and parses their output
 into structured findings for the Coder Agent's iteration loop.
+
+With an `AnalysisCache`, findings are stored per file under a key made of
+the file's content key (`repo_index.content_keys`) and a fingerprint of the
+tool (command, version, config files). Linting then re-runs only on files
+whose key changed and merges the cached findings of the rest. Type errors
+depend on other files, so a type check is skipped only when no file in
+scope changed.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import re
-from dataclasses import dataclass, field
+import shlex
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
 
+from devlution.tools import repo_index
 from devlution.tools.code_executor import ExecutionResult, run_command
 
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# Source files each tool checks; commands running other tools are not cached.
+TOOL_SUFFIXES: dict[str, tuple[str, ...]] = {
+    "ruff": (".py", ".pyi"),
+    "flake8": (".py",),
+    "pylint": (".py",),
+    "mypy": (".py", ".pyi"),
+    "pyright": (".py", ".pyi"),
+    "eslint": (".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"),
+    "tsc": (".ts", ".tsx"),
+    "golangci-lint": (".go",),
+}
+
+# Files whose contents change what the tools report.
+CONFIG_FILES = (
+    "pyproject.toml",
+    "setup.cfg",
+    "tox.ini",
+    "ruff.toml",
+    ".ruff.toml",
+    ".flake8",
+    ".pylintrc",
+    "mypy.ini",
+    ".mypy.ini",
+    "pyrightconfig.json",
+    "package.json",
+    "tsconfig.json",
+    ".eslintrc",
+    ".eslintrc.js",
+    ".eslintrc.json",
+    ".eslintrc.yml",
+    "eslint.config.js",
+    "eslint.config.mjs",
+    ".golangci.yml",
+)
+
+# Added when a command is narrowed to changed files, so that files passed
+# explicitly are still subject to the tool's configured excludes.
+NARROW_ARGS: dict[str, list[str]] = {"ruff": ["--force-exclude"]}
+
+# Above this many changed files the configured command is run unchanged.
+MAX_NARROWED_FILES = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    key TEXT NOT NULL,
+    findings TEXT NOT NULL,
+    PRIMARY KEY (kind, path)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_versions: dict[tuple[str, ...], str] = {}
+
 
 @dataclass
 class Finding:
@@ -28,10 +107,106 @@ class AnalysisResult:
     success: bool
     findings: list[Finding] = field(default_factory=list)
     raw_output: str = ""
+    cached_files: int = 0  # files whose findings came from the cache
+
+
+class AnalysisCache:
+    """Per-file findings of lint and type-check runs, stored under `index_dir`.
+
+    Rows are keyed by `(kind, path)`; a row is valid while its key (tool
+    fingerprint plus content key) matches the file and tool as they are now.
+    """
+
+    def __init__(self, root: str | Path = ".", index_dir: str | Path = ".devlution/index"):
+        self.root = Path(root)
+        index_dir = Path(index_dir)
+        self.index_dir = index_dir if index_dir.is_absolute() else self.root / index_dir
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.index_dir / "analysis.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.executescript(_SCHEMA)
+        self._check_version()
+
+    def _check_version(self) -> None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row and row[0] == str(CACHE_VERSION):
+            return
+        with self._transaction() as cur:
+            cur.execute("DELETE FROM results")
+            cur.execute(
+                "INSERT INTO meta (key, value) VALUES ('version', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(CACHE_VERSION),),
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                yield cur
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, kind: str, keys: dict[str, str]) -> dict[str, list[Finding]]:
+        """Cached findings of the files in `keys` whose stored key still matches."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, key, findings FROM results WHERE kind = ?", (kind,)
+            ).fetchall()
+        return {
+            path: [Finding(**f) for f in json.loads(findings)]
+            for path, key, findings in rows
+            if keys.get(path) == key
+        }
+
+    def paths(self, kind: str) -> set[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT path FROM results WHERE kind = ?", (kind,)).fetchall()
+        return {path for (path,) in rows}
+
+    def store(
+        self,
+        kind: str,
+        keys: dict[str, str],
+        findings: dict[str, list[Finding]],
+        drop: set[str] | None = None,
+    ) -> None:
+        """Save the findings of every file in `keys` (none = clean) and forget `drop`."""
+        with self._transaction() as cur:
+            cur.executemany(
+                "DELETE FROM results WHERE kind = ? AND path = ?",
+                [(kind, path) for path in drop or ()],
+            )
+            cur.executemany(
+                "INSERT INTO results (kind, path, key, findings) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(kind, path) DO UPDATE SET "
+                "key = excluded.key, findings = excluded.findings",
+                [
+                    (kind, path, key, json.dumps([asdict(f) for f in findings.get(path, [])]))
+                    for path, key in keys.items()
+                ],
+            )
 
 
-def run_lint(lint_command: str, cwd: str = ".") -> AnalysisResult:
+def run_lint(
+    lint_command: str, cwd: str = ".", cache: AnalysisCache | None = None
+) -> AnalysisResult:
     """Run a lint command and parse the output into findings."""
+    if cache is not None:
+        cached = _run_cached("lint", lint_command, cwd, 60, cache, per_file=True)
+        if cached is not None:
+            return cached
     result = run_command(lint_command, cwd=cwd, timeout=60)
     findings = _parse_lint_output(result)
     return AnalysisResult(
@@ -42,8 +217,14 @@ def run_lint(lint_command: str, cwd: str = ".") -> AnalysisResult:
     )
 
 
-def run_typecheck(typecheck_command: str, cwd: str = ".") -> AnalysisResult:
+def run_typecheck(
+    typecheck_command: str, cwd: str = ".", cache: AnalysisCache | None = None
+) -> AnalysisResult:
     """Run a type checker and parse the output."""
+    if cache is not None:
+        cached = _run_cached("typecheck", typecheck_command, cwd, 120, cache, per_file=False)
+        if cached is not None:
+            return cached
     result = run_command(typecheck_command, cwd=cwd, timeout=120)
     findings = _parse_lint_output(result)
     return AnalysisResult(
@@ -54,6 +235,119 @@ def run_typecheck(typecheck_command: str, cwd: str = ".") -> AnalysisResult:
     )
 
 
+def _tool_index(tokens: list[str]) -> int | None:
+    """Position of the known tool in a command (after `uv run`, `npx`, `python -m`, ...)."""
+    for i, token in enumerate(tokens):
+        if Path(token).name in TOOL_SUFFIXES:
+            return i
+    return None
+
+
+def tool_fingerprint(command: str, cwd: str = ".") -> str:
+    """Hash of the command, the tool's `--version` output and the config files under `cwd`.
+
+    Config files in subdirectories count too: a nested `pyproject.toml` or
+    `ruff.toml` changes what the tool reports for the files below it.
+    """
+    tokens = shlex.split(command)
+    index = _tool_index(tokens)
+    prefix = tuple(tokens[: index + 1]) if index is not None else tuple(tokens[:1])
+    if (*prefix, cwd) not in _versions:
+        result = run_command([*prefix, "--version"], cwd=cwd, timeout=30)
+        _versions[(*prefix, cwd)] = (result.stdout or result.stderr).strip()
+    digest = hashlib.sha256(f"{command}\0{_versions[(*prefix, cwd)]}".encode())
+    configs = repo_index.content_keys(cwd, CONFIG_FILES)
+    for path in sorted(configs):
+        if Path(path).name in CONFIG_FILES:
+            digest.update(f"\0{path}\0{configs[path]}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _targets(tokens: list[str], start: int, cwd: Path) -> list[int]:
+    """Positions of the directory arguments (`.`, `src/`) that scope the run."""
+    return [
+        i
+        for i in range(start, len(tokens))
+        if not tokens[i].startswith("-") and (cwd / tokens[i]).is_dir()
+    ]
+
+
+def _under(path: str, dirs: list[str]) -> bool:
+    for directory in dirs:
+        prefix = Path(directory).as_posix().strip("/")
+        if prefix == "." or path.startswith(prefix + "/"):
+            return True
+    return False
+
+
+def _relative(path: str, root: Path) -> str:
+    candidate = Path(path)
+    if candidate.is_absolute():
+        try:
+            return candidate.resolve().relative_to(root).as_posix()
+        except (OSError, ValueError):
+            return path
+    return candidate.as_posix()
+
+
+def _run_cached(
+    kind: str,
+    command: str,
+    cwd: str,
+    timeout: int,
+    cache: AnalysisCache,
+    per_file: bool,
+) -> AnalysisResult | None:
+    """Run `command` on the files whose findings are not cached; None if it can't be cached."""
+    tokens = shlex.split(command)
+    index = _tool_index(tokens)
+    if index is None:
+        return None
+    root = Path(cwd).resolve()
+    targets = _targets(tokens, index + 1, root)
+
+    keys = repo_index.content_keys(root, TOOL_SUFFIXES[Path(tokens[index]).name])
+    if targets:
+        dirs = [tokens[i] for i in targets]
+        keys = {path: key for path, key in keys.items() if _under(path, dirs)}
+    fingerprint = tool_fingerprint(command, cwd)
+    keys = {path: f"{fingerprint}:{key}" for path, key in keys.items()}
+
+    stored = cache.paths(kind)
+    hits = cache.lookup(kind, keys)
+    changed = sorted(set(keys) - set(hits))
+    if not per_file and (changed or stored != set(keys)):
+        changed, hits = sorted(keys), {}
+
+    run_cmd = command
+    if per_file and targets and hits and len(changed) <= MAX_NARROWED_FILES:
+        kept = [t for i, t in enumerate(tokens) if i not in targets]
+        run_cmd = shlex.join(kept + NARROW_ARGS.get(Path(tokens[index]).name, []) + changed)
+    elif changed:
+        changed, hits = sorted(keys), {}
+
+    by_file: dict[str, list[Finding]] = {}
+    result = ExecutionResult(success=True, stdout="", stderr="", returncode=0)
+    if changed:
+        result = run_command(run_cmd, cwd=cwd, timeout=timeout)
+        for finding in _parse_lint_output(result):
+            finding.file = _relative(finding.file, root)
+            by_file.setdefault(finding.file, []).append(finding)
+        # A tool that failed without findings (crash, bad config) is not cached.
+        if result.success or by_file:
+            cache.store(kind, {p: keys[p] for p in changed}, by_file, stored - set(keys))
+        logger.info("[%s] %d files checked, %d from cache", kind, len(changed), len(hits))
+
+    cached_findings = [f for path in sorted(hits) for f in hits[path]]
+    return AnalysisResult(
+        tool=kind,
+        success=result.success and not cached_findings,
+        findings=cached_findings + [f for path in sorted(by_file) for f in by_file[path]],
+        raw_output=result.stdout + result.stderr,
+        cached_files=len(hits),
+    )
+
+
 # Matches patterns like: file.py:10:5: E501 line too long
 _LINT_PATTERN = re.compile(
     r"^(?P<file>[^:]+):(?P<line>\d+):(?P<col>\d+):\s*(?P<code>\S+)\s+(?P<msg>.+)$",
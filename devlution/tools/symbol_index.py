@@ -0,0 +1,403 @@
+"""Persistent symbol index for targeted prompt context.
+
+Python sources are parsed with `ast` into functions, classes and methods with
+their line ranges and the names they call. The index is stored in SQLite under
+`.devlution/index/` and refreshed incrementally through `repo_index`: only
+files whose git blob hash (or, when dirty, size and mtime) changed are
+re-parsed.
+
+Agents use `excerpt()` to send the parts of a large file that matter for a
+task (symbols matching the task's terms or a traceback's lines, plus their
+callers) instead of the first few thousand characters.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from devlution.tools import repo_index
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    name TEXT NOT NULL,
+    short_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    calls TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_symbols_file ON symbols (file);
+CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS idx_symbols_short_name ON symbols (short_name);
+CREATE TABLE IF NOT EXISTS calls (
+    symbol_id INTEGER NOT NULL,
+    callee TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_calls_callee ON calls (callee);
+CREATE INDEX IF NOT EXISTS idx_calls_symbol ON calls (symbol_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+# `File "pkg/mod.py", line 12` (tracebacks) and `pkg/mod.py:12:` (pytest, linters)
+_TRACE_LINE = re.compile(r'File "(?P<a>[^"]+)", line (?P<la>\d+)|(?P<b>[\w./-]+\.py):(?P<lb>\d+)')
+
+
+@dataclass
+class Symbol:
+    name: str  # qualified within the module, e.g. "Parser.feed"
+    kind: str  # function | class | method
+    file: str
+    start: int
+    end: int
+    calls: list[str] = field(default_factory=list)
+
+    @property
+    def short_name(self) -> str:
+        return self.name.rsplit(".", 1)[-1]
+
+
+def _called_names(node: ast.AST) -> list[str]:
+    names: set[str] = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            func = child.func
+            if isinstance(func, ast.Name):
+                names.add(func.id)
+            elif isinstance(func, ast.Attribute):
+                names.add(func.attr)
+    return sorted(names)
+
+
+def parse_symbols(source: str, file: str) -> list[Symbol]:
+    """Extract top-level functions, classes and their methods from Python source."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        logger.debug("Cannot parse %s: %s", file, e)
+        return []
+
+    symbols: list[Symbol] = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(_symbol(node, node.name, "function", file))
+        elif isinstance(node, ast.ClassDef):
+            symbols.append(_symbol(node, node.name, "class", file))
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    symbols.append(_symbol(item, f"{node.name}.{item.name}", "method", file))
+    return symbols
+
+
+_Definition = ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef
+
+
+def _start(node: _Definition) -> int:
+    """First line of a definition, including its decorators."""
+    return min([node.lineno] + [d.lineno for d in node.decorator_list])
+
+
+def _symbol(node: _Definition, name: str, kind: str, file: str) -> Symbol:
+    return Symbol(name, kind, file, _start(node), node.end_lineno or 0, _called_names(node))
+
+
+def _parse_file(root: str, file: str) -> list[Symbol]:
+    """Process-pool worker: parse one file relative to `root`."""
+    try:
+        source = (Path(root) / file).read_text(errors="replace")
+    except OSError:
+        return []
+    return parse_symbols(source, file)
+
+
+def identifier_parts(text: str) -> list[str]:
+    """Lower-cased identifier parts (snake and camel case split) of length >= 3, in order."""
+    return [
+        part
+        for word in _WORD.findall(text)
+        for part in _CAMEL.sub("_", word).lower().split("_")
+        if len(part) >= 3
+    ]
+
+
+def terms_from_text(text: str) -> set[str]:
+    """Distinct `identifier_parts` of `text`."""
+    return set(identifier_parts(text))
+
+
+def traceback_lines(text: str, files: list[str]) -> dict[str, set[int]]:
+    """Line numbers that a traceback or test log points at, per file in `files`.
+
+    Log paths may be absolute or relative to another directory, so they are
+    matched to `files` by suffix.
+    """
+    lines: dict[str, set[int]] = {}
+    for match in _TRACE_LINE.finditer(text):
+        path = match.group("a") or match.group("b")
+        line = int(match.group("la") or match.group("lb"))
+        for fpath in files:
+            if path == fpath or path.endswith("/" + fpath.lstrip("./")):
+                lines.setdefault(fpath, set()).add(line)
+    return lines
+
+
+class SymbolIndex:
+    """Symbols of every Python file under `root`, persisted under `index_dir`.
+
+    Stored in SQLite (`symbols.db`) so opening the index and checking it for
+    changes does not load every symbol: `refresh()` compares the stored
+    content keys with `repo_index.content_keys()` and re-parses only the files
+    whose key differs.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = ".",
+        index_dir: str | Path = ".devlution/index",
+        workers: int = 0,
+    ):
+        self.root = Path(root)
+        index_dir = Path(index_dir)
+        self.index_dir = index_dir if index_dir.is_absolute() else self.root / index_dir
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.index_dir / "symbols.db"
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.executescript(_SCHEMA)
+        self._check_version()
+
+    def _check_version(self) -> None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row and row[0] == str(INDEX_VERSION):
+            return
+        with self._transaction() as cur:
+            for table in ("calls", "symbols", "files"):
+                cur.execute(f"DELETE FROM {table}")
+            cur.execute(
+                "INSERT INTO meta (key, value) VALUES ('version', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(INDEX_VERSION),),
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                yield cur
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def refresh(self, files: list[str] | None = None) -> int:
+        """Re-parse files whose content key changed; return how many changed.
+
+        Without `files`, the whole tree is compared and deleted files are
+        dropped; with `files`, only those paths are checked.
+        """
+        current = repo_index.content_keys(self.root, (".py",), files)
+        with self._lock:
+            if files is None:
+                rows = self._conn.execute("SELECT path, key FROM files").fetchall()
+            else:
+                marks = ",".join("?" * len(files))
+                rows = self._conn.execute(
+                    f"SELECT path, key FROM files WHERE path IN ({marks})", files
+                ).fetchall()
+        changed, removed = repo_index.diff_keys(dict(rows), current)
+        if not changed and not removed:
+            return 0
+
+        parsed = repo_index.parse_files(_parse_file, self.root, changed, self.workers)
+        with self._transaction() as cur:
+            for path in [*removed, *changed]:
+                self._delete(cur, path)
+            for path, symbols in parsed:
+                cur.execute("INSERT INTO files (path, key) VALUES (?, ?)", (path, current[path]))
+                for s in symbols:
+                    cur.execute(
+                        "INSERT INTO symbols (file, name, short_name, kind, start_line, end_line, "
+                        "calls) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (path, s.name, s.short_name, s.kind, s.start, s.end, json.dumps(s.calls)),
+                    )
+                    cur.executemany(
+                        "INSERT INTO calls (symbol_id, callee) VALUES (?, ?)",
+                        [(cur.lastrowid, callee) for callee in s.calls],
+                    )
+        logger.debug("Symbol index: %d changed, %d removed", len(changed), len(removed))
+        return len(changed) + len(removed)
+
+    @staticmethod
+    def _delete(cur: sqlite3.Cursor, path: str) -> None:
+        cur.execute(
+            "DELETE FROM calls WHERE symbol_id IN (SELECT id FROM symbols WHERE file = ?)", (path,)
+        )
+        cur.execute("DELETE FROM symbols WHERE file = ?", (path,))
+        cur.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _query(self, where: str = "", params: tuple[Any, ...] = ()) -> list[Symbol]:
+        sql = "SELECT name, kind, file, start_line, end_line, calls FROM symbols s"
+        if where:
+            sql += " WHERE " + where
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY file, start_line, id", params).fetchall()
+        return [Symbol(n, k, f, a, b, json.loads(c)) for n, k, f, a, b, c in rows]
+
+    def symbols(self, file: str | None = None) -> list[Symbol]:
+        """Indexed symbols of one file, or of every file."""
+        if file is None:
+            return self._query()
+        return self._query("file = ?", (file,))
+
+    def find(self, name: str) -> list[Symbol]:
+        """Symbols whose qualified or short name equals `name`."""
+        return self._query("name = ? OR short_name = ?", (name, name))
+
+    def callers_of(self, symbol: Symbol) -> list[Symbol]:
+        """Functions and methods that call `symbol` by name (a static approximation)."""
+        return self._query(
+            "kind != 'class' AND NOT (file = ? AND name = ?) "
+            "AND id IN (SELECT symbol_id FROM calls WHERE callee = ?)",
+            (symbol.file, symbol.name, symbol.short_name),
+        )
+
+    def relevant_symbols(
+        self, file: str, terms: set[str], lines: set[int] | None = None
+    ) -> list[Symbol]:
+        """Symbols in `file` that contain a line of interest or match the terms.
+
+        Traceback lines rank first, then symbols by how many terms their name shares.
+        """
+        lines = lines or set()
+        scored: list[tuple[int, Symbol]] = []
+        for symbol in self.symbols(file):
+            if symbol.kind == "class":
+                continue
+            hit = any(symbol.start <= line <= symbol.end for line in lines)
+            overlap = len(terms_from_text(symbol.name) & terms)
+            if hit or overlap:
+                scored.append((100 * hit + overlap, symbol))
+        scored.sort(key=lambda item: (-item[0], item[1].start))
+        return [symbol for _, symbol in scored]
+
+    def excerpt(
+        self,
+        file: str,
+        terms: set[str],
+        max_chars: int = 4000,
+        lines: set[int] | None = None,
+    ) -> tuple[str, list[Symbol]]:
+        """Return the parts of `file` relevant to `terms`/`lines`, within `max_chars`.
+
+        Small files are returned whole. Otherwise the module header (imports)
+        is kept and relevant symbols are added in source order with line-range
+        markers. Also returns the selected symbols so callers can be looked up.
+        Falls back to the head of the file when nothing matches.
+        """
+        source = (self.root / file).read_text(errors="replace")
+        if len(source) <= max_chars:
+            return source, []
+
+        if file.endswith(".py"):
+            self.refresh([file])
+        source_lines = source.splitlines()
+        symbols = self.symbols(file)
+        header_end = min((s.start for s in symbols), default=len(source_lines) + 1) - 1
+        header = "\n".join(source_lines[: min(header_end, 40)])
+
+        budget = max_chars - len(header)
+        chosen: list[Symbol] = []
+        for symbol in self.relevant_symbols(file, terms, lines):
+            size = sum(len(line) + 1 for line in source_lines[symbol.start - 1 : symbol.end])
+            if size > budget:
+                continue
+            if any(c.start <= symbol.start and symbol.end <= c.end for c in chosen):
+                continue
+            chosen.append(symbol)
+            budget -= size + 40
+
+        if not chosen:
+            return source[:max_chars], []
+
+        parts = [header] if header.strip() else []
+        for symbol in sorted(chosen, key=lambda s: s.start):
+            body = "\n".join(source_lines[symbol.start - 1 : symbol.end])
+            parts.append(f"# ... lines {symbol.start}-{symbol.end} ({symbol.name})\n{body}")
+        return "\n\n".join(parts), chosen
+
+    def snippet(self, symbol: Symbol, max_chars: int = 1500) -> str:
+        """Source of one symbol, truncated to `max_chars`."""
+        try:
+            source_lines = (self.root / symbol.file).read_text(errors="replace").splitlines()
+        except OSError:
+            return ""
+        return "\n".join(source_lines[symbol.start - 1 : symbol.end])[:max_chars]
+
+
+def select_context(
+    index: SymbolIndex,
+    files: list[str],
+    terms: set[str],
+    max_chars: int = 4000,
+    lines: dict[str, set[int]] | None = None,
+    max_callers: int = 5,
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Excerpts of `files` plus source of callers of the selected symbols.
+
+    Returns `(contents, callers)`: `contents` maps each existing file to its
+    excerpt, `callers` maps `"file: Symbol"` labels to caller source.
+    Missing files are left out of `contents`.
+    """
+    lines = lines or {}
+    contents: dict[str, str] = {}
+    chosen: list[Symbol] = []
+    for fpath in files:
+        try:
+            contents[fpath], selected = index.excerpt(fpath, terms, max_chars, lines.get(fpath))
+        except (FileNotFoundError, IsADirectoryError):
+            continue
+        chosen.extend(selected)
+
+    callers: dict[str, str] = {}
+    seen = {(s.file, s.name) for s in chosen}
+    for symbol in chosen:
+        for caller in index.callers_of(symbol):
+            if len(callers) >= max_callers:
+                return contents, callers
+            if (caller.file, caller.name) in seen:
+                continue
+            seen.add((caller.file, caller.name))
+            callers[f"{caller.file}: {caller.name}"] = index.snippet(caller)
+    return contents, callers
@@ -0,0 +1,141 @@
+"""Test impact analysis: run only the tests that exercise changed files.
+
+The map from source files to the test files that execute them is derived
+from coverage.py's per-test contexts (`pytest --cov-context=test`), read
+straight from the `.coverage` SQLite database, and stored as JSON under
+`.devlution/`. Every tester run with impact analysis enabled collects these
+contexts, so a full run builds the map and a subset run refreshes the
+entries for the tests it ran.
+
+Selection is conservative: any changed file the map cannot account for
+(a new or uncovered module, conftest, configuration) means the full suite.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+from pathlib import Path, PurePosixPath
+
+logger = logging.getLogger(__name__)
+
+MAP_VERSION = 1
+
+# Added to the pytest command so the run records which test touched which file.
+COVERAGE_ARGS = "--cov=. --cov-context=test --cov-report="
+
+_DIFF_PATH = re.compile(r"^diff --git a/(?P<a>\S+) b/(?P<b>\S+)", re.MULTILINE)
+
+
+def is_test_file(path: str) -> bool:
+    """pytest's default test file naming: `test_*.py` or `*_test.py`."""
+    name = PurePosixPath(path).name
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def changed_files_from_diff(diff_text: str) -> list[str]:
+    """Paths touched by a `git diff` (both sides of renames)."""
+    paths: set[str] = set()
+    for match in _DIFF_PATH.finditer(diff_text):
+        paths.update((match.group("a"), match.group("b")))
+    return sorted(paths)
+
+
+def read_coverage_contexts(db_path: str | Path, root: str | Path) -> dict[str, set[str]]:
+    """Map each measured file under `root` to the test files whose contexts ran it.
+
+    Contexts look like `tests/test_x.py::TestY::test_z|run`; the empty
+    context (code run at import/collection time) is ignored.
+    """
+    root = Path(root).resolve()
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT file.path, context.context FROM line_bits "
+            "JOIN file ON file.id = line_bits.file_id "
+            "JOIN context ON context.id = line_bits.context_id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    tests_by_file: dict[str, set[str]] = {}
+    for path, context in rows:
+        test_file = context.split("::", 1)[0]
+        if not test_file or test_file == context:
+            continue
+        try:
+            rel = Path(path).resolve().relative_to(root).as_posix()
+        except ValueError:
+            continue
+        tests_by_file.setdefault(rel, set()).add(test_file)
+    return tests_by_file
+
+
+class ImpactMap:
+    """Source file → test files map persisted as JSON."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.files: dict[str, list[str]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") == MAP_VERSION:
+            self.files = data.get("files", {})
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": MAP_VERSION, "files": self.files}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Failed to write test impact map %s: %s", self.path, e)
+            Path(tmp).unlink(missing_ok=True)
+
+    def select(
+        self, changed: list[str], root: str | Path | None = None
+    ) -> list[str] | None:
+        """Test files to run for `changed`, or None when the full suite is needed.
+
+        With `root`, test files that no longer exist there (deleted, or the old
+        side of a rename) are dropped, since pytest rejects missing paths.
+        """
+        if not self.files or not changed:
+            return None
+        selected: set[str] = set()
+        for path in changed:
+            if is_test_file(path):
+                selected.add(path)
+            elif self.files.get(path):
+                selected.update(self.files[path])
+            else:
+                logger.info("Test impact map has no entry for %s; running full suite", path)
+                return None
+        if root is not None:
+            selected = {test for test in selected if (Path(root) / test).is_file()}
+            if not selected:
+                return None
+        return sorted(selected)
+
+    def update(self, coverage: dict[str, set[str]], ran: list[str] | None) -> None:
+        """Merge coverage from a run of `ran` test files (None = the full suite)."""
+        if ran is None:
+            self.files = {path: sorted(tests) for path, tests in coverage.items()}
+            return
+        rerun = set(ran)
+        merged: dict[str, set[str]] = {
+            path: set(tests) - rerun for path, tests in self.files.items()
+        }
+        for path, tests in coverage.items():
+            merged.setdefault(path, set()).update(tests)
+        self.files = {path: sorted(tests) for path, tests in merged.items() if tests}
@@ -0,0 +1,448 @@
+"""Warm pytest worker: a long-lived process that runs test selections on request.
+
+Starting pytest pays for interpreter start-up, plugin loading and the
+project's imports on every run. The worker pays that once per worktree: it
+imports the modules the test suite imports, then listens on a Unix socket.
+Each request is served by a `fork()` of the warm process that runs
+`pytest.main()` and streams its output back line by line, so runs are
+isolated from each other and from the parent while sharing the
+already-imported modules. The client feeds those lines through the same
+bounded capture (and spill file) as a subprocess run.
+
+Before each run the worker checks the project modules it has loaded; if one
+changed on disk it answers `stale` and exits, and the client starts a fresh
+worker. POSIX only (`fork` and `AF_UNIX`); elsewhere `get_test_worker`
+returns None and callers run pytest as a subprocess.
+
+Run as `python -m devlution.tools.test_worker --socket PATH --root DIR`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import atexit
+import hashlib
+import importlib
+import json
+import logging
+import os
+import select
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any
+
+from devlution.tools.code_executor import (
+    DEFAULT_TIMEOUT,
+    ExecutionResult,
+    LineHandler,
+    OutputCapture,
+)
+
+logger = logging.getLogger(__name__)
+
+START_TIMEOUT = 120  # preloading a large project can take a while
+_PYTEST = ("pytest", "py.test")
+_THIRD_PARTY_DIRS = ("site-packages", "dist-packages", "/.venv/", "/venv/", "/.tox/")
+_MAX_LINE_BYTES = 64 * 1024
+_DRAIN_SECONDS = 5  # output still in the pipes after pytest returns
+
+
+class WorkerError(Exception):
+    """The warm worker could not be started or did not answer."""
+
+
+def pytest_args(test_command: str) -> list[str] | None:
+    """Arguments after `pytest` / `python -m pytest`; None for any other command."""
+    try:
+        tokens = shlex.split(test_command)
+    except ValueError:
+        return None
+    if tokens and Path(tokens[0]).name in _PYTEST:
+        return tokens[1:]
+    if len(tokens) >= 3 and Path(tokens[0]).name.startswith("python") and tokens[1:3] == [
+        "-m",
+        "pytest",
+    ]:
+        return tokens[3:]
+    return None
+
+
+# --- server side -------------------------------------------------------------
+
+
+def _is_test_module(path: Path) -> bool:
+    name = path.name
+    return name == "conftest.py" or name.startswith("test_") or name.endswith("_test.py")
+
+
+def preload_modules(root: Path) -> list[str]:
+    """Absolute imports made by the test suite, excluding the test modules themselves."""
+    from devlution.tools import file_editor, repo_index
+
+    test_names: set[str] = set()
+    imports: set[str] = set()
+    for rel in file_editor.list_files(str(root), [".py"], repo_index.SKIP_DIRS):
+        path = root / rel
+        if not _is_test_module(path):
+            continue
+        test_names.add(path.stem)
+        try:
+            tree = ast.parse(path.read_text(errors="replace"))
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                imports.add(node.module)
+    return sorted(
+        name
+        for name in imports
+        if name.split(".")[0] not in test_names and name.split(".")[0] != "tests"
+    )
+
+
+def _project_module_mtimes(root: Path) -> dict[str, int]:
+    """mtime of every loaded module file that belongs to the project under `root`."""
+    prefix = str(root) + os.sep
+    mtimes: dict[str, int] = {}
+    for module in list(sys.modules.values()):
+        file = getattr(module, "__file__", None)
+        if not file or not file.startswith(prefix) or any(d in file for d in _THIRD_PARTY_DIRS):
+            continue
+        try:
+            mtimes[file] = os.stat(file).st_mtime_ns
+        except OSError:
+            mtimes[file] = -1
+    return mtimes
+
+
+def _is_stale(snapshot: dict[str, int]) -> bool:
+    for file, mtime in snapshot.items():
+        try:
+            if os.stat(file).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def _send(conn: socket.socket, payload: dict[str, Any]) -> None:
+    conn.sendall(json.dumps(payload).encode() + b"\n")
+
+
+def _forward(conn: socket.socket, lock: threading.Lock, stream: str, fd: int) -> None:
+    """Send each line written to `fd` to the client as it arrives."""
+    with os.fdopen(fd, "rb") as pipe:
+        for raw in iter(lambda: pipe.readline(_MAX_LINE_BYTES), b""):
+            with lock:
+                _send(conn, {"stream": stream, "line": raw.decode(errors="replace")})
+
+
+def _run_child(conn: socket.socket, request: dict[str, Any]) -> None:
+    """In the forked child: run pytest with fds 1/2 streamed to the client."""
+    import pytest
+
+    # The server ignores SIGCHLD to auto-reap; tests need exit statuses back.
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    # A group of its own, so a timeout kills the run and everything it started.
+    os.setpgid(0, 0)
+    _send(conn, {"pid": os.getpid()})
+    os.chdir(request.get("cwd") or ".")
+    if request.get("env") is not None:
+        os.environ.clear()
+        os.environ.update(request["env"])
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    lock = threading.Lock()
+    forwarders: list[threading.Thread] = []
+    for fd, stream in ((1, "stdout"), (2, "stderr")):
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, fd)
+        os.close(write_fd)
+        forwarder = threading.Thread(
+            target=_forward, args=(conn, lock, stream, read_fd), daemon=True
+        )
+        forwarder.start()
+        forwarders.append(forwarder)
+    sys.stdout.reconfigure(line_buffering=True)  # type: ignore[union-attr]
+
+    try:
+        returncode = int(pytest.main(request["args"]))
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    # Close our ends of the pipes so the forwarders see EOF once any
+    # processes the tests left behind are done with them too.
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    for forwarder in forwarders:
+        forwarder.join(_DRAIN_SECONDS)
+    with lock:
+        _send(conn, {"returncode": returncode})
+
+
+def serve(socket_path: str, root: str, parent: int) -> None:
+    """Preload the project, then fork a pytest run for each request until stale."""
+    root_path = Path(root).resolve()
+    os.chdir(root_path)
+    sys.path[:0] = [str(root_path), str(root_path / "src")]
+
+    for name in preload_modules(root_path):
+        try:
+            importlib.import_module(name)
+        except Exception:
+            continue
+    try:
+        import pytest  # noqa: F401
+    except ImportError:
+        print("pytest is not importable", flush=True)
+        return
+    snapshot = _project_module_mtimes(root_path)
+
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # children are reaped automatically
+    Path(socket_path).unlink(missing_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    sock.listen()
+    sock.settimeout(1.0)
+    print("ready", flush=True)
+
+    try:
+        while os.getppid() == parent:
+            try:
+                conn, _ = sock.accept()
+            except TimeoutError:
+                continue
+            conn.settimeout(None)
+            with conn:
+                request = json.loads(conn.makefile("rb").readline() or b"{}")
+                if _is_stale(snapshot):
+                    _send(conn, {"stale": True})
+                    return
+                if os.fork() == 0:
+                    sock.close()
+                    try:
+                        _run_child(conn, request)
+                    finally:
+                        os._exit(0)
+    finally:
+        sock.close()
+        Path(socket_path).unlink(missing_ok=True)
+
+
+# --- client side -------------------------------------------------------------
+
+
+class WarmTestWorker:
+    """Client for (and owner of) the warm pytest worker of one worktree."""
+
+    def __init__(self, root: str | Path, python: str | None = None):
+        self.root = Path(root).resolve()
+        digest = hashlib.sha1(str(self.root).encode()).hexdigest()[:12]
+        # Under the temp dir: AF_UNIX paths are limited to ~100 characters.
+        name = f"devlution-tests-{os.getpid()}-{digest}.sock"
+        self.socket_path = Path(tempfile.gettempdir()) / name
+        self.python = python or sys.executable
+        self._proc: subprocess.Popen[str] | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        proc = subprocess.Popen(
+            [
+                self.python, "-m", "devlution.tools.test_worker",
+                "--socket", str(self.socket_path),
+                "--root", str(self.root),
+                "--parent", str(os.getpid()),
+            ],
+            cwd=self.root,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        assert proc.stdout is not None
+        # Preloaded modules may print; wait for the worker's own "ready" line.
+        deadline = time.monotonic() + START_TIMEOUT
+        line = ""
+        while line != "ready":
+            ready, _, _ = select.select([proc.stdout], [], [], max(0, deadline - time.monotonic()))
+            raw = proc.stdout.readline() if ready else ""
+            if not raw:
+                break
+            line = raw.strip()
+        if line != "ready":
+            proc.kill()
+            proc.wait()
+            raise WorkerError(f"test worker failed to start: {line or 'timed out'}")
+        self._proc = proc
+        logger.info("Started warm test worker for %s (pid %d)", self.root, proc.pid)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def _ensure_started(self) -> subprocess.Popen[str]:
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self.start()
+            assert self._proc is not None
+            return self._proc
+
+    def _restart(self, stale: subprocess.Popen[str]) -> None:
+        with self._lock:
+            if self._proc is stale:
+                self.close()
+
+    def run(
+        self,
+        args: list[str],
+        timeout: int = DEFAULT_TIMEOUT,
+        env: dict[str, str] | None = None,
+        on_line: LineHandler | None = None,
+        spill_dir: str | Path | None = None,
+    ) -> ExecutionResult:
+        """Run pytest with `args` in the worker, restarting it once if modules changed.
+
+        Output is captured as by `stream_command`: bounded text and failure
+        sections, each line passed to `on_line`, and a spill file in `spill_dir`.
+        """
+        for _ in range(2):
+            proc = self._ensure_started()
+            request = {"args": args, "cwd": str(self.root), "env": env}
+            response = self._request(request, timeout, on_line, spill_dir)
+            if response.get("stale"):
+                logger.info("Project modules changed; restarting warm test worker")
+                self._restart(proc)
+                continue
+            result: ExecutionResult = response["result"]
+            return result
+        raise WorkerError("test worker reported stale modules twice")
+
+    def _request(
+        self,
+        request: dict[str, Any],
+        timeout: int,
+        on_line: LineHandler | None,
+        spill_dir: str | Path | None,
+    ) -> dict[str, Any]:
+        deadline = time.monotonic() + timeout
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(self.socket_path))
+            _send(conn, request)
+            reader = conn.makefile("rb")
+
+            first: dict[str, Any] = json.loads(reader.readline() or b"{}")
+            if "pid" not in first:
+                if first.get("stale"):
+                    return first
+                raise WorkerError("test worker closed the connection")
+
+            capture = OutputCapture(on_line, spill_dir)
+            try:
+                while True:
+                    conn.settimeout(max(0.1, deadline - time.monotonic()))
+                    line = reader.readline()
+                    if not line:
+                        capture.result(-1)
+                        raise WorkerError("test run ended without a result")
+                    message = json.loads(line)
+                    if "returncode" in message:
+                        return {"result": capture.result(message["returncode"])}
+                    capture.feed(message["stream"], message["line"].encode())
+            except TimeoutError:
+                try:
+                    os.killpg(first["pid"], signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                logger.warning("Warm test run timed out after %ds", timeout)
+                note = f"Command timed out after {timeout}s"
+                return {"result": capture.result(-1, timed_out=True, note=note)}
+
+
+_workers: dict[Path, WarmTestWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_test_worker(root: str | Path) -> WarmTestWorker | None:
+    """Return the warm worker for the worktree at `root`; None where unsupported."""
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        return None
+    key = Path(root).resolve()
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = WarmTestWorker(key)
+            _workers[key] = worker
+        return worker
+
+
+def close_all() -> None:
+    """Stop every warm worker started by this process."""
+    with _workers_lock:
+        workers = list(_workers.values())
+    for worker in workers:
+        worker.close()
+
+
+atexit.register(close_all)
+
+
+def run_warm(
+    test_command: str,
+    cwd: str = ".",
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    on_line: LineHandler | None = None,
+    spill_dir: str | Path | None = None,
+) -> ExecutionResult | None:
+    """Run `test_command` in the warm worker of `cwd`.
+
+    Returns None when the command is not pytest or the worker is unavailable,
+    so the caller can fall back to a subprocess.
+    """
+    args = pytest_args(test_command)
+    worker = get_test_worker(cwd) if args is not None else None
+    if worker is None or args is None:
+        return None
+    try:
+        return worker.run(args, timeout, env, on_line, spill_dir)
+    except (OSError, WorkerError, ValueError) as e:
+        logger.warning("Warm test worker unavailable, running pytest directly: %s", e)
+        return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", required=True)
+    parser.add_argument("--root", required=True)
+    parser.add_argument("--parent", type=int, default=os.getppid())
+    args = parser.parse_args(argv)
+    serve(args.socket, args.root, args.parent)
+
+
+if __name__ == "__main__":
+    main()
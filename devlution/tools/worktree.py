@@ -0,0 +1,189 @@
+"""Pool of reusable git worktrees for isolated concurrent task execution.
+
+Each task runs in its own checkout under `.devlution/worktrees/`, so several
+tasks (or pipelines) can edit files, run tests and commit on one host without
+stepping on each other or cloning the repository again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from devlution.tools import git_ops
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Worktree:
+    path: str
+    last_task: str = ""
+    last_used: float = 0.0
+    in_use: bool = False
+    broken: bool = False
+
+
+class WorktreePool:
+    """Fixed-size pool of detached worktrees with least-recently-used reuse.
+
+    A worktree released by a task is handed back to the same task when it
+    asks again (keeping its in-progress changes); otherwise the least
+    recently used free worktree is reset and reused. A task that depends on
+    others starts from their snapshotted edits instead of `base_ref`, so its
+    patch applies on top of theirs. A worktree whose reset fails is marked
+    broken and never handed out again.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        root: str = ".devlution/worktrees",
+        repo: str = ".",
+        base_ref: str = "HEAD",
+    ):
+        self.size = max(1, size)
+        self.root = Path(root)
+        self.repo = repo
+        self.base_ref = base_ref
+        self._worktrees: list[Worktree] = []
+        self._snapshots: dict[str, str] = {}  # task ID -> commit of its released edits
+        self._cond = threading.Condition()
+        self._ready = False
+
+    def setup(self) -> None:
+        """Create any missing worktrees. Safe to call repeatedly."""
+        with self._cond:
+            if self._ready:
+                return
+
+            commit = git_ops.rev_parse(self.base_ref, cwd=self.repo)
+            if not commit:
+                raise RuntimeError(f"Cannot resolve base ref {self.base_ref!r} in {self.repo}")
+            self.base_ref = commit
+
+            git_ops.worktree_prune(cwd=self.repo)
+            self.root.mkdir(parents=True, exist_ok=True)
+
+            for i in range(self.size):
+                path = (self.root / f"wt-{i}").resolve()
+                if not (path / ".git").exists():
+                    result = git_ops.worktree_add(str(path), commit, cwd=self.repo)
+                    if not result.success:
+                        raise RuntimeError(f"git worktree add failed: {result.stderr}")
+                self._worktrees.append(Worktree(path=str(path)))
+
+            self._ready = True
+            logger.info("Worktree pool ready: %d checkouts at %s", self.size, commit[:12])
+
+    def acquire(
+        self,
+        task_id: str = "",
+        timeout: float | None = None,
+        depends_on: list[str] | None = None,
+    ) -> str:
+        """Check out a worktree for `task_id`, blocking until one is free.
+
+        A recycled worktree starts from the released edits of the tasks in
+        `depends_on` (merged together when there are several), or from
+        `base_ref` when none of them has been released yet.
+        """
+        self.setup()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                healthy = [w for w in self._worktrees if not w.broken]
+                if not healthy:
+                    raise RuntimeError("Every pooled worktree is broken")
+                free = [w for w in healthy if not w.in_use]
+                if free:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No free worktree available")
+                self._cond.wait(remaining)
+
+            same_task = [w for w in free if task_id and w.last_task == task_id]
+            worktree = same_task[0] if same_task else min(free, key=lambda w: w.last_used)
+            worktree.in_use = True
+            bases = [self._snapshots[t] for t in depends_on or [] if t in self._snapshots]
+
+        if not same_task:
+            try:
+                self._recycle(worktree, bases)
+            except BaseException:
+                logger.exception("Worktree %s could not be reset; retiring it", worktree.path)
+                with self._cond:
+                    worktree.broken = True
+                    worktree.in_use = False
+                    self._cond.notify_all()
+                raise
+        worktree.last_task = task_id
+        return worktree.path
+
+    def release(self, path: str) -> None:
+        """Return a worktree to the pool, snapshotting its task's edits."""
+        worktree = next((w for w in self._worktrees if w.path == path), None)
+        if worktree is None:
+            raise ValueError(f"Not a pooled worktree: {path}")
+
+        commit = ""
+        if worktree.last_task:
+            commit = git_ops.snapshot(f"devlution: task {worktree.last_task}", cwd=path)
+            if not commit:
+                logger.warning("Could not snapshot task %s in %s", worktree.last_task, path)
+
+        with self._cond:
+            if commit:
+                self._snapshots[worktree.last_task] = commit
+            worktree.in_use = False
+            worktree.last_used = time.monotonic()
+            self._cond.notify()
+
+    @contextmanager
+    def lease(
+        self,
+        task_id: str = "",
+        timeout: float | None = None,
+        depends_on: list[str] | None = None,
+    ) -> Iterator[str]:
+        """Context manager around acquire()/release()."""
+        path = self.acquire(task_id, timeout=timeout, depends_on=depends_on)
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def teardown(self) -> None:
+        """Remove every pooled worktree."""
+        with self._cond:
+            for worktree in self._worktrees:
+                git_ops.worktree_remove(worktree.path, force=True, cwd=self.repo)
+            self._worktrees.clear()
+            self._snapshots.clear()
+            self._ready = False
+        git_ops.worktree_prune(cwd=self.repo)
+
+    def _recycle(self, worktree: Worktree, bases: list[str]) -> None:
+        """Reset a worktree to `bases` (or `base_ref`) and drop untracked files.
+
+        Raises RuntimeError if any git step fails.
+        """
+        start = bases[0] if bases else self.base_ref
+        _check("reset", git_ops.reset_hard("HEAD", cwd=worktree.path))
+        _check("clean", git_ops.clean(cwd=worktree.path))
+        _check("checkout", git_ops.checkout(start, cwd=worktree.path))
+        if len(bases) > 1:
+            merged = git_ops.merge(bases[1:], "devlution: merge dependencies", cwd=worktree.path)
+            _check("merge", merged)
+
+
+def _check(step: str, result: git_ops.GitResult) -> None:
+    if not result.success:
+        raise RuntimeError(f"git {step} failed: {result.stderr}")
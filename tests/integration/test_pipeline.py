@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import sys
 from pathlib import Path
+from typing import Any
 
 import pytest
 import yaml
+from typer.testing import CliRunner
 
 from devlution.config import DevlutionConfig, load_config
+from devlution.orchestrator import graph as graph_module
 from devlution.orchestrator.graph import build_pipeline
+from devlution.orchestrator.persistence import open_checkpointer, thread_config
+from devlution.orchestrator.scheduler import TaskFailedError
 from devlution.supervision.audit_log import AuditLogger
 
 
@@ -109,6 +116,250 @@ class TestStubPipeline:
         assert "pr_url" in final, "Pipeline should end with PR creation"
         assert "stub" in final["pr_url"]
 
+    def test_async_pipelines_share_event_loop(self, sample_config: DevlutionConfig) -> None:
+        compiled = build_pipeline(sample_config, async_nodes=True).compile()
+
+        def initial_state(pipeline_id: str) -> dict:
+            return {
+                "pipeline_id": pipeline_id,
+                "trigger": {"type": "manual"},
+                "tasks": [],
+                "current_task_idx": 0,
+                "iterations": {},
+                "confidence_scores": {},
+                "review_comments": [],
+                "review_decision": "",
+                "test_results": None,
+                "patch": "",
+                "pr_url": "",
+                "gate_decisions": {},
+                "audit_entries": [],
+                "status": "pending",
+                "error": "",
+            }
+
+        async def run_all() -> list[dict]:
+            return await asyncio.gather(
+                *(compiled.ainvoke(initial_state(f"async-{i}")) for i in range(5))
+            )
+
+        results = asyncio.run(run_all())
+        assert len(results) == 5
+        assert all("stub" in r["pr_url"] for r in results)
+
+    def test_async_stubs_match_sync_stubs(self, sample_config: DevlutionConfig) -> None:
+        state = {"pipeline_id": "p", "confidence_scores": {}, "tasks": []}
+        for name in ("planner", "reviewer", "tester"):
+            expected = graph_module._make_stub(name)(state)
+            assert asyncio.run(graph_module._make_async_stub(name)(state)) == expected
+
+
+TASKS = [
+    {"id": "T1", "title": "First", "dependencies": []},
+    {"id": "T2", "title": "Second", "dependencies": []},
+    {"id": "T3", "title": "Third", "dependencies": ["T1"]},
+]
+
+
+class TestParallelTasks:
+    """End-to-end tests of the task fan-out with `max_parallel_tasks > 1`."""
+
+    @pytest.fixture
+    def parallel_config(
+        self, sample_config: DevlutionConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> DevlutionConfig:
+        """Two-wide fan-out over a planner that emits the three TASKS."""
+        sample_config.pipeline.max_parallel_tasks = 2
+        sample_config.pipeline.worktree_pool_size = 0
+
+        for factory in ("_make_stub", "_make_async_stub"):
+            original = getattr(graph_module, factory)
+
+            def make_node(name: str, original: Any = original) -> Any:
+                node = original(name)
+                if name != "planner":
+                    return node
+                if asyncio.iscoroutinefunction(node):
+
+                    async def async_planner(state: dict) -> dict:
+                        return {**await node(state), "tasks": TASKS}
+
+                    return async_planner
+                return lambda state: {**node(state), "tasks": TASKS}
+
+            monkeypatch.setattr(graph_module, factory, make_node)
+        return sample_config
+
+    @staticmethod
+    def initial_state() -> dict:
+        return {
+            "pipeline_id": "parallel-001",
+            "trigger": {"type": "manual"},
+            "tasks": [],
+            "current_task_idx": 0,
+            "iterations": {},
+            "confidence_scores": {},
+            "review_comments": [],
+            "review_decision": "",
+            "test_results": None,
+            "patch": "",
+            "pr_url": "",
+            "gate_decisions": {},
+            "audit_entries": [],
+            "status": "pending",
+            "error": "",
+        }
+
+    def test_sync_fanout_completes(self, parallel_config: DevlutionConfig) -> None:
+        compiled = build_pipeline(parallel_config).compile()
+        steps = {
+            node: update
+            for step in compiled.stream(self.initial_state())
+            for node, update in step.items()
+        }
+
+        merged = steps["tasks"]
+        assert set(merged["task_results"]) == {"T1", "T2", "T3"}
+        assert merged["test_results"]["total_tests"] == 3
+        assert "stub" in steps["pr"]["pr_url"]
+
+    def test_async_fanout_completes(self, parallel_config: DevlutionConfig) -> None:
+        compiled = build_pipeline(parallel_config, async_nodes=True).compile()
+
+        async def run() -> dict:
+            return {
+                node: update
+                async for step in compiled.astream(self.initial_state())
+                for node, update in step.items()
+            }
+
+        steps = asyncio.run(run())
+        assert set(steps["tasks"]["task_results"]) == {"T1", "T2", "T3"}
+        assert "stub" in steps["pr"]["pr_url"]
+
+    def test_sync_fanout_inside_running_loop(self, parallel_config: DevlutionConfig) -> None:
+        compiled = build_pipeline(parallel_config).compile()
+
+        async def caller() -> dict:
+            return compiled.invoke(self.initial_state())
+
+        final = asyncio.run(caller())
+        assert "stub" in final["pr_url"]
+
+    def test_failed_tasks_abort_before_gate(
+        self, parallel_config: DevlutionConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        make_stub = graph_module._make_stub
+
+        def broken_coder(name: str) -> Any:
+            if name != "coder":
+                return make_stub(name)
+
+            def coder(state: dict) -> dict:
+                raise RuntimeError("coder crashed")
+
+            return coder
+
+        monkeypatch.setattr(graph_module, "_make_stub", broken_coder)
+        compiled = build_pipeline(parallel_config).compile()
+        with pytest.raises(TaskFailedError, match="coder crashed") as raised:
+            compiled.invoke(self.initial_state())
+
+        assert raised.value.results["T1"]["status"] == "failed"
+        assert raised.value.results["T3"]["status"] == "skipped"
+
+    def test_failed_tasks_can_be_resumed(
+        self, parallel_config: DevlutionConfig, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        make_stub = graph_module._make_stub
+        crashes = [1]
+
+        def flaky_coder(name: str) -> Any:
+            node = make_stub(name)
+            if name != "coder":
+                return node
+
+            def coder(state: dict) -> dict:
+                if crashes:
+                    crashes.pop()
+                    raise RuntimeError("coder crashed")
+                return node(state)
+
+            return coder
+
+        monkeypatch.setattr(graph_module, "_make_stub", flaky_coder)
+        with open_checkpointer(tmp_path / "checkpoints.db") as checkpointer:
+            compiled = build_pipeline(parallel_config).compile(checkpointer=checkpointer)
+            config = thread_config("parallel-001")
+            with pytest.raises(TaskFailedError):
+                compiled.invoke(self.initial_state(), config)
+            assert compiled.get_state(config).next == ("tasks",)
+
+            final = compiled.invoke(None, config)
+        assert "stub" in final["pr_url"]
+
+    def test_dependency_cycle_escalates(
+        self, parallel_config: DevlutionConfig, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cyclic = [{**TASKS[0], "dependencies": ["T3"]}, *TASKS[1:]]
+        monkeypatch.setattr(sys.modules[__name__], "TASKS", cyclic)
+        compiled = build_pipeline(parallel_config).compile()
+        steps = {
+            node: update
+            for step in compiled.stream(self.initial_state())
+            for node, update in step.items()
+        }
+
+        assert steps["tasks"]["review_decision"] == "escalate_to_human"
+        assert "cycle" in steps["tasks"]["error"]
+        assert "gate" in steps
+
+    def test_checkpointed_fanout(self, parallel_config: DevlutionConfig, tmp_path: Path) -> None:
+        with open_checkpointer(tmp_path / "checkpoints.db") as checkpointer:
+            compiled = build_pipeline(parallel_config).compile(checkpointer=checkpointer)
+            final = compiled.invoke(self.initial_state(), thread_config("parallel-001"))
+
+        assert final.get("status") != "failed"
+        assert "stub" in final["pr_url"]
+
+
+class TestCheckpointing:
+    """Resuming interrupted pipelines from the SQLite checkpointer."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path: Path) -> Path:
+        data = yaml.safe_load((FIXTURES / "devlution.yaml").read_text())
+        data["supervision"]["audit_log"] = str(tmp_path / "audit.jsonl")
+        data["pipeline"]["checkpoint_db"] = str(tmp_path / "checkpoints.db")
+        path = tmp_path / "devlution.yaml"
+        path.write_text(yaml.safe_dump(data))
+        return path
+
+    def test_resume_finishes_interrupted_pipeline(self, config_file: Path) -> None:
+        from devlution.cli.commands.run import _initial_state, app
+
+        config = load_config(config_file)
+        with open_checkpointer(config.pipeline.checkpoint_db) as checkpointer:
+            compiled = build_pipeline(config).compile(
+                checkpointer=checkpointer, interrupt_before=["pr"]
+            )
+            compiled.invoke(_initial_state("resume-1", "manual", 0), thread_config("resume-1"))
+
+        result = CliRunner().invoke(app, ["--config", str(config_file), "--resume", "resume-1"])
+        assert result.exit_code == 0, result.output
+        assert "resuming at pr" in result.output
+        assert "stub" in result.output
+
+        again = CliRunner().invoke(app, ["--config", str(config_file), "--resume", "resume-1"])
+        assert "already completed" in again.output
+
+    def test_resume_unknown_pipeline_fails(self, config_file: Path) -> None:
+        from devlution.cli.commands.run import app
+
+        result = CliRunner().invoke(app, ["--config", str(config_file), "--resume", "nope"])
+        assert result.exit_code == 1
+        assert "No checkpoint found" in result.output
+
 
 class TestConfigValidation:
     """Config validation edge cases."""
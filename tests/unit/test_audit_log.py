@@ -65,3 +65,199 @@ def test_optional_fields(audit: AuditLogger) -> None:
     entries = audit.read()
     assert entries[0]["tokens_used"] == 500
     assert entries[0]["duration_ms"] == 1200
+
+
+@pytest.fixture
+def indexed(tmp_path: Path) -> AuditLogger:
+    return AuditLogger(tmp_path / "indexed.jsonl", indexed=True)
+
+
+def test_indexed_query_filters(indexed: AuditLogger) -> None:
+    indexed.record("p1", "coder", "llm_call")
+    indexed.record("p2", "coder", "code_complete")
+    indexed.record("p1", "reviewer", "llm_call")
+
+    assert [e["agent"] for e in indexed.query(pipeline_id="p1")] == ["coder", "reviewer"]
+    assert [e["pipeline_id"] for e in indexed.query(agent="coder")] == ["p1", "p2"]
+    assert len(indexed.query(action="llm_call", last_n=1)) == 1
+    assert indexed.query(since="2000-01-01", until="2000-01-02") == []
+
+
+def test_indexed_matches_scan(indexed: AuditLogger) -> None:
+    for i in range(10):
+        indexed.record(f"p{i % 3}", "agent", f"action_{i}")
+
+    plain = AuditLogger(indexed.path)
+    assert indexed.read(last_n=4, pipeline_id="p1") == plain.read(last_n=4, pipeline_id="p1")
+
+
+def test_migrate_indexes_existing_log(audit: AuditLogger) -> None:
+    audit.record("p1", "coder", "write_file")
+    audit.record("p2", "tester", "run_tests")
+
+    assert audit.migrate() == 2
+    reopened = AuditLogger(audit.path, indexed=True)
+    assert [e["agent"] for e in reopened.read(pipeline_id="p2")] == ["tester"]
+
+
+def test_migrate_closes_its_temporary_index(
+    audit: AuditLogger, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from devlution.supervision.audit_index import AuditIndex
+
+    closed: list[AuditIndex] = []
+    original = AuditIndex.close
+    monkeypatch.setattr(AuditIndex, "close", lambda self: (closed.append(self), original(self)))
+
+    audit.record("p1", "coder", "write_file")
+    audit.migrate()
+    assert len(closed) == 1
+
+
+def test_indexed_clear(indexed: AuditLogger) -> None:
+    indexed.record("p1", "test", "action")
+    assert len(indexed.read()) == 1
+
+    indexed.clear()
+    assert indexed.read() == []
+
+
+def test_tail_spans_read_blocks(audit: AuditLogger, monkeypatch: pytest.MonkeyPatch) -> None:
+    from devlution.supervision import audit_log
+
+    monkeypatch.setattr(audit_log, "_TAIL_BLOCK_SIZE", 32)
+    for i in range(50):
+        audit.record(f"p{i % 2}", "agent", f"action_{i}")
+
+    assert [e["action"] for e in audit.read(last_n=3)] == [
+        "action_47",
+        "action_48",
+        "action_49",
+    ]
+    assert [e["action"] for e in audit.read(last_n=2, pipeline_id="p0")] == [
+        "action_46",
+        "action_48",
+    ]
+
+
+def test_buffered_flush(tmp_path: Path) -> None:
+    buffered = AuditLogger(tmp_path / "buffered.jsonl", buffered=True, flush_interval_ms=60_000)
+    buffered.record("p1", "coder", "llm_call")
+    buffered.record("p1", "coder", "code_complete")
+
+    assert not buffered.path.exists() or buffered.path.read_text() == ""
+    buffered.flush()
+    assert len(buffered.path.read_text().splitlines()) == 2
+
+
+def test_buffered_read_sees_pending_entries(tmp_path: Path) -> None:
+    buffered = AuditLogger(tmp_path / "buffered.jsonl", buffered=True, flush_interval_ms=60_000)
+    buffered.record("p1", "coder", "llm_call")
+
+    assert [e["action"] for e in buffered.read(last_n=5)] == ["llm_call"]
+
+
+def test_buffered_write_failure_keeps_lines(tmp_path: Path) -> None:
+    buffered = AuditLogger(tmp_path / "retry.jsonl", buffered=True, flush_interval_ms=60_000)
+    buffered.record("p1", "coder", "llm_call")
+    buffered.path.mkdir()  # appending to a directory fails
+
+    with pytest.raises(OSError):
+        buffered.flush()
+    buffered.path.rmdir()
+    buffered.flush()
+    assert len(buffered.path.read_text().splitlines()) == 1
+
+
+def test_buffered_rejects_conflicting_settings(tmp_path: Path) -> None:
+    AuditLogger(tmp_path / "shared.jsonl", buffered=True, flush_interval_ms=60_000)
+    AuditLogger(tmp_path / "shared.jsonl", buffered=True, flush_interval_ms=60_000)
+    with pytest.raises(ValueError, match="different writer settings"):
+        AuditLogger(tmp_path / "shared.jsonl", buffered=True, fsync=True)
+
+
+def test_shared_writer_rotates_with_a_later_loggers_index(tmp_path: Path) -> None:
+    from devlution.supervision.audit_rotation import SegmentRotator
+
+    path = tmp_path / "shared.jsonl"
+    first = AuditLogger(
+        path, buffered=True, flush_interval_ms=60_000, rotator=SegmentRotator(max_bytes=400)
+    )
+    indexed = AuditLogger(
+        path,
+        indexed=True,
+        buffered=True,
+        flush_interval_ms=60_000,
+        rotator=SegmentRotator(max_bytes=400),
+    )
+    for i in range(20):
+        first.record("p1", "agent", f"action_{i}")
+        first.flush()
+
+    assert indexed.segments()
+    assert len(indexed.query()) == 20
+
+
+def test_rotation_reads_across_segments(tmp_path: Path) -> None:
+    from devlution.supervision.audit_rotation import SegmentRotator
+
+    rotating = AuditLogger(tmp_path / "audit.jsonl", rotator=SegmentRotator(max_bytes=400))
+    for i in range(20):
+        rotating.record("p1", "agent", f"action_{i}")
+
+    segments = rotating.segments()
+    assert segments
+    assert all(s.name.endswith(".jsonl.gz") for s in segments)
+
+    assert [e["action"] for e in rotating.read()] == [f"action_{i}" for i in range(20)]
+    assert [e["action"] for e in rotating.read(last_n=12)] == [
+        f"action_{i}" for i in range(8, 20)
+    ]
+
+
+def test_filtered_tail_spans_segments(tmp_path: Path) -> None:
+    from devlution.supervision.audit_rotation import SegmentRotator
+
+    rotating = AuditLogger(tmp_path / "audit.jsonl", rotator=SegmentRotator(max_bytes=400))
+    for i in range(30):
+        rotating.record(f"p{i % 3}", "agent", f"action_{i}")
+
+    assert len(rotating.segments()) > 1
+    assert [e["action"] for e in rotating.read(last_n=6, pipeline_id="p0")] == [
+        f"action_{i}" for i in range(12, 30, 3)
+    ]
+    assert len(rotating.read(last_n=100, pipeline_id="p1")) == 10
+
+
+def test_segments_hide_in_flight_compression(tmp_path: Path) -> None:
+    from devlution.supervision.audit_rotation import list_segments
+
+    live = tmp_path / "audit.jsonl"
+    for name in (
+        "audit.20260101T000000000000.jsonl.gz",
+        "audit.20260102T000000000000.jsonl",  # compressed copy already in place
+        "audit.20260102T000000000000.jsonl.gz",
+        ".audit.20260103T000000000000.jsonl.gz.tmp",  # compression in progress
+        "audit.20260103T000000000000.jsonl",
+    ):
+        (tmp_path / name).write_text("")
+
+    assert [p.name for p in list_segments(live)] == [
+        "audit.20260101T000000000000.jsonl.gz",
+        "audit.20260102T000000000000.jsonl.gz",
+        "audit.20260103T000000000000.jsonl",
+    ]
+
+
+def test_rotation_keeps_index_history(tmp_path: Path) -> None:
+    from devlution.supervision.audit_rotation import SegmentRotator
+
+    rotating = AuditLogger(
+        tmp_path / "audit.jsonl", indexed=True, rotator=SegmentRotator(max_bytes=400)
+    )
+    for i in range(20):
+        rotating.record(f"p{i % 2}", "agent", f"action_{i}")
+
+    assert len(rotating.query()) == 20
+    assert rotating.migrate() == 20
+    assert len(rotating.read(pipeline_id="p0")) == 10
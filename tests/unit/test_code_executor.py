@@ -0,0 +1,226 @@
+"""Tests for devlution.tools.code_executor — sharded and streaming test runs."""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from devlution.tools.code_executor import (
+    OutputBuffer,
+    RunReport,
+    astream_command,
+    collect_results,
+    parse_collected,
+    parse_coverage_json,
+    parse_junit,
+    plan_shards,
+    run_sharded_tests,
+    stream_command,
+)
+from devlution.tools.log_distiller import parse_failures
+
+FAKE_PYTEST = """
+import sys
+args = sys.argv[1:]
+if "--collect-only" in args:
+    print("tests/test_a.py: 4")
+    print("tests/test_b.py: 1")
+    print("tests/test_c.py: 2")
+    print()
+    print("7 tests collected in 0.01s")
+    sys.exit(0)
+print("ran", *args)
+sys.exit(1 if "tests/test_b.py" in args else 0)
+"""
+
+
+def test_parse_collected() -> None:
+    output = "tests/test_a.py: 4\ntests/sub/test_b.py: 12\n\n16 tests collected in 0.3s\n"
+    assert parse_collected(output) == {"tests/test_a.py": 4, "tests/sub/test_b.py": 12}
+
+
+def test_plan_shards_balances_by_test_count() -> None:
+    counts = {"a.py": 10, "b.py": 6, "c.py": 5, "d.py": 1}
+    assert plan_shards(counts, 2) == [["a.py", "d.py"], ["b.py", "c.py"]]
+    assert plan_shards(counts, 8) == [["a.py"], ["b.py"], ["c.py"], ["d.py"]]
+
+
+def test_run_sharded_tests_merges_shards(tmp_path: Path) -> None:
+    script = tmp_path / "fake_pytest.py"
+    script.write_text(FAKE_PYTEST)
+
+    result = run_sharded_tests(
+        f"{sys.executable} {script}", cwd=str(tmp_path), shards=2, args="--junitxml=j-{shard}.xml"
+    )
+
+    assert not result.success
+    assert result.returncode == 1
+    assert sorted(len(s.files) for s in result.shards) == [1, 2]
+    assert sum(s.tests for s in result.shards) == 7
+    assert "ran --junitxml=j-0.xml tests/test_a.py" in result.stdout
+    assert "===== shard 2/2" in result.stdout
+    assert "ran --junitxml=j-1.xml" in result.stdout
+
+
+def test_run_sharded_tests_single_shard_runs_once(tmp_path: Path) -> None:
+    script = tmp_path / "fake_pytest.py"
+    script.write_text(FAKE_PYTEST)
+
+    result = run_sharded_tests(
+        f"{sys.executable} {script}", cwd=str(tmp_path), shards=1, paths=["tests/test_a.py"]
+    )
+
+    assert result.success
+    assert result.shards == []
+    assert result.stdout.strip() == "ran tests/test_a.py"
+
+
+def test_output_buffer_keeps_head_tail_and_failures() -> None:
+    buffer = OutputBuffer(head=2, tail=3, section_lines=2, section_tail=1)
+    lines = [f"line {i}" for i in range(10)]
+    lines[5] = "_____ test_parse _____"
+    for line in lines:
+        buffer.add(line)
+
+    assert buffer.text == "line 0\nline 1\n... [5 lines omitted] ...\nline 7\nline 8\nline 9"
+    assert buffer.failures == [
+        "_____ test_parse _____",
+        "line 6",
+        "... [2 lines omitted] ...",
+        "line 9",
+    ]
+
+
+def test_output_buffer_keeps_error_lines_of_long_tracebacks() -> None:
+    buffer = OutputBuffer(section_lines=5, section_tail=2)
+    buffer.add("_____ test_add _____")
+    for i in range(300):
+        buffer.add(f"    source line {i}")
+    buffer.add(">       assert add(1, 1) == 3")
+    buffer.add("E       assert 2 == 3")
+    buffer.add("")
+    buffer.add("tests/test_calc.py:5: AssertionError")
+    for i in range(10):
+        buffer.add(f"captured {i}")
+    buffer.add("FAILED tests/test_calc.py::test_add - assert 2 == 3")
+
+    failures = parse_failures("\n".join(buffer.failures))
+    assert [f.test for f in failures] == ["test_add"]
+    assert failures[0].error == ["assert 2 == 3"]
+    assert [(f.path, f.line) for f in failures[0].frames] == [("tests/test_calc.py", 5)]
+
+
+def test_stream_command_bounds_output_and_spills(tmp_path: Path) -> None:
+    script = (
+        "import sys\n"
+        "for i in range(5000): print('noise', i)\n"
+        "print('FAILED tests/test_a.py::test_x - AssertionError')\n"
+        "print('oops', file=sys.stderr)\n"
+        "sys.exit(1)\n"
+    )
+    seen: list[tuple[str, str]] = []
+
+    result = stream_command(
+        [sys.executable, "-c", script],
+        cwd=str(tmp_path),
+        on_line=lambda stream, line: seen.append((stream, line)),
+        spill_dir=tmp_path / "runs",
+    )
+
+    assert not result.success and result.returncode == 1
+    assert len(seen) == 5002
+    assert ("stderr", "oops") in seen
+    assert "lines omitted" in result.stdout
+    assert result.stdout.endswith("FAILED tests/test_a.py::test_x - AssertionError")
+    assert result.failures == "FAILED tests/test_a.py::test_x - AssertionError"
+    assert result.stderr == "oops"
+    assert Path(result.spill_path).read_text().count("\n") == 5002
+
+
+def test_stream_command_keeps_output_on_timeout(tmp_path: Path) -> None:
+    script = "import time\nprint('started', flush=True)\ntime.sleep(30)\n"
+
+    result = stream_command([sys.executable, "-c", script], cwd=str(tmp_path), timeout=1)
+
+    assert result.timed_out and not result.success
+    assert result.stdout == "started"
+    assert "timed out after 1s" in result.stderr
+
+
+def test_stream_command_ignores_output_after_the_result(tmp_path: Path, monkeypatch) -> None:
+    from devlution.tools import code_executor
+
+    monkeypatch.setattr(code_executor, "_READER_GRACE_SECONDS", 0.2)
+    # The background child keeps stdout open after the shell exits.
+    result = stream_command(
+        "(sleep 1; echo late) & echo done", cwd=str(tmp_path), spill_dir=tmp_path / "runs"
+    )
+
+    assert result.success and result.stdout == "done"
+    time.sleep(1.5)
+    assert Path(result.spill_path).read_text() == "done\n"
+
+
+def test_astream_command_matches_sync(tmp_path: Path) -> None:
+    script = "print('a')\nprint('b')\n"
+
+    result = asyncio.run(astream_command([sys.executable, "-c", script], cwd=str(tmp_path)))
+
+    assert result.success
+    assert result.stdout == "a\nb"
+
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="4">
+<testcase classname="tests.test_a" name="test_ok" time="0.01"/>
+<testcase classname="tests.test_a" name="test_bad"><failure message="assert 1 == 2"/></testcase>
+<testcase classname="tests.test_a" name="test_skip"><skipped message="later"/></testcase>
+<testcase classname="tests.test_b" name="test_boom"><error message="fixture"/></testcase>
+</testsuite></testsuites>
+"""
+
+
+def test_parse_junit_counts_outcomes(tmp_path: Path) -> None:
+    path = tmp_path / "junit-0.xml"
+    path.write_text(JUNIT)
+    report = RunReport()
+    parse_junit([path, path], report, max_failed=3)
+    assert (report.total, report.passed, report.failed, report.errors, report.skipped) == (
+        8, 2, 2, 2, 2
+    )
+    assert report.failed_tests == [
+        "tests.test_a::test_bad",
+        "tests.test_b::test_boom",
+        "tests.test_a::test_bad",
+    ]
+
+
+def test_parse_coverage_json_merges_shards_and_restricts(tmp_path: Path) -> None:
+    def write(name: str, files: dict) -> Path:
+        path = tmp_path / name
+        path.write_text(json.dumps({"files": files}))
+        return path
+
+    shard0 = write("coverage-0.json", {
+        "src/a.py": {"executed_lines": [1, 2], "missing_lines": [3, 4]},
+        "src/b.py": {"executed_lines": [1], "missing_lines": []},
+    })
+    shard1 = write("coverage-1.json", {
+        "src/a.py": {"executed_lines": [3], "missing_lines": [1, 2, 4]},
+    })
+    assert parse_coverage_json([shard0, shard1], ["src/a.py"]) == 75.0
+    assert parse_coverage_json([shard0, shard1]) == 80.0
+    # None of the requested files measured: fall back to the whole report.
+    assert parse_coverage_json([shard0, shard1], ["src/new.py"]) == 80.0
+    assert parse_coverage_json([]) is None
+
+
+def test_collect_results(tmp_path: Path) -> None:
+    assert collect_results(tmp_path) is None
+    (tmp_path / "junit-0.xml").write_text(JUNIT)
+    report = collect_results(tmp_path)
+    assert report is not None
+    assert report.total == 4
+    assert report.coverage_percent is None
+
@@ -0,0 +1,77 @@
+"""Tests for devlution.agents.coder — confidence signals."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from devlution.agents import coder
+from devlution.agents.base import AgentInput
+from devlution.agents.coder import CoderAgent
+from devlution.config import load_config
+from devlution.tools.static_analysis import AnalysisResult, Finding
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "sample_repo"
+
+
+def _agent(tmp_path: Path, lint_signal: bool) -> CoderAgent:
+    config = load_config(FIXTURES / "devlution.yaml")
+    config.supervision.audit_log = str(tmp_path / "audit.jsonl")
+    config.agents.coder.lint_signal = lint_signal
+    return CoderAgent(config, SimpleNamespace(pipeline_id="p"), workdir=str(tmp_path))
+
+
+def test_lint_signal_counts_findings_in_modified_files(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_lint(command, cwd=".", cache=None):
+        calls.append(cache)
+        findings = [
+            Finding("./a.py", 1, 1, "error", "E1", "x"),
+            Finding("a.py", 2, 1, "error", "E1", "y"),
+            Finding("b.py", 1, 1, "error", "E1", "z"),
+        ]
+        return AnalysisResult(tool="lint", success=False, findings=findings)
+
+    monkeypatch.setattr(coder, "run_lint", fake_lint)
+    result = {"files_modified": ["a.py"], "summary": "s"}
+
+    agent = _agent(tmp_path, lint_signal=True)
+    assert agent._confidence_signals("{}", result).lint_findings == 2
+    assert calls[0] is agent.analysis_cache is not None
+    agent.analysis_cache.close()
+
+    signals = _agent(tmp_path, lint_signal=False)._confidence_signals("{}", result)
+    assert signals.lint_findings is None
+    assert len(calls) == 1
+
+
+def test_index_failure_falls_back_to_plain_reads(tmp_path, monkeypatch):
+    def broken(self):
+        raise OSError("database is locked")
+
+    monkeypatch.setattr(CoderAgent, "symbol_index", property(broken))
+    (tmp_path / "a.py").write_text("x = 1\n")
+    contents, callers = _agent(tmp_path, lint_signal=False).read_context(["a.py", "gone.py"], set())
+    assert contents == {"a.py": "x = 1\n"} and callers == {}
+
+
+def test_message_errors_become_failed_output(tmp_path, monkeypatch):
+    def broken(self, files, terms, lines=None, max_chars=4000):
+        raise RuntimeError("pool died")
+
+    monkeypatch.setattr(CoderAgent, "read_context", broken)
+    monkeypatch.setattr(CoderAgent, "load_prompt", lambda self: "")
+    output = _agent(tmp_path, lint_signal=False).run(AgentInput(files_likely_affected=["a.py"]))
+    assert not output.success and "pool died" in output.error
+
+
+def test_cached_prefix_survives_edits_to_the_files(tmp_path):
+    agent = _agent(tmp_path, lint_signal=False)
+    agent.config.index.enabled = False
+    task = {"title": "Bump x", "acceptance_criteria": ["x is 2"], "files_likely_affected": ["a.py"]}
+    (tmp_path / "a.py").write_text("x = 1\n")
+    before = agent._build_message(AgentInput(**task))
+    (tmp_path / "a.py").write_text("x = 2\n")
+    after = agent._build_message(AgentInput(**task, review_comments=["add a test"]))
+
+    assert before[0] == after[0] and "cache_control" in before[0]
+    assert "x = 1" not in before[0]["text"] and "x = 2" in after[1]["text"]
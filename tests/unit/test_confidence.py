@@ -1,8 +1,14 @@
 """Tests for devlution.supervision.confidence — score parsing utilities."""
 
 from devlution.supervision.confidence import (
+    ConfidenceSignals,
+    LocalConfidenceScorer,
+    build_batch_confidence_prompt,
     build_confidence_prompt,
+    calibration_report,
+    extract_signals,
     parse_confidence_response,
+    score_locally,
 )
 
 
@@ -36,3 +42,103 @@ def test_build_confidence_prompt_structure() -> None:
     assert messages[0]["role"] == "user"
     assert "quality" in messages[0]["content"]
     assert "some output" in messages[0]["content"]
+
+
+def test_extract_signals_from_valid_output() -> None:
+    text = '{"files_modified": ["a.py"], "summary": "", "confidence": 0.4}'
+    signals = extract_signals(text, ["files_modified", "summary"])
+    assert signals.parsed is True
+    assert signals.completeness == 0.5
+    assert signals.self_reported == 0.4
+
+
+def test_extract_signals_from_unparseable_output() -> None:
+    signals = extract_signals("I could not do it", ["files_modified"])
+    assert signals.parsed is False
+    assert signals.completeness == 0.0
+
+
+def test_score_locally_without_signals() -> None:
+    assert score_locally(ConfidenceSignals()) is None
+
+
+def test_score_locally_rewards_passing_tests() -> None:
+    good = score_locally(ConfidenceSignals(parsed=True, tests_total=10, tests_failed=0))
+    bad = score_locally(ConfidenceSignals(parsed=True, tests_total=10, tests_failed=8))
+    assert good == 1.0
+    assert bad is not None and bad < 0.7
+
+
+def test_score_locally_penalises_blocking_review_comments() -> None:
+    clean = score_locally(ConfidenceSignals(parsed=True, review_comments=1, blocking_comments=0))
+    blocked = score_locally(ConfidenceSignals(parsed=True, review_comments=1, blocking_comments=1))
+    assert clean is not None and blocked is not None
+    assert blocked < 0.6 < clean
+
+
+def test_local_scorer_needs_evidence_to_overrule_self_report() -> None:
+    scorer = LocalConfidenceScorer()
+    shape_only = ConfidenceSignals(parsed=True, completeness=1.0, self_reported=0.2)
+    score, decisive = scorer.score(shape_only)
+    assert score == 0.8 and decisive is False
+
+    tested = ConfidenceSignals(
+        parsed=True, completeness=1.0, self_reported=0.2, tests_total=10, tests_failed=0
+    )
+    assert scorer.score(tested)[1] is True
+
+
+def test_local_scorer_defers_ambiguous_scores() -> None:
+    scorer = LocalConfidenceScorer(ambiguous_low=0.35, ambiguous_high=0.65)
+
+    assert scorer.score(ConfidenceSignals(parsed=False, completeness=0.0)) == (0.0, True)
+    backed = ConfidenceSignals(parsed=True, completeness=1.0, lint_findings=0)
+    assert scorer.score(backed) == (1.0, True)
+    signals = ConfidenceSignals(parsed=True, self_reported=0.0, lint_findings=20)
+    score, decisive = scorer.score(signals)
+    assert 0.35 < score < 0.65
+    assert decisive is False
+
+
+def test_calibration_report() -> None:
+    entries = [
+        {"agent": "coder", "details": {"local_score": 0.9, "llm_score": 0.8}},
+        {"agent": "coder", "details": {"local_score": 0.2, "llm_score": 0.3}},
+        {"agent": "planner", "details": {"local_score": 0.6, "llm_score": 0.4}},
+        {"agent": "planner", "details": {"local_score": 0.7}},
+    ]
+    report = calibration_report(entries)
+
+    assert report["samples"] == 3
+    assert report["mae"] == round((0.1 + 0.1 + 0.2) / 3, 3)
+    assert report["agreement"] == round(2 / 3, 3)
+    assert report["agents"]["coder"]["correlation"] == 1.0
+    assert report["agents"]["planner"]["samples"] == 1
+
+
+def test_parse_batch_response_by_id() -> None:
+    text = (
+        'Scores:\n{"results": [{"id": 2, "overall": 0.4}, {"id": 1, "overall": 0.9},'
+        ' {"id": 3, "overall": 1.7}]}'
+    )
+    assert parse_confidence_response(text, 3) == [0.9, 0.4, 1.0]
+
+
+def test_parse_batch_response_fills_missing_items() -> None:
+    text = '{"results": [{"overall": 0.8}, "junk"]}'
+    assert parse_confidence_response(text, 3) == [0.8, 0.5, 0.5]
+
+
+def test_parse_batch_response_invalid_json_defaults() -> None:
+    assert parse_confidence_response("nope", 2) == [0.5, 0.5]
+
+
+def test_build_batch_confidence_prompt_numbers_items() -> None:
+    messages = build_batch_confidence_prompt(
+        [("first output", {"quality": "Good?"}), ("second output", {"style": "Neat?"})]
+    )
+    content = messages[0]["content"]
+    assert len(messages) == 1
+    assert "## Item 1" in content and "## Item 2" in content
+    assert content.index("first output") < content.index("second output")
+    assert "style" in content
@@ -0,0 +1,81 @@
+"""Tests for devlution.agents.confidence_batch — coalescing scoring requests."""
+
+import asyncio
+from types import SimpleNamespace
+
+from devlution.agents.confidence_batch import ConfidenceBatcher
+
+
+class FakeAgent:
+    def __init__(self, pipeline_id: str = "p1") -> None:
+        self.state = SimpleNamespace(pipeline_id=pipeline_id)
+        self.calls: list[list[str]] = []
+
+    async def _arequest_llm_scores(self, items: list[tuple[str, dict[str, str]]]) -> list[float]:
+        self.calls.append([output for output, _ in items])
+        return [len(output) / 10 for output, _ in items]
+
+
+def test_concurrent_requests_share_one_call() -> None:
+    agent = FakeAgent()
+    batcher = ConfidenceBatcher(max_batch_size=8, window_ms=20)
+
+    async def main() -> list[float]:
+        return await asyncio.gather(
+            batcher.submit(agent, "a", {}),
+            batcher.submit(agent, "bb", {}),
+            batcher.submit(agent, "ccc", {}),
+        )
+
+    assert asyncio.run(main()) == [0.1, 0.2, 0.3]
+    assert agent.calls == [["a", "bb", "ccc"]]
+
+
+def test_full_batch_flushes_without_waiting() -> None:
+    agent = FakeAgent()
+    batcher = ConfidenceBatcher(max_batch_size=2, window_ms=10_000)
+
+    async def main() -> list[float]:
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(agent, "x" * n, {}) for n in range(1, 5))),
+            timeout=1,
+        )
+
+    assert asyncio.run(main()) == [0.1, 0.2, 0.3, 0.4]
+    assert agent.calls == [["x", "xx"], ["xxx", "xxxx"]]
+
+
+def test_failure_propagates_to_every_request() -> None:
+    class FailingAgent:
+        state = SimpleNamespace(pipeline_id="p1")
+
+        async def _arequest_llm_scores(self, items):
+            raise RuntimeError("api down")
+
+    batcher = ConfidenceBatcher(max_batch_size=8, window_ms=1)
+
+    async def main() -> list:
+        return await asyncio.gather(
+            batcher.submit(FailingAgent(), "a", {}),
+            batcher.submit(FailingAgent(), "b", {}),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_pipelines_are_scored_in_separate_calls() -> None:
+    first, second = FakeAgent("p1"), FakeAgent("p2")
+    batcher = ConfidenceBatcher(max_batch_size=8, window_ms=20)
+
+    async def main() -> list[float]:
+        return await asyncio.gather(
+            batcher.submit(first, "a", {}),
+            batcher.submit(second, "bb", {}),
+            batcher.submit(first, "ccc", {}),
+        )
+
+    assert asyncio.run(main()) == [0.1, 0.2, 0.3]
+    assert first.calls == [["a", "ccc"]]
+    assert second.calls == [["bb"]]
@@ -0,0 +1,38 @@
+"""Tests for devlution.agents.debugger — prompt building and failure handling."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from devlution.agents import debugger
+from devlution.agents.base import AgentInput
+from devlution.agents.debugger import DebuggerAgent
+from devlution.config import load_config
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "sample_repo"
+
+
+def _agent(tmp_path: Path) -> DebuggerAgent:
+    config = load_config(FIXTURES / "devlution.yaml")
+    config.supervision.audit_log = str(tmp_path / "audit.jsonl")
+    config.index.enabled = False
+    state = SimpleNamespace(pipeline_id="p", iterations={})
+    return DebuggerAgent(config, state, workdir=str(tmp_path))
+
+
+def test_distill_failure_falls_back_to_raw_log(tmp_path, monkeypatch):
+    def broken(log, root=".", max_chars=6000):
+        raise ValueError("bad log")
+
+    monkeypatch.setattr(debugger, "distill", broken)
+    message = _agent(tmp_path)._build_message(AgentInput(failure_log="E   boom"), 1)
+    assert "E   boom" in message[0]["text"]
+
+
+def test_message_errors_become_failed_output(tmp_path, monkeypatch):
+    def broken(self, files, terms, lines=None, max_chars=4000):
+        raise RuntimeError("pool died")
+
+    monkeypatch.setattr(DebuggerAgent, "read_context", broken)
+    monkeypatch.setattr(DebuggerAgent, "load_prompt", lambda self: "")
+    output = _agent(tmp_path).run(AgentInput(failure_log="E   boom", source_files=["a.py"]))
+    assert not output.success and "pool died" in output.error
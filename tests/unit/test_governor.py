@@ -0,0 +1,100 @@
+"""Tests for devlution.agents.governor — host-wide LLM coordination."""
+
+import asyncio
+from pathlib import Path
+
+from devlution.agents.governor import HostGovernor, default_directory
+
+
+def test_slots_are_shared_between_governors(tmp_path: Path) -> None:
+    # Two instances on one directory stand in for two processes.
+    a = HostGovernor(tmp_path, max_in_flight=2)
+    b = HostGovernor(tmp_path, max_in_flight=2)
+
+    first = a.try_acquire()
+    second = b.try_acquire()
+    assert first is not None and second is not None
+    assert a.try_acquire() is None
+
+    b.release(second)
+    third = a.try_acquire()
+    assert third is not None
+
+    a.release(first)
+    a.release(third)
+
+
+def test_slot_context_releases_on_exit(tmp_path: Path) -> None:
+    governor = HostGovernor(tmp_path, max_in_flight=1)
+
+    with governor.slot():
+        assert governor.try_acquire() is None
+
+    fd = governor.try_acquire()
+    assert fd is not None
+    governor.release(fd)
+
+
+def test_async_slot_caps_concurrency(tmp_path: Path) -> None:
+    governor = HostGovernor(tmp_path, max_in_flight=2)
+    active = 0
+    peak = 0
+
+    async def call() -> None:
+        nonlocal active, peak
+        async with governor.aslot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    async def main() -> None:
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+
+
+def test_token_budget_is_shared(tmp_path: Path) -> None:
+    a = HostGovernor(tmp_path, tokens_per_minute=600)
+    b = HostGovernor(tmp_path, tokens_per_minute=600)
+
+    assert a.reserve(600) == 0.0
+    assert 9.0 < b.reserve(100) <= 10.0
+
+
+def test_settle_refunds_unused_tokens(tmp_path: Path) -> None:
+    governor = HostGovernor(tmp_path, tokens_per_minute=600)
+
+    governor.reserve(600)
+    governor.settle(estimated=600, actual=100)
+
+    assert governor.reserve(400) == 0.0
+
+
+def test_disabled_limits_never_wait(tmp_path: Path) -> None:
+    governor = HostGovernor(tmp_path)
+
+    assert governor.reserve(10**6) == 0.0
+    with governor.slot():
+        pass
+
+
+def test_unopenable_lock_files_disable_governor(tmp_path: Path) -> None:
+    # Directories stand in for lock files owned by another user.
+    (tmp_path / "slot-0.lock").mkdir()
+    (tmp_path / "tokens.json").mkdir()
+    governor = HostGovernor(tmp_path, max_in_flight=1, tokens_per_minute=60)
+
+    with governor.slot():
+        pass
+    assert governor.disabled
+    assert governor.reserve(10_000) == 0.0
+    governor.settle(10_000, 0)
+
+
+def test_default_directory_is_per_user(monkeypatch) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert default_directory() == Path("/run/user/1000/devlution-governor")
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert default_directory() == Path.home() / ".cache" / "devlution-governor"
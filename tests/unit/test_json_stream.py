@@ -0,0 +1,88 @@
+"""Tests for devlution.agents.json_stream — incremental JSON extraction."""
+
+import json
+
+import pytest
+
+from devlution.agents.json_stream import JSONStreamParser, parse_partial
+
+RESPONSE = (
+    "Here is my review:\n"
+    + json.dumps(
+        {
+            "decision": "request_changes",
+            "confidence": 0.85,
+            "tasks": [{"id": "t1", "title": "Fix } brace"}, "plain", 3, [1, 2]],
+            "scores": {"style": 4, "nested": [{"quote": 'say "hi"'}]},
+            "verified": True,
+            "note": None,
+        }
+    )
+    + "\nTrailing prose with { braces }."
+)
+
+
+def _feed_in_chunks(text: str, size: int) -> tuple[JSONStreamParser, list]:
+    parser = JSONStreamParser()
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i : i + size]))
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, len(RESPONSE)])
+def test_fields_match_full_parse_regardless_of_chunking(size: int) -> None:
+    parser, _ = _feed_in_chunks(RESPONSE, size)
+
+    start = RESPONSE.index("{")
+    end = RESPONSE.rindex("}", 0, RESPONSE.index("\nTrailing")) + 1
+    assert parser.done
+    assert parser.fields == json.loads(RESPONSE[start:end])
+
+
+def test_emits_fields_in_order_as_they_complete() -> None:
+    _, events = _feed_in_chunks(RESPONSE, 5)
+
+    fields = [e.key for e in events if e.index is None]
+    assert fields == ["decision", "confidence", "tasks", "scores", "verified", "note"]
+
+
+def test_emits_array_elements_before_the_array_closes() -> None:
+    _, events = _feed_in_chunks(RESPONSE, 3)
+
+    tasks = [(e.index, e.value) for e in events if e.key == "tasks"]
+    assert tasks[:4] == [
+        (0, {"id": "t1", "title": "Fix } brace"}),
+        (1, "plain"),
+        (2, 3),
+        (3, [1, 2]),
+    ]
+    assert tasks[4][0] is None
+
+
+def test_early_field_available_before_rest_of_stream() -> None:
+    parser = JSONStreamParser()
+    events = parser.feed('{"decision": "escalate_to_human", "comments": [{"file": "a.py"')
+
+    assert [(e.key, e.value) for e in events] == [("decision", "escalate_to_human")]
+    assert not parser.done
+
+
+def test_trailing_number_waits_for_terminator() -> None:
+    parser = JSONStreamParser()
+
+    assert parser.feed('{"confidence": 0.8') == []
+    events = parser.feed("5}")
+
+    assert [(e.key, e.value) for e in events] == [("confidence", 0.85)]
+
+
+def test_parse_partial_returns_completed_fields_only() -> None:
+    assert parse_partial('{"decision": "approve", "confidence": 0.9, "summary": "unfini') == {
+        "decision": "approve",
+        "confidence": 0.9,
+    }
+
+
+def test_parse_partial_without_json() -> None:
+    assert parse_partial("no json here") == {}
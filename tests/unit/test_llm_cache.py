@@ -0,0 +1,130 @@
+"""Tests for devlution.agents.llm_cache — on-disk LLM response cache."""
+
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from devlution.agents.coder import CoderAgent
+from devlution.agents.llm_cache import DiskResponseCache, make_cache_key
+from devlution.agents.reviewer import ReviewerAgent
+from devlution.config import load_config
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "sample_repo"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> DiskResponseCache:
+    return DiskResponseCache(tmp_path / "llm")
+
+
+def test_key_is_order_independent() -> None:
+    a = make_cache_key({"model": "m", "max_tokens": 10, "system": "s"})
+    b = make_cache_key({"system": "s", "max_tokens": 10, "model": "m"})
+    assert a == b
+    assert a != make_cache_key({"model": "m", "max_tokens": 11, "system": "s"})
+
+
+def test_put_and_get(cache: DiskResponseCache) -> None:
+    key = make_cache_key({"model": "m"})
+    assert cache.get(key) is None
+    cache.put(key, {"id": "msg_1", "content": []})
+
+    assert cache.get(key) == {"id": "msg_1", "content": []}
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_expired_entry_is_a_miss(tmp_path: Path) -> None:
+    cache = DiskResponseCache(tmp_path / "llm", max_age_hours=1)
+    key = make_cache_key({"model": "m"})
+    cache.put(key, {"id": "old"})
+
+    stale = time.time() - 7200
+    os.utime(cache._path(key), (stale, stale))
+
+    assert cache.get(key) is None
+    assert not cache._path(key).exists()
+
+
+def test_evicts_oldest_over_budget(tmp_path: Path) -> None:
+    cache = DiskResponseCache(tmp_path / "llm", max_size_mb=0)
+    cache.max_size_bytes = 300
+
+    keys = [make_cache_key({"n": i}) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"body": "x" * 100})
+        past = time.time() - (10 - i)
+        os.utime(cache._path(key), (past, past))
+
+    cache.put(make_cache_key({"n": 3}), {"body": "x" * 100})
+
+    assert not cache._path(keys[0]).exists()
+    assert cache._path(keys[2]).exists()
+
+
+def test_size_is_tracked_without_rescanning(
+    cache: DiskResponseCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scans = 0
+    scan = cache._scan
+
+    def counting_scan() -> tuple[list[tuple[float, int, Path]], int]:
+        nonlocal scans
+        scans += 1
+        return scan()
+
+    monkeypatch.setattr(cache, "_scan", counting_scan)
+    for i in range(5):
+        cache.put(make_cache_key({"n": i}), {"body": "x" * 100})
+    cache.put(make_cache_key({"n": 0}), {"body": "y" * 100})
+
+    assert scans == 1
+    assert cache._size == sum(p.stat().st_size for p in cache.directory.glob("*/*.json"))
+
+
+def _agent(cls: type, tmp_path: Path, **llm: Any) -> Any:
+    config = load_config(FIXTURES / "devlution.yaml")
+    config.supervision.audit_log = str(tmp_path / "audit.jsonl")
+    for field, value in llm.items():
+        setattr(config.llm, field, value)
+    cache = DiskResponseCache(tmp_path / "llm")
+    return cls(config, SimpleNamespace(pipeline_id="p"), response_cache=cache)
+
+
+def test_coder_skips_cache_when_sampling(tmp_path: Path) -> None:
+    assert not _agent(CoderAgent, tmp_path, temperature=0.2).use_response_cache
+    assert _agent(CoderAgent, tmp_path, temperature=0.0).use_response_cache
+    assert _agent(ReviewerAgent, tmp_path, temperature=0.2).use_response_cache
+
+
+def test_cache_hit_replays_stream_events(tmp_path: Path) -> None:
+    agent = _agent(ReviewerAgent, tmp_path, stream=True)
+    messages = [{"role": "user", "content": "review"}]
+    key = make_cache_key(agent._build_llm_request("s", messages, None, None, None))
+    agent.response_cache.put(
+        key,
+        {
+            "id": "msg_1",
+            "type": "message",
+            "role": "assistant",
+            "model": "m",
+            "content": [{"type": "text", "text": '{"decision": "escalate_to_human", "x": 1}'}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+        },
+    )
+
+    seen: list[str] = []
+
+    def on_event(event: Any) -> bool:
+        seen.append(event.key)
+        return bool(agent._stop_on_escalation(event))
+
+    response = agent.call_llm(system="s", messages=messages, on_event=on_event)
+    assert response.id == "msg_1"
+    assert seen == ["decision"]
@@ -0,0 +1,172 @@
+"""Tests for devlution.tools.log_distiller — failure extraction from test output."""
+
+from pathlib import Path
+
+from devlution.tools.log_distiller import distill, fold, parse_failures
+
+PYTEST_LOG = """\
+============================= test session starts ==============================
+collected 3 items
+
+tests/test_calc.py F.F                                                   [100%]
+
+=================================== FAILURES ===================================
+___________________________________ test_add ___________________________________
+
+    def test_add():
+>       assert add(1, 1) == 3
+E       assert 2 == 3
+E        +  where 2 = add(1, 1)
+
+tests/test_calc.py:5: AssertionError
+----------------------------- Captured stdout call -----------------------------
+noise
+__________________________________ test_div ___________________________________
+
+    def test_div():
+>       div(1, 0)
+
+tests/test_calc.py:9:
+_ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _
+
+    def div(a, b):
+>       return a / b
+E       ZeroDivisionError: division by zero
+
+calc.py:2: ZeroDivisionError
+=========================== short test summary info ============================
+FAILED tests/test_calc.py::test_add - assert 2 == 3
+FAILED tests/test_calc.py::test_div - ZeroDivisionError: division by zero
+========================= 2 failed, 1 passed in 0.05s ==========================
+"""
+
+UNITTEST_LOG = """\
+F.
+======================================================================
+FAIL: test_upper (tests.test_str.StrTest.test_upper)
+----------------------------------------------------------------------
+Traceback (most recent call last):
+  File "/src/tests/test_str.py", line 6, in test_upper
+    self.assertEqual("a".upper(), "B")
+AssertionError: 'A' != 'B'
+- A
++ B
+
+
+----------------------------------------------------------------------
+Ran 2 tests in 0.001s
+
+FAILED (failures=1)
+"""
+
+GO_LOG = """\
+=== RUN   TestOk
+    ok_test.go:4: just logging
+--- PASS: TestOk (0.00s)
+=== RUN   TestSum
+    sum_test.go:8: Sum(1, 2) = 4, want 3
+    sum_test.go:9: second error
+--- FAIL: TestSum (0.00s)
+--- FAIL: TestDiff (0.00s)
+    diff_test.go:12: got "a"
+FAIL
+"""
+
+JEST_LOG = """\
+ FAIL  src/add.test.js
+  ● add › adds numbers
+
+    expect(received).toBe(expected) // Object.is equality
+
+    Expected: 3
+    Received: 4
+
+      3 | test("adds numbers", () => {
+    > 4 |   expect(add(1, 2)).toBe(3);
+        |                     ^
+      5 | });
+
+      at Object.<anonymous> (src/add.test.js:4:21)
+      at Promise.then.completed (node_modules/jest-circus/build/utils.js:298:28)
+
+Tests:       1 failed, 1 total
+"""
+
+
+def test_pytest_keeps_first_error_and_frames() -> None:
+    failures = parse_failures(PYTEST_LOG)
+    assert [f.test for f in failures] == ["test_add", "test_div"]
+    add, div = failures
+    assert add.error == ["assert 2 == 3", "+  where 2 = add(1, 1)"]
+    assert [(f.path, f.line, f.code) for f in add.frames] == [
+        ("tests/test_calc.py", 5, "assert add(1, 1) == 3")
+    ]
+    assert [(f.path, f.line, f.function) for f in div.frames] == [
+        ("tests/test_calc.py", 9, "test_div"),
+        ("calc.py", 2, "div"),
+    ]
+    assert div.error == ["ZeroDivisionError: division by zero"]
+
+
+def test_unittest_traceback() -> None:
+    (failure,) = parse_failures(UNITTEST_LOG)
+    assert failure.test == "tests.test_str.StrTest.test_upper"
+    assert failure.error == ["AssertionError: 'A' != 'B'", "- A", "+ B"]
+    assert [(f.path, f.line, f.code) for f in failure.frames] == [
+        ("/src/tests/test_str.py", 6, 'self.assertEqual("a".upper(), "B")')
+    ]
+
+
+def test_go_and_jest() -> None:
+    sum_failure, diff_failure = parse_failures(GO_LOG)
+    assert sum_failure.test == "TestSum"
+    assert sum_failure.error == ["Sum(1, 2) = 4, want 3"]
+    assert [(f.path, f.line) for f in sum_failure.frames] == [("sum_test.go", 8)]
+    assert (diff_failure.test, diff_failure.error) == ("TestDiff", ['got "a"'])
+
+    (failure,) = parse_failures(JEST_LOG)
+    assert failure.test == "add › adds numbers"
+    assert failure.error == [
+        "expect(received).toBe(expected) // Object.is equality",
+        "Expected: 3",
+        "Received: 4",
+    ]
+    assert failure.frames[0].path == "src/add.test.js"
+    assert failure.frames[0].code == "expect(add(1, 2)).toBe(3);"
+
+
+def test_fold_merges_identical_failures() -> None:
+    log = PYTEST_LOG.replace("test_div", "test_add2").replace(
+        "ZeroDivisionError: division by zero", "assert 2 == 3"
+    )
+    repeated = log + log.replace("test_add", "test_again")
+    failures = fold(parse_failures(repeated))
+    assert len(failures) == 2
+    assert failures[0].same_as == ["test_again"]
+
+
+def test_distill_maps_local_frames(tmp_path: Path) -> None:
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_calc.py").write_text(
+        "from calc import add\n\n\ndef test_add():\n    assert add(1, 1) == 3\n"
+    )
+    (tmp_path / "calc.py").write_text("def div(a, b):\n    return a / b  # on disk\n")
+    log = PYTEST_LOG.replace("tests/test_calc.py:9", "/usr/lib/python3/x.py:9")
+
+    text = distill(log, tmp_path)
+
+    assert text.startswith("Failing tests: 2 (2 distinct failures)")
+    assert (
+        "FAILED test_add\n  tests/test_calc.py:5 in test_add\n      assert add(1, 1) == 3" in text
+    )
+    assert "calc.py:2 in div\n      return a / b  # on disk" in text
+    assert "/usr/lib" not in text
+    assert "noise" not in text and "test session starts" not in text
+
+
+def test_distill_without_failures_keeps_the_tail() -> None:
+    log = "\n".join(f"line {i}" for i in range(1000))
+    text = distill(log, max_chars=100)
+    assert len(text) <= 100
+    assert text.endswith("line 999")
+    assert distill("short log") == "short log"
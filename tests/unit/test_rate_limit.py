@@ -0,0 +1,132 @@
+"""Tests for devlution.agents.rate_limit — token buckets and retry delays."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import anthropic
+import httpx
+import pytest
+
+from devlution.agents import base
+from devlution.agents.coder import CoderAgent
+from devlution.agents.rate_limit import (
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    get_rate_limiter,
+    retry_delay,
+)
+from devlution.config import ModelRateLimitConfig, RateLimitConfig, load_config
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "sample_repo"
+
+
+def test_bucket_allows_burst_then_waits() -> None:
+    bucket = TokenBucket(per_minute=60)
+    now = bucket._updated
+
+    assert bucket.reserve(60, now) == 0.0
+    assert bucket.reserve(1, now) == 1.0
+    assert bucket.reserve(2, now) == 3.0
+
+
+def test_bucket_refills_over_time() -> None:
+    bucket = TokenBucket(per_minute=60)
+    now = bucket._updated
+    bucket.reserve(60, now)
+
+    assert bucket.reserve(10, now + 10) == 0.0
+    assert bucket.reserve(1, now + 10) == 1.0
+
+
+def test_oversized_reservation_is_capped_at_capacity() -> None:
+    bucket = TokenBucket(per_minute=60)
+    now = bucket._updated
+
+    assert bucket.reserve(1000, now) == 0.0
+    assert bucket.reserve(1, now) == 1.0
+
+
+def test_refund_returns_unused_estimate() -> None:
+    bucket = TokenBucket(per_minute=60)
+    now = bucket._updated
+    bucket.reserve(60, now)
+
+    bucket.refund(30, now)
+
+    assert bucket.reserve(30, now) == 0.0
+
+
+def test_zero_rate_is_unlimited() -> None:
+    bucket = TokenBucket(per_minute=0)
+    assert bucket.reserve(10**9, bucket._updated) == 0.0
+
+
+def test_pause_delays_every_caller() -> None:
+    limiter = RateLimiter()
+    limiter.pause(5)
+
+    assert 4.5 < limiter.reserve(100) <= 5
+    assert 4.5 < limiter.reserve(100) <= 5
+
+
+def test_limiter_is_shared_per_model() -> None:
+    config = RateLimitConfig(
+        requests_per_minute=50,
+        models={"special-model": ModelRateLimitConfig(requests_per_minute=5)},
+    )
+
+    limiter = get_rate_limiter("shared-model", config)
+    assert get_rate_limiter("shared-model", config) is limiter
+    assert get_rate_limiter("special-model", config).requests.capacity == 5
+    assert limiter.requests.capacity == 50
+
+
+def test_retry_delay_honours_retry_after() -> None:
+    error = SimpleNamespace(response=SimpleNamespace(headers={"retry-after": "7"}))
+    assert retry_delay(error, attempt=0, max_backoff=60) == 7.0
+    assert retry_delay(error, attempt=0, max_backoff=3) == 3.0
+
+
+def test_retry_delay_jitters_within_backoff() -> None:
+    error = SimpleNamespace(response=SimpleNamespace(headers={}))
+    delays = [retry_delay(error, attempt=2, max_backoff=60) for _ in range(50)]
+
+    assert all(0 <= d <= 8 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_estimate_tokens_scales_with_request_size() -> None:
+    small = estimate_tokens({"system": "s", "messages": [{"role": "user", "content": "hi"}]})
+    large = estimate_tokens({"system": "s" * 4000, "messages": []})
+
+    assert small < 20
+    assert large >= 1000
+
+
+def test_failed_attempts_refund_their_tokens(tmp_path, monkeypatch) -> None:
+    config = load_config(FIXTURES / "devlution.yaml")
+    config.supervision.audit_log = str(tmp_path / "audit.jsonl")
+    config.llm.model = "refund-test-model"
+    config.llm.rate_limit.tokens_per_minute = 100_000
+    agent = CoderAgent(config, SimpleNamespace(pipeline_id="p"), workdir=str(tmp_path))
+
+    error = anthropic.APIConnectionError(request=httpx.Request("POST", "https://api.invalid"))
+    outcomes: list[Any] = [error, error]
+    message = SimpleNamespace(
+        content=[], usage=SimpleNamespace(input_tokens=30, output_tokens=20)
+    )
+
+    def create(**kwargs: Any) -> Any:
+        if outcomes:
+            raise outcomes.pop()
+        return message
+
+    agent._client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    monkeypatch.setattr(base.time, "sleep", lambda seconds: None)
+    agent.call_llm(system="s", messages=[{"role": "user", "content": "x" * 4000}])
+
+    # Only the successful attempt's real usage is charged, not three estimates.
+    bucket = get_rate_limiter("refund-test-model", config.llm.rate_limit).tokens
+    assert 100_000 - bucket.level == pytest.approx(50, abs=5)
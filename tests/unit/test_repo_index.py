@@ -0,0 +1,74 @@
+"""Tests for devlution.tools.repo_index — change detection for indexes."""
+
+import subprocess
+from pathlib import Path
+
+from devlution.tools.repo_index import content_keys, diff_keys, parse_files
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _line_count(root: str, path: str) -> int:
+    return len((Path(root) / path).read_text().splitlines())
+
+
+def test_content_keys_use_blob_hashes_for_clean_files(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.txt").write_text("ignored suffix\n")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+
+    keys = content_keys(tmp_path)
+
+    assert list(keys) == ["a.py"]
+    blob = subprocess.run(
+        ["git", "hash-object", "a.py"], cwd=tmp_path, check=True, capture_output=True, text=True
+    )
+    assert keys["a.py"] == blob.stdout.strip()
+
+
+def test_content_keys_stat_dirty_and_untracked_files(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "gone.py").write_text("y = 1\n")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+
+    (tmp_path / "a.py").write_text("x = 2\n")
+    (tmp_path / "gone.py").unlink()
+    (tmp_path / "new.py").write_text("z = 1\n")
+    keys = content_keys(tmp_path)
+
+    assert sorted(keys) == ["a.py", "new.py"]
+    assert keys["a.py"].startswith("stat:")
+    assert keys["new.py"].startswith("stat:")
+
+
+def test_content_keys_outside_git(tmp_path: Path) -> None:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x = 1\n")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "skip.py").write_text("")
+
+    assert list(content_keys(tmp_path)) == ["pkg/a.py"]
+    assert list(content_keys(tmp_path, paths=["pkg/a.py", "missing.py"])) == ["pkg/a.py"]
+
+
+def test_diff_keys() -> None:
+    stored = {"a.py": "1", "b.py": "2", "c.py": "3"}
+    current = {"a.py": "1", "b.py": "9", "d.py": "4"}
+
+    assert diff_keys(stored, current) == (["b.py", "d.py"], ["c.py"])
+
+
+def test_parse_files_in_process_and_pool(tmp_path: Path) -> None:
+    paths = [f"m{i}.py" for i in range(70)]
+    for i, path in enumerate(paths):
+        (tmp_path / path).write_text("x\n" * (i + 1))
+
+    small = parse_files(_line_count, tmp_path, paths[:3])
+    pooled = parse_files(_line_count, tmp_path, paths, workers=2)
+
+    assert small == [("m0.py", 1), ("m1.py", 2), ("m2.py", 3)]
+    assert pooled == [(path, i + 1) for i, path in enumerate(paths)]
@@ -0,0 +1,77 @@
+"""Tests for devlution.agents.reviewer — per-file confidence scoring."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from anthropic.types import TextBlock
+
+from devlution.agents.base import AgentInput
+from devlution.agents.reviewer import ReviewerAgent, split_diff
+from devlution.config import load_config
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "sample_repo"
+
+DIFF = (
+    "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-x = 1\n+x = 2\n"
+    "diff --git a/util.py b/util.py\n--- a/util.py\n+++ b/util.py\n@@ -1 +1 @@\n-y = 1\n+y = 2\n"
+)
+
+
+def _response(payload: dict[str, Any]) -> SimpleNamespace:
+    return SimpleNamespace(content=[TextBlock(type="text", text=json.dumps(payload))])
+
+
+def test_split_diff() -> None:
+    sections = split_diff(DIFF)
+    assert list(sections) == ["app.py", "util.py"]
+    assert "+x = 2" in sections["app.py"] and "+y = 2" not in sections["app.py"]
+    assert split_diff("not a diff") == {}
+
+
+def test_low_confidence_review_scores_files_in_one_call(tmp_path, monkeypatch) -> None:
+    config = load_config(FIXTURES / "devlution.yaml")
+    config.supervision.audit_log = str(tmp_path / "audit.jsonl")
+    agent = ReviewerAgent(config, SimpleNamespace(pipeline_id="p"), workdir=str(tmp_path))
+    review = {
+        "decision": "request_changes",
+        "confidence": 0.3,
+        "comments": [{"file": "util.py", "line": 1, "severity": "error", "body": "wrong"}],
+    }
+    calls: list[dict[str, Any]] = []
+
+    def fake_call_llm(**kwargs: Any) -> SimpleNamespace:
+        calls.append(kwargs)
+        if len(calls) == 1:
+            return _response(review)
+        return _response({"results": [{"id": 1, "overall": 0.9}, {"id": 2, "overall": 0.6}]})
+
+    monkeypatch.setattr(agent, "call_llm", fake_call_llm)
+    monkeypatch.setattr(agent, "load_prompt", lambda: "")
+    output = agent.run(AgentInput(diff=DIFF, task_title="t"))
+
+    assert len(calls) == 2
+    scored = calls[1]["messages"][0]["content"]
+    assert "## Item 2" in scored and "[error] line 1: wrong" in scored
+    assert output.confidence == 0.6
+
+
+def test_file_signals_count_comments_and_blocking_severity(tmp_path) -> None:
+    config = load_config(FIXTURES / "devlution.yaml")
+    config.supervision.audit_log = str(tmp_path / "audit.jsonl")
+    agent = ReviewerAgent(config, SimpleNamespace(pipeline_id="p"), workdir=str(tmp_path))
+    review = {
+        "decision": "request_changes",
+        "summary": "s",
+        "comments": [
+            {"file": "util.py", "line": 1, "severity": "blocking", "body": "wrong"},
+            {"file": "util.py", "line": 2, "severity": "warning", "body": "nit"},
+        ],
+    }
+    _, signals = agent._score_items(json.dumps(review), AgentInput(diff=DIFF), review)
+
+    app, util = signals
+    assert app is not None and util is not None
+    assert (app.review_comments, app.blocking_comments) == (0, 0)
+    assert (util.review_comments, util.blocking_comments) == (2, 1)
@@ -5,6 +5,7 @@ from devlution.orchestrator.router import (
     route_gate,
     route_planner,
     route_reviewer,
+    route_tasks,
     route_tester,
 )
 
@@ -73,6 +74,18 @@ class TestRouteDebugger:
         assert route_debugger(state) == "abort"
 
 
+class TestRouteTasks:
+    def test_done(self) -> None:
+        assert route_tasks({"status": "running"}) == "done"
+
+    def test_abort_on_failed_task(self) -> None:
+        assert route_tasks({"status": "failed"}) == "abort"
+
+    def test_escalate_unschedulable_plan(self) -> None:
+        state = {"status": "waiting_for_human", "review_decision": "escalate_to_human"}
+        assert route_tasks(state) == "escalate"
+
+
 class TestRouteGate:
     def test_approved(self) -> None:
         state = {"gate_decisions": {"g1": {"decision": "approved"}}}
@@ -0,0 +1,90 @@
+"""Tests for devlution.orchestrator.scheduler — task DAG fan-out."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from devlution.orchestrator.scheduler import (
+    TaskScheduler,
+    merge_task_results,
+    topological_order,
+)
+
+
+def _task(tid: str, deps: list[str] | None = None) -> dict[str, Any]:
+    return {"id": tid, "title": tid, "dependencies": deps or []}
+
+
+def test_topological_order_respects_dependencies() -> None:
+    tasks = [_task("T3", ["T1", "T2"]), _task("T1"), _task("T2", ["T1"])]
+    assert [t["id"] for t in topological_order(tasks)] == ["T1", "T2", "T3"]
+
+
+def test_topological_order_ignores_unknown_dependencies() -> None:
+    tasks = [_task("T1", ["T9"]), _task("T2")]
+    assert [t["id"] for t in topological_order(tasks)] == ["T1", "T2"]
+
+
+def test_topological_order_rejects_cycles() -> None:
+    with pytest.raises(ValueError):
+        topological_order([_task("T1", ["T2"]), _task("T2", ["T1"])])
+
+
+def test_scheduler_bounds_concurrency_and_orders_dependents() -> None:
+    running = 0
+    peak = 0
+    finished: list[str] = []
+
+    async def run_task(task: dict[str, Any]) -> dict[str, Any]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        finished.append(task["id"])
+        return {"review_decision": "approve"}
+
+    tasks = [_task("T1"), _task("T2"), _task("T3"), _task("T4", ["T1", "T2", "T3"])]
+    results = asyncio.run(TaskScheduler(max_concurrency=2).run(tasks, run_task))
+
+    assert peak == 2
+    assert finished[-1] == "T4"
+    assert list(results) == ["T1", "T2", "T3", "T4"]
+
+
+def test_scheduler_skips_dependents_of_failed_tasks() -> None:
+    async def run_task(task: dict[str, Any]) -> dict[str, Any]:
+        if task["id"] == "T1":
+            raise RuntimeError("boom")
+        return {}
+
+    tasks = [_task("T1"), _task("T2", ["T1"]), _task("T3")]
+    results = asyncio.run(TaskScheduler().run(tasks, run_task))
+
+    assert results["T1"]["status"] == "failed"
+    assert results["T2"]["status"] == "skipped"
+    assert results["T3"] == {}
+
+
+def test_merge_task_results_takes_worst_outcome() -> None:
+    merged = merge_task_results(
+        {
+            "T1": {
+                "confidence_scores": {"coder": 0.9},
+                "review_decision": "approve",
+                "test_results": {"passed": True, "total_tests": 3, "coverage_percent": 90.0},
+            },
+            "T2": {
+                "confidence_scores": {"coder": 0.6},
+                "review_decision": "escalate_to_human",
+                "test_results": {"passed": False, "total_tests": 2, "coverage_percent": 70.0},
+            },
+        }
+    )
+
+    assert merged["confidence_scores"] == {"coder": 0.6}
+    assert merged["review_decision"] == "escalate_to_human"
+    assert merged["test_results"]["passed"] is False
+    assert merged["test_results"]["total_tests"] == 5
+    assert merged["test_results"]["coverage_percent"] == 70.0
@@ -0,0 +1,63 @@
+"""Tests for devlution.tools.search_index — lexical file search."""
+
+from pathlib import Path
+
+import pytest
+
+from devlution.tools.search_index import SearchIndex, trigrams
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    files = {
+        "src/api/routes.py": "def list_users(request):\n    return paginate(users)\n",
+        "src/auth.py": "def login(user, password):\n    return check_token(user)\n",
+        "src/billing/invoice.py": "class Invoice:\n    def total(self):\n        return 0\n",
+        "docs/README.md": "Users can log in and view invoices.\n",
+        ".git/config": "[core]\n",
+    }
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return tmp_path
+
+
+def test_trigrams() -> None:
+    assert trigrams("Auth") == {"aut", "uth"}
+    assert trigrams("io") == {"io"}
+
+
+def test_search_ranks_path_and_content_matches(repo: Path) -> None:
+    index = SearchIndex(repo)
+    assert index.refresh() == 4
+
+    results = [path for path, _ in index.search("Invoice total is wrong", top_k=2)]
+    assert results[0] == "src/billing/invoice.py"
+
+
+def test_search_matches_file_names_by_trigram(repo: Path) -> None:
+    index = SearchIndex(repo)
+    index.refresh()
+
+    results = [path for path, _ in index.search("Authentication fails", top_k=3)]
+    assert "src/auth.py" in results
+
+
+def test_refresh_is_incremental(repo: Path) -> None:
+    index = SearchIndex(repo)
+    index.refresh()
+    assert index.refresh() == 0
+
+    (repo / "src" / "auth.py").unlink()
+    (repo / "src" / "session.py").write_text("def expire_session():\n    pass\n")
+    assert index.refresh() == 2
+
+    reloaded = SearchIndex(repo)
+    assert reloaded.refresh() == 0
+    assert reloaded.search("session expiry", top_k=1)[0][0] == "src/session.py"
+
+
+def test_search_without_terms_returns_nothing(repo: Path) -> None:
+    index = SearchIndex(repo)
+    index.refresh()
+    assert index.search("a of", top_k=5) == []
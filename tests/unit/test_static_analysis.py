@@ -0,0 +1,113 @@
+"""Tests for devlution.tools.static_analysis — per-file result cache."""
+
+import sys
+from pathlib import Path
+
+from devlution.tools.static_analysis import AnalysisCache, run_lint, run_typecheck
+
+FAKE_TOOL = """#!{python}
+import os
+import sys
+
+args = sys.argv[1:]
+with open(os.path.join(os.path.dirname(__file__), "calls.log"), "a") as log:
+    log.write(" ".join(args) + "\\n")
+if args == ["--version"]:
+    print("0.0.1")
+    sys.exit(0)
+files = []
+for arg in args[1:]:
+    if os.path.isdir(arg):
+        files += [os.path.join(arg, name) for name in os.listdir(arg) if name.endswith(".py")]
+    elif arg.endswith(".py"):
+        files.append(arg)
+found = 0
+for path in sorted(files):
+    for number, line in enumerate(open(path), 1):
+        if "bad" in line:
+            print(f"{{path}}:{{number}}:1: E999 bad line")
+            found += 1
+sys.exit(1 if found else 0)
+"""
+
+
+def _setup(tmp_path: Path, name: str) -> tuple[Path, Path, AnalysisCache]:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    tool = bin_dir / name
+    tool.write_text(FAKE_TOOL.format(python=sys.executable))
+    tool.chmod(0o755)
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text("x = 1  # bad\n")
+    (project / "b.py").write_text("y = 2\n")
+    return tool, bin_dir / "calls.log", AnalysisCache(project)
+
+
+def _runs(log: Path) -> list[str]:
+    return [line for line in log.read_text().splitlines() if line != "--version"]
+
+
+def test_lint_reruns_only_changed_files(tmp_path: Path) -> None:
+    tool, log, cache = _setup(tmp_path, "ruff")
+    project = str(tmp_path / "project")
+    command = f"{tool} check ."
+
+    first = run_lint(command, cwd=project, cache=cache)
+    assert [(f.file, f.line) for f in first.findings] == [("a.py", 1)]
+    assert not first.success and first.cached_files == 0
+
+    second = run_lint(command, cwd=project, cache=cache)
+    assert [(f.file, f.code) for f in second.findings] == [("a.py", "E999")]
+    assert not second.success and second.cached_files == 2
+    assert _runs(log) == ["check ."]
+
+    (tmp_path / "project" / "b.py").write_text("y = 2  # bad too\n")
+    third = run_lint(command, cwd=project, cache=cache)
+    assert _runs(log) == ["check .", "check --force-exclude b.py"]
+    assert sorted(f.file for f in third.findings) == ["a.py", "b.py"]
+    assert third.cached_files == 1
+    cache.close()
+
+
+def test_typecheck_reruns_everything_on_any_change(tmp_path: Path) -> None:
+    tool, log, cache = _setup(tmp_path, "mypy")
+    project = str(tmp_path / "project")
+    command = f"{tool} --strict ."
+
+    run_typecheck(command, cwd=project, cache=cache)
+    cached = run_typecheck(command, cwd=project, cache=cache)
+    assert cached.cached_files == 2 and len(cached.findings) == 1
+    assert _runs(log) == ["--strict ."]
+
+    (tmp_path / "project" / "c.py").write_text("z = 3\n")
+    rerun = run_typecheck(command, cwd=project, cache=cache)
+    assert _runs(log) == ["--strict ."] * 2
+    assert rerun.cached_files == 0 and len(rerun.findings) == 1
+    cache.close()
+
+
+def test_unknown_tool_is_not_cached(tmp_path: Path) -> None:
+    cache = AnalysisCache(tmp_path)
+    result = run_lint(f"{sys.executable} -c \"print('a.py:1:1: E1 x')\"", str(tmp_path), cache)
+    assert [f.code for f in result.findings] == ["E1"]
+    assert result.cached_files == 0
+    cache.close()
+
+
+def test_nested_config_change_invalidates_cache(tmp_path: Path) -> None:
+    tool, log, cache = _setup(tmp_path, "ruff")
+    project = tmp_path / "project"
+    (project / "sub").mkdir()
+    (project / "sub" / "ruff.toml").write_text("line-length = 100\n")
+    command = f"{tool} check ."
+
+    run_lint(command, cwd=str(project), cache=cache)
+    run_lint(command, cwd=str(project), cache=cache)
+    assert _runs(log) == ["check ."]
+
+    (project / "sub" / "ruff.toml").write_text("line-length = 88\nselect = ['E']\n")
+    rerun = run_lint(command, cwd=str(project), cache=cache)
+    assert _runs(log) == ["check .", "check ."]
+    assert rerun.cached_files == 0
+    cache.close()
@@ -0,0 +1,171 @@
+"""Tests for devlution.tools.symbol_index — ast symbol index and context selection."""
+
+import subprocess
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+from devlution.tools.symbol_index import (
+    SymbolIndex,
+    parse_symbols,
+    select_context,
+    terms_from_text,
+    traceback_lines,
+)
+
+SOURCE = dedent(
+    '''
+    import os
+
+
+    def load_config(path):
+        return parse_yaml(read(path))
+
+
+    class Parser:
+        @staticmethod
+        def parse_yaml(text):
+            return text.split()
+
+        def feed(self, chunk):
+            return self.parse_yaml(chunk)
+    '''
+).lstrip()
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "config.py").write_text(SOURCE)
+    (tmp_path / "pkg" / "cli.py").write_text("def main():\n    return load_config('x')\n")
+    return tmp_path
+
+
+def test_parse_symbols_records_ranges_and_calls() -> None:
+    symbols = {s.name: s for s in parse_symbols(SOURCE, "config.py")}
+
+    assert set(symbols) == {"load_config", "Parser", "Parser.parse_yaml", "Parser.feed"}
+    assert symbols["load_config"].calls == ["parse_yaml", "read"]
+    assert symbols["Parser.parse_yaml"].kind == "method"
+    assert symbols["Parser.parse_yaml"].start == 9  # includes the decorator line
+    assert symbols["Parser"].end == 14
+
+
+def test_parse_symbols_tolerates_syntax_errors() -> None:
+    assert parse_symbols("def broken(:\n", "bad.py") == []
+
+
+def test_terms_split_snake_and_camel_case() -> None:
+    terms = terms_from_text("Fix loadConfig in parse_yaml")
+    assert terms == {"fix", "load", "config", "parse", "yaml"}
+
+
+def test_refresh_is_incremental_and_persistent(repo: Path) -> None:
+    index = SymbolIndex(repo)
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+    assert (repo / ".devlution" / "index" / "symbols.db").exists()
+
+    reloaded = SymbolIndex(repo)
+    assert reloaded.refresh() == 0
+    assert [s.name for s in reloaded.find("main")] == ["main"]
+
+    (repo / "pkg" / "cli.py").write_text("def main():\n    return 1\n\n\ndef extra():\n    pass\n")
+    assert reloaded.refresh() == 1
+    assert [s.name for s in reloaded.symbols("pkg/cli.py")] == ["main", "extra"]
+
+
+def test_refresh_uses_git_blob_hashes(repo: Path) -> None:
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+    index = SymbolIndex(repo)
+    assert index.refresh() == 2
+
+    # Rewriting identical content changes the mtime but not the blob.
+    (repo / "pkg" / "cli.py").write_text((repo / "pkg" / "cli.py").read_text())
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+    assert index.refresh() == 0
+
+    (repo / "pkg" / "new.py").write_text("def fresh():\n    pass\n")
+    assert index.refresh() == 1
+    assert [s.file for s in index.find("fresh")] == ["pkg/new.py"]
+
+
+def test_refresh_drops_deleted_files(repo: Path) -> None:
+    index = SymbolIndex(repo)
+    index.refresh()
+    (repo / "pkg" / "cli.py").unlink()
+
+    index.refresh()
+    assert index.symbols("pkg/cli.py") == []
+
+
+def test_callers_of(repo: Path) -> None:
+    index = SymbolIndex(repo)
+    index.refresh()
+
+    [load_config] = index.find("load_config")
+    assert [s.name for s in index.callers_of(load_config)] == ["main"]
+
+    [parse_yaml] = index.find("parse_yaml")
+    assert {s.name for s in index.callers_of(parse_yaml)} == {"load_config", "Parser.feed"}
+
+
+def test_excerpt_returns_small_files_whole(repo: Path) -> None:
+    index = SymbolIndex(repo)
+    text, chosen = index.excerpt("pkg/config.py", {"feed"}, max_chars=4000)
+    assert text == SOURCE
+    assert chosen == []
+
+
+def test_excerpt_selects_matching_symbols_in_large_files(repo: Path) -> None:
+    filler = "".join(f"\n\ndef helper_{i}():\n    return {i}\n" for i in range(200))
+    (repo / "pkg" / "config.py").write_text(SOURCE + filler)
+    index = SymbolIndex(repo)
+    index.refresh()
+
+    text, chosen = index.excerpt("pkg/config.py", {"feed"}, max_chars=1000)
+
+    assert [s.name for s in chosen] == ["Parser.feed"]
+    assert "import os" in text
+    assert "def feed(self, chunk):" in text
+    assert "helper_150" not in text
+    assert len(text) <= 1000
+
+
+def test_excerpt_prefers_traceback_lines(repo: Path) -> None:
+    filler = "".join(f"\n\ndef helper_{i}():\n    return {i}\n" for i in range(200))
+    (repo / "pkg" / "config.py").write_text(SOURCE + filler)
+    index = SymbolIndex(repo)
+    index.refresh()
+
+    _, chosen = index.excerpt("pkg/config.py", set(), max_chars=1000, lines={5})
+    assert [s.name for s in chosen] == ["load_config"]
+
+
+def test_select_context_includes_callers(repo: Path) -> None:
+    filler = "".join(f"\n\ndef helper_{i}():\n    return {i}\n" for i in range(200))
+    (repo / "pkg" / "config.py").write_text(SOURCE + filler)
+    index = SymbolIndex(repo)
+    index.refresh()
+
+    contents, callers = select_context(
+        index, ["pkg/config.py", "pkg/missing.py"], {"load", "config"}, max_chars=1000
+    )
+
+    assert list(contents) == ["pkg/config.py"]
+    assert "pkg/cli.py: main" in callers
+    assert "load_config('x')" in callers["pkg/cli.py: main"]
+
+
+def test_traceback_lines_matches_by_suffix() -> None:
+    log = (
+        'File "/home/ci/work/pkg/config.py", line 5, in load_config\n'
+        "pkg/cli.py:2: AssertionError\n"
+        'File "/usr/lib/python3.11/json/decoder.py", line 337, in decode\n'
+    )
+    assert traceback_lines(log, ["pkg/config.py", "pkg/cli.py"]) == {
+        "pkg/config.py": {5},
+        "pkg/cli.py": {2},
+    }
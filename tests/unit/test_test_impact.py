@@ -0,0 +1,107 @@
+"""Tests for devlution.tools.test_impact — coverage-derived test selection."""
+
+import sqlite3
+from pathlib import Path
+
+from devlution.tools.test_impact import (
+    ImpactMap,
+    changed_files_from_diff,
+    is_test_file,
+    read_coverage_contexts,
+)
+
+
+def _coverage_db(path: Path, rows: list[tuple[str, str]]) -> None:
+    """Minimal coverage.py database: (measured file, context) pairs."""
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE file (id INTEGER PRIMARY KEY, path TEXT);"
+        "CREATE TABLE context (id INTEGER PRIMARY KEY, context TEXT);"
+        "CREATE TABLE line_bits (file_id INTEGER, context_id INTEGER, numbits BLOB);"
+    )
+    for i, (file, context) in enumerate(rows):
+        conn.execute("INSERT OR IGNORE INTO file (path) VALUES (?)", (file,))
+        conn.execute("INSERT INTO context (id, context) VALUES (?, ?)", (i, context))
+        file_id = conn.execute("SELECT id FROM file WHERE path = ?", (file,)).fetchone()[0]
+        conn.execute("INSERT INTO line_bits VALUES (?, ?, x'01')", (file_id, i))
+    conn.commit()
+    conn.close()
+
+
+def test_is_test_file() -> None:
+    assert is_test_file("tests/test_api.py")
+    assert is_test_file("pkg/api_test.py")
+    assert not is_test_file("pkg/api.py")
+    assert not is_test_file("tests/conftest.py")
+
+
+def test_changed_files_from_diff() -> None:
+    diff = (
+        "diff --git a/pkg/api.py b/pkg/api.py\n--- a/pkg/api.py\n+++ b/pkg/api.py\n"
+        "diff --git a/old.py b/new.py\nsimilarity index 90%\n"
+    )
+    assert changed_files_from_diff(diff) == ["new.py", "old.py", "pkg/api.py"]
+
+
+def test_read_coverage_contexts(tmp_path: Path) -> None:
+    db = tmp_path / ".coverage"
+    _coverage_db(
+        db,
+        [
+            (str(tmp_path / "pkg" / "api.py"), "tests/test_api.py::test_get|run"),
+            (str(tmp_path / "pkg" / "api.py"), "tests/test_cli.py::TestCli::test_run|run"),
+            (str(tmp_path / "pkg" / "db.py"), ""),
+            ("/usr/lib/python3/json/__init__.py", "tests/test_api.py::test_get|run"),
+        ],
+    )
+
+    assert read_coverage_contexts(db, tmp_path) == {
+        "pkg/api.py": {"tests/test_api.py", "tests/test_cli.py"},
+    }
+
+
+def test_select_uses_map_and_falls_back_on_misses(tmp_path: Path) -> None:
+    impact = ImpactMap(tmp_path / "map.json")
+    assert impact.select(["pkg/api.py"]) is None
+
+    impact.update({"pkg/api.py": {"tests/test_api.py"}, "pkg/db.py": {"tests/test_db.py"}}, None)
+
+    assert impact.select(["pkg/api.py", "tests/test_new.py"]) == [
+        "tests/test_api.py",
+        "tests/test_new.py",
+    ]
+    assert impact.select(["pkg/api.py", "pkg/unmapped.py"]) is None
+    assert impact.select(["pyproject.toml"]) is None
+
+
+def test_select_drops_missing_test_files(tmp_path: Path) -> None:
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_renamed.py").write_text("")
+    (tmp_path / "tests" / "test_api.py").write_text("")
+    impact = ImpactMap(tmp_path / "map.json")
+    impact.update({"pkg/api.py": {"tests/test_api.py", "tests/test_gone.py"}}, None)
+
+    changed = changed_files_from_diff(
+        "diff --git a/tests/test_old.py b/tests/test_renamed.py\n"
+        "diff --git a/pkg/api.py b/pkg/api.py\n"
+    )
+    assert impact.select(changed, tmp_path) == ["tests/test_api.py", "tests/test_renamed.py"]
+    assert impact.select(["tests/test_old.py"], tmp_path) is None
+
+
+def test_partial_update_replaces_entries_for_rerun_tests(tmp_path: Path) -> None:
+    impact = ImpactMap(tmp_path / "map.json")
+    impact.update(
+        {
+            "pkg/api.py": {"tests/test_api.py", "tests/test_cli.py"},
+            "pkg/db.py": {"tests/test_api.py"},
+        },
+        None,
+    )
+
+    # test_api.py no longer touches db.py.
+    impact.update({"pkg/api.py": {"tests/test_api.py"}}, ["tests/test_api.py"])
+    impact.save()
+
+    reloaded = ImpactMap(tmp_path / "map.json")
+    assert reloaded.files == {"pkg/api.py": ["tests/test_api.py", "tests/test_cli.py"]}
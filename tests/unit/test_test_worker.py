@@ -0,0 +1,133 @@
+"""Tests for devlution.tools.test_worker — the warm pytest worker."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from devlution.tools.test_worker import WarmTestWorker, preload_modules, pytest_args
+
+# Stands in for pytest inside the worker: the worker puts the project root
+# first on sys.path, so this module shadows the real one.
+FAKE_PYTEST = """
+import os
+import subprocess
+import sys
+import pkg.mod
+
+def main(args):
+    if "child-status" in args:
+        print("child exit", subprocess.run(["false"]).returncode)
+        return 0
+    if "hang" in args:
+        sleeper = subprocess.Popen(["sleep", "60"])
+        print("sleeper", sleeper.pid)
+        sleeper.wait()
+        return 0
+    if "long" in args:
+        for i in range(5000):
+            print("line", i)
+        return 0
+    print("value", pkg.mod.VALUE, "args", *args, "env", os.environ.get("MARKER", ""))
+    print("to stderr", file=sys.stderr)
+    return 1 if "fail" in args else 0
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "mod.py").write_text("VALUE = 1\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_mod.py").write_text("import pkg.mod\nfrom tests import helpers\n")
+    (tmp_path / "pytest.py").write_text(FAKE_PYTEST)
+    repo_root = str(Path(__file__).resolve().parents[2])
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([repo_root, os.environ.get("PYTHONPATH", "")]))
+    return tmp_path
+
+
+def test_pytest_args() -> None:
+    assert pytest_args("pytest -x tests") == ["-x", "tests"]
+    assert pytest_args("python3 -m pytest -q") == ["-q"]
+    assert pytest_args(".venv/bin/pytest") == []
+    assert pytest_args("npm test") is None
+    assert pytest_args("make test") is None
+
+
+def test_preload_modules_reads_test_imports(project: Path) -> None:
+    assert preload_modules(project) == ["pkg.mod"]
+
+
+def test_worker_runs_and_restarts_on_change(project: Path) -> None:
+    worker = WarmTestWorker(project)
+    try:
+        result = worker.run(["-q"], timeout=30, env={**os.environ, "MARKER": "m1"})
+        assert result.success
+        assert result.stdout.strip() == "value 1 args -q env m1"
+        assert result.stderr.strip() == "to stderr"
+        first_pid = worker._proc.pid
+
+        failed = worker.run(["fail"], timeout=30)
+        assert failed.returncode == 1
+        assert worker._proc.pid == first_pid
+
+        time.sleep(0.01)
+        (project / "pkg" / "mod.py").write_text("VALUE = 2\n")
+        result = worker.run(["-q"], timeout=30)
+        assert result.stdout.startswith("value 2")
+        assert worker._proc.pid != first_pid
+    finally:
+        worker.close()
+
+
+def test_worker_child_sees_subprocess_exit_status(project: Path) -> None:
+    worker = WarmTestWorker(project)
+    try:
+        result = worker.run(["child-status"], timeout=30)
+        assert result.stdout.strip() == "child exit 1"
+    finally:
+        worker.close()
+
+
+def test_worker_output_is_bounded_and_spilled(project: Path) -> None:
+    worker = WarmTestWorker(project)
+    seen: list[str] = []
+    try:
+        result = worker.run(
+            ["long"],
+            timeout=30,
+            on_line=lambda stream, line: seen.append(line),
+            spill_dir=project / "runs",
+        )
+    finally:
+        worker.close()
+
+    assert result.success and len(seen) == 5000
+    assert "lines omitted" in result.stdout and result.stdout.endswith("line 4999")
+    assert len(Path(result.spill_path).read_text().splitlines()) == 5000
+
+
+@pytest.mark.skipif(not Path("/proc").is_dir(), reason="reads process state from /proc")
+def test_worker_timeout_kills_the_runs_processes(project: Path) -> None:
+    worker = WarmTestWorker(project)
+    seen: list[str] = []
+    try:
+        result = worker.run(["hang"], timeout=2, on_line=lambda stream, line: seen.append(line))
+    finally:
+        worker.close()
+
+    assert result.timed_out and "timed out after 2s" in result.stderr
+    assert result.stdout.startswith("sleeper")
+    sleeper = int(seen[0].split()[1])
+    time.sleep(0.2)
+    assert not _running(sleeper)
+
+
+def _running(pid: int) -> bool:
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"  # a killed, unreaped process is a zombie
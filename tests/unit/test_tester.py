@@ -0,0 +1,60 @@
+"""Tests for devlution.agents.tester — test-run planning."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from devlution.agents.base import AgentInput
+from devlution.agents.tester import TesterAgent
+from devlution.config import load_config
+from devlution.tools.code_executor import ExecutionResult, RunReport
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "sample_repo"
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    config = load_config(FIXTURES / "devlution.yaml")
+    config.supervision.audit_log = str(tmp_path / "audit.jsonl")
+    monkeypatch.setattr(TesterAgent, "_changed_files", lambda self, i, r: [])
+    return TesterAgent(config, SimpleNamespace(pipeline_id="p"), workdir=str(tmp_path))
+
+
+def test_reports_only_for_pytest_commands(agent):
+    plan = agent._plan_tests(AgentInput(), {})
+    assert "--junitxml=" in plan.args
+    assert "--cov=" in plan.args
+    # Coverage data never lands in the worktree root, where it would be committed.
+    assert plan.env is not None
+    assert plan.env["COVERAGE_FILE"].startswith(str(Path(agent.workdir) / ".devlution"))
+    assert not plan.record_contexts
+
+    agent.config.project.test_command = "npm test"
+    plan = agent._plan_tests(AgentInput(), {})
+    assert plan.args == ""
+    assert plan.env is None
+
+
+def test_missing_pytest_cov_is_remembered(agent):
+    result = ExecutionResult(
+        success=False, stdout="", stderr="error: unrecognized arguments: --cov=.", returncode=4
+    )
+    assert agent._plan_tests(AgentInput(), {}).uses_cov
+    assert agent._missing_pytest_cov(result)
+
+    plan = agent._plan_tests(AgentInput(), {})
+    assert not plan.uses_cov
+    assert plan.env is None
+    assert "--junitxml=" in plan.args
+
+
+def test_confidence_signals_use_measured_results(agent):
+    text = '{"tests_written": ["tests/test_x.py"], "confidence": 0.2}'
+    assert agent._confidence_signals(text, None).tests_total is None
+
+    report = RunReport(total=10, passed=7, failed=2, errors=1, coverage_percent=85.0)
+    signals = agent._confidence_signals(text, report)
+    assert (signals.tests_total, signals.tests_failed) == (10, 3)
+    assert signals.coverage_percent == 85.0
+    assert signals.self_reported == 0.2
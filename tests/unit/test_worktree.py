@@ -0,0 +1,103 @@
+"""Tests for devlution.tools.worktree — pooled git worktrees."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from devlution.tools.worktree import WorktreePool
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    git = ["git", "-c", "user.email=test@example.com", "-c", "user.name=test"]
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    (tmp_path / "app.py").write_text("x = 1\n")
+    subprocess.run(git + ["add", "app.py"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["commit", "-qm", "init"], cwd=tmp_path, check=True)
+    return tmp_path
+
+
+@pytest.fixture
+def pool(repo: Path) -> WorktreePool:
+    return WorktreePool(size=2, root=str(repo / ".devlution" / "worktrees"), repo=str(repo))
+
+
+def test_same_task_gets_its_worktree_back(pool: WorktreePool) -> None:
+    path = pool.acquire("T1")
+    (Path(path) / "wip.py").write_text("pass\n")
+    pool.release(path)
+
+    assert pool.acquire("T1") == path
+    assert (Path(path) / "wip.py").exists()
+
+
+def test_other_task_gets_clean_checkout(pool: WorktreePool) -> None:
+    first = pool.acquire("T1")
+    (Path(first) / "app.py").write_text("x = 2\n")
+    (Path(first) / "wip.py").write_text("pass\n")
+    pool.release(first)
+
+    second = pool.acquire("T2")
+    other = pool.acquire("T3")
+    assert first in (second, other)
+    assert (Path(first) / "app.py").read_text() == "x = 1\n"
+    assert not (Path(first) / "wip.py").exists()
+
+
+def test_acquire_times_out_when_exhausted(pool: WorktreePool) -> None:
+    pool.acquire("T1")
+    pool.acquire("T2")
+    with pytest.raises(TimeoutError):
+        pool.acquire("T3", timeout=0.05)
+
+
+def test_dependent_task_starts_from_dependency_edits(pool: WorktreePool) -> None:
+    first = pool.acquire("T1")
+    (Path(first) / "app.py").write_text("x = 2\n")
+    (Path(first) / "new.py").write_text("y = 1\n")
+    pool.release(first)
+    second = pool.acquire("T2")
+    (Path(second) / "other.py").write_text("z = 1\n")
+    pool.release(second)
+
+    path = pool.acquire("T3", depends_on=["T1", "T2"])
+    assert (Path(path) / "app.py").read_text() == "x = 2\n"
+    assert (Path(path) / "new.py").exists() and (Path(path) / "other.py").exists()
+    # The dependent task's own diff starts empty, so its patch stacks on theirs.
+    assert subprocess.run(
+        ["git", "status", "--porcelain"], cwd=path, capture_output=True, text=True
+    ).stdout == ""
+
+
+def test_generated_files_stay_out_of_dependency_snapshots(pool: WorktreePool) -> None:
+    for task, content in (("T1", b"\x00first"), ("T2", b"\x00second")):
+        path = Path(pool.acquire(task))
+        (path / ".devlution" / "index").mkdir(parents=True)
+        (path / ".devlution" / "index" / "symbols.db").write_bytes(content)
+        (path / ".coverage").write_bytes(content)
+        (path / f"{task.lower()}.py").write_text("pass\n")
+        pool.release(str(path))
+
+    path = Path(pool.acquire("T3", depends_on=["T1", "T2"]))
+    assert (path / "t1.py").exists() and (path / "t2.py").exists()
+    tracked = subprocess.run(
+        ["git", "ls-files"], cwd=path, capture_output=True, text=True
+    ).stdout.split()
+    assert not [f for f in tracked if f.startswith(".devlution/") or f.startswith(".coverage")]
+
+
+def test_failed_reset_retires_worktree(pool: WorktreePool, monkeypatch: pytest.MonkeyPatch) -> None:
+    from devlution.tools import git_ops
+
+    first = pool.acquire("T1")
+    pool.release(first)
+    failing = git_ops.GitResult(success=False, stdout="", stderr="boom", returncode=1)
+    monkeypatch.setattr(git_ops, "clean", lambda cwd=".": failing)
+
+    with pytest.raises(RuntimeError, match="git clean failed"):
+        pool.acquire("T2")
+    with pytest.raises(RuntimeError, match="git clean failed"):
+        pool.acquire("T3")
+    with pytest.raises(RuntimeError, match="broken"):
+        pool.acquire("T4")